@@ -10,6 +10,7 @@ from app.schemas.medicine import (
     CategoryCreate, CategoryUpdate, Category as CategorySchema,
     MedicineAlternativeCreate, MedicineAlternative as MedicineAlternativeSchema, StockUpdate
 )
+from app.services.search_service import medicine_search_service
 
 router = APIRouter()
 
@@ -47,7 +48,7 @@ async def create_medicine(
 
 @router.get("/", response_model=List[MedicineSchema])
 async def get_medicines(
-    search: Optional[str] = Query(None, description="Search term for medicine name or generic name"),
+    search: Optional[str] = Query(None, description="Search term for medicine name, generic name or description"),
     category_id: Optional[int] = Query(None, description="Filter by category ID"),
     min_price: Optional[float] = Query(None, description="Minimum price filter"),
     max_price: Optional[float] = Query(None, description="Maximum price filter"),
@@ -60,14 +61,9 @@ async def get_medicines(
     """Get all medicines with optional filtering"""
     query = db.query(Medicine)
     
-    # Apply search filter
+    # Apply search filter, best matches first
     if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            (Medicine.name.like(search_term)) |
-            (Medicine.generic_name.like(search_term)) |
-            (Medicine.description.like(search_term))
-        )
+        query = medicine_search_service.search(query, search)
     
     # Apply category filter
     if category_id:
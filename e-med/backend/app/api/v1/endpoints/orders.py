@@ -1,23 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Body
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Body, Response
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional
 from app.core.database import get_db
+from app.core.pagination import keyset_page
 from app.api.v1.endpoints.auth import get_current_user
 from app.models.user import User, UserRole
 from app.models.order import Order, OrderItem, OrderPrescription, OrderStatus, OrderType
-from app.models.medicine import Medicine
 from app.models.prescription import Prescription
 from app.schemas.order import (
     OrderCreate, OrderUpdate, Order as OrderSchema, OrderItem as OrderItemSchema,
     OrderSearch, OrderStatusUpdate, CartItemCreate, CartItemUpdate, CartItem as CartItemSchema
 )
 from app.services.notification_service import notification_service
+from app.services.stock_service import stock_service
 import uuid
 from datetime import datetime, timedelta
 from app.services.cloudinary_service import cloudinary_service
 
 router = APIRouter()
 
+# Loads the items of every order in a result, with their medicine names, in one extra query
+order_items_loader = selectinload(Order.items).joinedload(OrderItem.medicine)
+
 # Helper function to check if user is admin
 def get_admin_user(current_user: User = Depends(get_current_user)):
     if current_user.role not in [UserRole.PHARMACY_ADMIN, UserRole.SYSTEM_ADMIN]:
@@ -52,19 +57,25 @@ async def create_order(
             detail="Order must contain at least one item"
         )
     
+    # Load and lock every medicine in the cart with one query
+    medicines = stock_service.lock_medicines(db, (item_data.medicine_id for item_data in order_data.items))
+    
     # Calculate order details
     subtotal = 0.0
     order_items = []
+    quantities = {}
     
     for item_data in order_data.items:
-        medicine = db.query(Medicine).filter(Medicine.id == item_data.medicine_id).first()
+        medicine = medicines.get(item_data.medicine_id)
         if not medicine:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Medicine with ID {item_data.medicine_id} not found"
             )
         
-        if medicine.stock_quantity < item_data.quantity:
+        # A medicine listed on several lines is checked against its combined quantity
+        quantities[medicine.id] = quantities.get(medicine.id, 0) + item_data.quantity
+        if medicine.stock_quantity < quantities[medicine.id]:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Insufficient stock for {medicine.name}. Available: {medicine.stock_quantity}"
@@ -90,6 +101,21 @@ async def create_order(
         OrderType.EMERGENCY if order_data.is_emergency else OrderType.NORMAL
     )
     
+    # Link prescriptions if provided, skipping any that belong to another user
+    prescription_links = []
+    if order_data.prescription_ids:
+        prescription_ids = db.query(Prescription.id).filter(
+            Prescription.id.in_(set(order_data.prescription_ids)),
+            Prescription.user_id == current_user.id
+        )
+        prescription_links = [
+            {"prescription_id": prescription_id}
+            for (prescription_id,) in prescription_ids
+        ]
+    
+    # Reserve stock for the whole cart before writing the order
+    stock_service.reserve(db, quantities)
+    
     # Create order
     db_order = Order(
         order_number=generate_order_number(),
@@ -106,51 +132,33 @@ async def create_order(
         emergency_reason=order_data.emergency_reason,
         estimated_delivery_time=datetime.utcnow() + timedelta(minutes=30 if order_data.is_emergency else 60)
     )
-    
     db.add(db_order)
-    db.commit()
-    db.refresh(db_order)
+    db.flush()
+    order_id = db_order.id
     
-    # Create order items
-    for item_data in order_items:
-        db_item = OrderItem(
-            order_id=db_order.id,
-            **item_data
-        )
-        db.add(db_item)
-        
-        # Update stock
-        medicine = db.query(Medicine).filter(Medicine.id == item_data["medicine_id"]).first()
-        medicine.stock_quantity -= item_data["quantity"]
-    
-    # Link prescriptions if provided
-    if order_data.prescription_ids:
-        for prescription_id in order_data.prescription_ids:
-            prescription = db.query(Prescription).filter(Prescription.id == prescription_id).first()
-            if prescription and prescription.user_id == current_user.id:
-                db_prescription_link = OrderPrescription(
-                    order_id=db_order.id,
-                    prescription_id=prescription_id
-                )
-                db.add(db_prescription_link)
+    # Insert order items and prescription links as one batch each, in the same transaction
+    db.execute(insert(OrderItem), [dict(item, order_id=db_order.id) for item in order_items])
+    if prescription_links:
+        db.execute(insert(OrderPrescription), [dict(link, order_id=db_order.id) for link in prescription_links])
     
     db.commit()
-    db.refresh(db_order)
+    db_order = db.query(Order).options(order_items_loader).filter(Order.id == order_id).one()
     return OrderSchema.model_validate(db_order)
 
 @router.get("/", response_model=List[OrderSchema])
 async def get_orders(
+    response: Response,
     status: Optional[OrderStatus] = Query(None, description="Filter by status"),
     order_type: Optional[OrderType] = Query(None, description="Filter by order type"),
     user_id: Optional[int] = Query(None, description="Filter by user ID"),
     is_emergency: Optional[bool] = Query(None, description="Filter by emergency orders"),
     limit: int = Query(20, ge=1, le=100, description="Number of items to return"),
-    offset: int = Query(0, ge=0, description="Number of items to skip"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get orders with optional filtering"""
-    query = db.query(Order)
+    query = db.query(Order).options(order_items_loader)
     
     # Apply filters based on user role
     if current_user.role == UserRole.CUSTOMER:
@@ -168,8 +176,8 @@ async def get_orders(
     if is_emergency is not None:
         query = query.filter(Order.is_emergency == is_emergency)
     
-    # Apply pagination
-    orders = query.offset(offset).limit(limit).all()
+    # Apply pagination, newest first
+    orders = keyset_page(query, Order, cursor, limit, response)
     return [OrderSchema.model_validate(o) for o in orders]
 
 @router.get("/{order_id}", response_model=OrderSchema)
@@ -179,7 +187,7 @@ async def get_order(
     current_user: User = Depends(get_current_user)
 ):
     """Get a specific order by ID"""
-    order = db.query(Order).filter(Order.id == order_id).first()
+    order = db.query(Order).options(order_items_loader).filter(Order.id == order_id).first()
     
     if not order:
         raise HTTPException(
@@ -218,7 +226,7 @@ async def update_order(
         setattr(order, field, value)
     
     db.commit()
-    db.refresh(order)
+    order = db.query(Order).options(order_items_loader).filter(Order.id == order_id).one()
     return OrderSchema.model_validate(order)
 
 @router.delete("/{order_id}")
@@ -243,21 +251,28 @@ async def cancel_order(
             detail="Not enough permissions"
         )
     
-    # Check if order can be cancelled
-    if order.status in [OrderStatus.DELIVERED, OrderStatus.CANCELLED]:
+    # Cancel order, unless a concurrent request already cancelled or delivered it
+    cancelled = db.execute(
+        update(Order)
+        .where(
+            Order.id == order_id,
+            Order.status.not_in([OrderStatus.DELIVERED, OrderStatus.CANCELLED])
+        )
+        .values(status=OrderStatus.CANCELLED)
+        .execution_options(synchronize_session=False)
+    )
+    if cancelled.rowcount != 1:
+        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Order cannot be cancelled in current status"
         )
     
-    # Cancel order
-    order.status = OrderStatus.CANCELLED
-    
     # Restore stock
+    quantities = {}
     for item in order.items:
-        medicine = db.query(Medicine).filter(Medicine.id == item.medicine_id).first()
-        if medicine:
-            medicine.stock_quantity += item.quantity
+        quantities[item.medicine_id] = quantities.get(item.medicine_id, 0) + item.quantity
+    stock_service.release(db, quantities)
     
     db.commit()
     
@@ -288,7 +303,7 @@ async def update_order_status(
         order.actual_delivery_time = datetime.utcnow()
     
     db.commit()
-    db.refresh(order)
+    order = db.query(Order).options(order_items_loader).filter(Order.id == order_id).one()
     
     # Send real-time notification
     try:
@@ -310,35 +325,38 @@ async def update_order_status(
 # Get user's orders
 @router.get("/user/me", response_model=List[OrderSchema])
 async def get_my_orders(
+    response: Response,
     status: Optional[OrderStatus] = Query(None, description="Filter by status"),
     limit: int = Query(20, ge=1, le=100, description="Number of items to return"),
-    offset: int = Query(0, ge=0, description="Number of items to skip"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get current user's orders"""
-    query = db.query(Order).filter(Order.user_id == current_user.id)
+    query = db.query(Order).options(order_items_loader).filter(Order.user_id == current_user.id)
     
     # Apply status filter
     if status:
         query = query.filter(Order.status == status)
     
-    # Apply pagination
-    orders = query.offset(offset).limit(limit).all()
+    # Apply pagination, newest first
+    orders = keyset_page(query, Order, cursor, limit, response)
     return [OrderSchema.model_validate(o) for o in orders]
 
 # Get pending orders (Admin only)
 @router.get("/admin/pending", response_model=List[OrderSchema])
 async def get_pending_orders(
+    response: Response,
     limit: int = Query(20, ge=1, le=100, description="Number of items to return"),
-    offset: int = Query(0, ge=0, description="Number of items to skip"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_admin_user)
 ):
-    """Get all pending orders (Admin only)"""
-    orders = db.query(Order).filter(
+    """Get all pending orders, oldest first (Admin only)"""
+    query = db.query(Order).options(order_items_loader).filter(
         Order.status == OrderStatus.PENDING
-    ).offset(offset).limit(limit).all()
+    )
+    orders = keyset_page(query, Order, cursor, limit, response, descending=False)
     
     return [OrderSchema.model_validate(o) for o in orders] 
 
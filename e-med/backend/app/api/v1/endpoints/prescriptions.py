@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.core.database import get_db
+from app.core.pagination import keyset_page
 from app.api.v1.endpoints.auth import get_current_user
 from app.models.user import User, UserRole
 from app.models.prescription import Prescription, PrescriptionStatus
@@ -45,10 +46,11 @@ async def create_prescription(
 
 @router.get("/", response_model=List[PrescriptionSchema])
 async def get_prescriptions(
+    response: Response,
     status: Optional[PrescriptionStatus] = Query(None, description="Filter by status"),
     user_id: Optional[int] = Query(None, description="Filter by user ID"),
     limit: int = Query(20, ge=1, le=100, description="Number of items to return"),
-    offset: int = Query(0, ge=0, description="Number of items to skip"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -67,8 +69,8 @@ async def get_prescriptions(
     if status:
         query = query.filter(Prescription.status == status)
     
-    # Apply pagination
-    prescriptions = query.offset(offset).limit(limit).all()
+    # Apply pagination, newest first
+    prescriptions = keyset_page(query, Prescription, cursor, limit, response)
     return [PrescriptionSchema.model_validate(p) for p in prescriptions]
 
 @router.get("/{prescription_id}", response_model=PrescriptionSchema)
@@ -185,9 +187,10 @@ async def verify_prescription(
 # Get user's prescriptions
 @router.get("/user/me", response_model=List[PrescriptionSchema])
 async def get_my_prescriptions(
+    response: Response,
     status: Optional[PrescriptionStatus] = Query(None, description="Filter by status"),
     limit: int = Query(20, ge=1, le=100, description="Number of items to return"),
-    offset: int = Query(0, ge=0, description="Number of items to skip"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -198,22 +201,24 @@ async def get_my_prescriptions(
     if status:
         query = query.filter(Prescription.status == status)
     
-    # Apply pagination
-    prescriptions = query.offset(offset).limit(limit).all()
+    # Apply pagination, newest first
+    prescriptions = keyset_page(query, Prescription, cursor, limit, response)
     return [PrescriptionSchema.model_validate(p) for p in prescriptions]
 
 # Get pending prescriptions (Admin only)
 @router.get("/admin/pending", response_model=List[PrescriptionSchema])
 async def get_pending_prescriptions(
+    response: Response,
     limit: int = Query(20, ge=1, le=100, description="Number of items to return"),
-    offset: int = Query(0, ge=0, description="Number of items to skip"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_admin_user)
 ):
-    """Get all pending prescriptions (Admin only)"""
-    prescriptions = db.query(Prescription).filter(
+    """Get all pending prescriptions, oldest first (Admin only)"""
+    query = db.query(Prescription).filter(
         Prescription.status == PrescriptionStatus.PENDING
-    ).offset(offset).limit(limit).all()
+    )
+    prescriptions = keyset_page(query, Prescription, cursor, limit, response, descending=False)
     
     return [PrescriptionSchema.model_validate(p) for p in prescriptions]
 
@@ -0,0 +1,51 @@
+import base64
+import binascii
+import json
+from typing import Optional
+from fastapi import HTTPException, Response, status
+from sqlalchemy import String, literal, tuple_, type_coerce
+from sqlalchemy.orm import Query
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(created_at: str, id: int) -> str:
+    """Pack a row's position into an opaque, URL-safe cursor"""
+    return base64.urlsafe_b64encode(json.dumps([created_at, id]).encode()).decode()
+
+def decode_cursor(cursor: str):
+    try:
+        created_at, id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if isinstance(created_at, str) and isinstance(id, int):
+            return created_at, id
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        pass
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid cursor"
+    )
+
+def keyset_page(query: Query, model, cursor: Optional[str], limit: int, response: Response, descending: bool = True):
+    """Return one page of query ordered by (created_at, id), newest first unless descending is False.
+
+    The page starts after cursor, and the cursor for the page after it is sent in
+    the X-Next-Cursor header (absent on the last page). Timestamps go into the
+    cursor exactly as the database returned them: SQLite stores server-default
+    and ORM-written times in different text formats, so a re-parsed datetime
+    would not compare equal to the row it came from.
+    """
+    created_at = type_coerce(model.created_at, String)
+    position = tuple_(model.created_at, model.id)
+    if cursor:
+        after_created_at, after_id = decode_cursor(cursor)
+        after = tuple_(literal(after_created_at, String), literal(after_id))
+        query = query.filter(position < after if descending else position > after)
+    if descending:
+        query = query.order_by(model.created_at.desc(), model.id.desc())
+    else:
+        query = query.order_by(model.created_at, model.id)
+
+    rows = query.add_columns(created_at).limit(limit + 1).all()
+    if len(rows) > limit:
+        last, last_created_at = rows[limit - 1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(str(last_created_at), last.id)
+    return [row for row, _ in rows[:limit]]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, DDL, event
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -37,6 +37,49 @@ class Medicine(Base):
     category = relationship("Category", back_populates="medicines")
     alternatives = relationship("MedicineAlternative", foreign_keys="[MedicineAlternative.medicine_id]", back_populates="medicine")
 
+# Catalog search indexes (queried by app/services/search_service.py). Postgres gets a
+# weighted tsvector column with a GIN index and a trigram index on name; SQLite, used
+# for local and test runs, gets an FTS5 index kept in sync by triggers. Databases
+# created before these existed get them from the Alembic migration.
+MEDICINE_SEARCH_DDL = {
+    "postgresql": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        """ALTER TABLE medicines ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(generic_name, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'C')
+        ) STORED""",
+        "CREATE INDEX ix_medicines_search_vector ON medicines USING gin (search_vector)",
+        "CREATE INDEX ix_medicines_name_trgm ON medicines USING gin (name gin_trgm_ops)",
+    ],
+    "sqlite": [
+        """CREATE VIRTUAL TABLE medicines_fts USING fts5(
+            name, generic_name, description, content='medicines', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )""",
+        """CREATE TRIGGER medicines_fts_insert AFTER INSERT ON medicines BEGIN
+            INSERT INTO medicines_fts(rowid, name, generic_name, description)
+            VALUES (new.id, new.name, new.generic_name, new.description);
+        END""",
+        """CREATE TRIGGER medicines_fts_delete AFTER DELETE ON medicines BEGIN
+            INSERT INTO medicines_fts(medicines_fts, rowid, name, generic_name, description)
+            VALUES ('delete', old.id, old.name, old.generic_name, old.description);
+        END""",
+        # Only text changes touch the index, so stock updates at checkout stay cheap
+        """CREATE TRIGGER medicines_fts_update AFTER UPDATE OF name, generic_name, description ON medicines BEGIN
+            INSERT INTO medicines_fts(medicines_fts, rowid, name, generic_name, description)
+            VALUES ('delete', old.id, old.name, old.generic_name, old.description);
+            INSERT INTO medicines_fts(rowid, name, generic_name, description)
+            VALUES (new.id, new.name, new.generic_name, new.description);
+        END""",
+    ],
+}
+
+for dialect, statements in MEDICINE_SEARCH_DDL.items():
+    for statement in statements:
+        event.listen(Medicine.__table__, "after_create", DDL(statement).execute_if(dialect=dialect))
+event.listen(Medicine.__table__, "before_drop", DDL("DROP TABLE IF EXISTS medicines_fts").execute_if(dialect="sqlite"))
+
 class MedicineAlternative(Base):
     __tablename__ = "medicine_alternatives"
     
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, Enum, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -20,6 +20,11 @@ class OrderType(str, enum.Enum):
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        # Keyset pagination of the admin queue and customer order lists
+        Index("ix_orders_status_created_at", "status", "created_at"),
+        Index("ix_orders_user_id_created_at", "user_id", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     order_number = Column(String, unique=True, index=True, nullable=False)
@@ -70,6 +75,10 @@ class OrderItem(Base):
     # Relationships
     order = relationship("Order", back_populates="items")
     medicine = relationship("Medicine")
+    
+    @property
+    def medicine_name(self):
+        return self.medicine.name if self.medicine else None
 
 class OrderPrescription(Base):
     __tablename__ = "order_prescriptions"
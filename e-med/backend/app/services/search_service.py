@@ -0,0 +1,43 @@
+import re
+from sqlalchemy import column, false, func, literal, literal_column, table
+from sqlalchemy.orm import Query
+from app.models.medicine import Medicine
+
+medicines_fts = table("medicines_fts", column("rowid"))
+
+class MedicineSearchService:
+    """Ranked medicine catalog search.
+
+    On Postgres, medicines match on the weighted search_vector (name, then
+    generic name, then description) or on a trigram word similarity to the
+    name, which tolerates typos. They rank by the sum of both scores. On
+    SQLite the FTS5 index is used instead, ranked by bm25 with the same
+    column order, and without typo tolerance. In both engines, the last word
+    of the term also matches as a prefix, so results follow the user's
+    typing.
+    """
+
+    @staticmethod
+    def search(query: Query, term: str) -> Query:
+        """Filter a Medicine query to matches for term, best matches first"""
+        words = re.findall(r"\w+", term.lower())
+        if not words:
+            return query.filter(false())
+
+        if query.session.get_bind().dialect.name == "postgresql":
+            tsquery = func.to_tsquery("english", " & ".join(words[:-1] + [words[-1] + ":*"]))
+            search_vector = literal_column("medicines.search_vector")
+            rank = func.ts_rank(search_vector, tsquery) + func.word_similarity(term, Medicine.name)
+            return query.filter(
+                search_vector.op("@@")(tsquery) | literal(term).op("<%")(Medicine.name)
+            ).order_by(rank.desc(), Medicine.id)
+
+        # FTS5 query syntax: every word quoted, so user input is never read as operators
+        match = " ".join(f'"{word}"' for word in words) + "*"
+        fts = literal_column("medicines_fts")
+        return query.join(medicines_fts, medicines_fts.c.rowid == Medicine.id).filter(
+            fts.op("MATCH")(match)
+        ).order_by(func.bm25(fts, 10.0, 5.0, 1.0), Medicine.id)
+
+# Global search service instance
+medicine_search_service = MedicineSearchService()
@@ -0,0 +1,75 @@
+from fastapi import HTTPException, status
+from sqlalchemy import case, select, update
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable
+from app.models.medicine import Medicine
+
+class StockService:
+    """Reserves and releases medicine stock without overselling.
+
+    Rows are always locked in medicine id order, so two carts sharing medicines
+    never wait on each other in opposite orders (the locks are real on Postgres;
+    SQLite renders no FOR UPDATE and serialises writers instead). The stock
+    change itself is a conditional UPDATE, so stock can never go negative even
+    when the rows were read without a lock.
+    """
+
+    @staticmethod
+    def lock_medicines(db: Session, medicine_ids: Iterable[int]) -> Dict[int, Medicine]:
+        """Load medicines by id, locking their rows until the transaction ends"""
+        query = db.query(Medicine).filter(
+            Medicine.id.in_(set(medicine_ids))
+        ).order_by(Medicine.id).with_for_update()
+        return {medicine.id: medicine for medicine in query}
+
+    @staticmethod
+    def reserve(db: Session, quantities: Dict[int, int]):
+        """Take quantities (medicine id -> amount) out of stock, all or nothing.
+
+        Raises a 400 and rolls the transaction back if any medicine is short.
+        """
+        requested = case(quantities, value=Medicine.id)
+        result = db.execute(
+            update(Medicine)
+            .where(Medicine.id.in_(sorted(quantities)), Medicine.stock_quantity >= requested)
+            .values(stock_quantity=Medicine.stock_quantity - requested)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == len(quantities):
+            return
+
+        # Rows that were short were left untouched, so they still show what is available
+        short = db.query(Medicine).filter(
+            Medicine.id.in_(quantities), Medicine.stock_quantity < requested
+        ).order_by(Medicine.id).first()
+        if short is None:
+            # A medicine was deleted after the cart was validated
+            error = HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Medicine not found"
+            )
+        else:
+            error = HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Insufficient stock for {short.name}. Available: {short.stock_quantity}"
+            )
+        db.rollback()
+        raise error
+
+    @staticmethod
+    def release(db: Session, quantities: Dict[int, int]):
+        """Put quantities (medicine id -> amount) back into stock"""
+        if not quantities:
+            return
+        db.execute(
+            select(Medicine.id).where(Medicine.id.in_(quantities)).order_by(Medicine.id).with_for_update()
+        )
+        db.execute(
+            update(Medicine)
+            .where(Medicine.id.in_(quantities))
+            .values(stock_quantity=Medicine.stock_quantity + case(quantities, value=Medicine.id))
+            .execution_options(synchronize_session=False)
+        )
+
+# Global stock service instance
+stock_service = StockService()
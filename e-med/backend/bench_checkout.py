@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Checkout benchmark
+Times POST /api/v1/orders/ against a throwaway SQLite database and counts the
+SQL statements each checkout issues, so cart size should not change the count.
+
+    python bench_checkout.py --items 1 10 50 --orders 200 --output checkout.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+# The app binds its database at import, so point it somewhere disposable first
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from main import app
+from app.core.database import Base, SessionLocal, engine
+from app.core.security import create_access_token
+from app.models.medicine import Medicine
+from app.models.prescription import Prescription
+from app.models.user import User, UserRole
+
+
+def seed(medicines: int, prescriptions: int):
+    """Create one customer, a catalog with ample stock, and a few prescriptions"""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        user = User(
+            email="bench@example.com",
+            phone="+10000000000",
+            hashed_password="-",
+            full_name="Bench Customer",
+            role=UserRole.CUSTOMER
+        )
+        db.add(user)
+        db.flush()
+        db.add_all(
+            Medicine(name=f"Medicine {i}", price=round(random.uniform(1, 100), 2), stock_quantity=10 ** 9)
+            for i in range(medicines)
+        )
+        db.add_all(
+            Prescription(user_id=user.id, file_url=f"https://example.com/{i}.pdf")
+            for i in range(prescriptions)
+        )
+        db.commit()
+        return user.email
+    finally:
+        db.close()
+
+
+def percentile(values, fraction: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run(client, headers, cart_size: int, orders: int, medicines: int, prescriptions: int):
+    statements = []
+    count = lambda *args, **kwargs: statements.append(1)
+    timings = []
+    counts = []
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        for _ in range(orders):
+            payload = {
+                "delivery_address": "1 Bench Street",
+                "items": [
+                    {"medicine_id": medicine_id, "quantity": random.randint(1, 3)}
+                    for medicine_id in random.sample(range(1, medicines + 1), cart_size)
+                ],
+                "prescription_ids": list(range(1, prescriptions + 1)) or None,
+            }
+            statements.clear()
+            start = time.perf_counter()
+            response = client.post("/api/v1/orders/", json=payload, headers=headers)
+            timings.append(time.perf_counter() - start)
+            counts.append(len(statements))
+            response.raise_for_status()
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    timings.sort()
+    return {
+        "items": cart_size,
+        "orders": orders,
+        "orders_per_second": round(orders / sum(timings), 1),
+        "p50_ms": round(percentile(timings, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(timings, 0.95) * 1000, 2),
+        "statements_per_order": sorted(counts)[len(counts) // 2],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark order checkout")
+    parser.add_argument("--items", type=int, nargs="+", default=[1, 10, 50], help="cart sizes to run")
+    parser.add_argument("--orders", type=int, default=200, help="checkouts per cart size")
+    parser.add_argument("--medicines", type=int, default=1000)
+    parser.add_argument("--prescriptions", type=int, default=2, help="prescriptions linked to every order")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    email = seed(args.medicines, args.prescriptions)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+    runs = []
+    with TestClient(app) as client:
+        for cart_size in args.items:
+            result = run(client, headers, cart_size, args.orders, args.medicines, args.prescriptions)
+            runs.append(result)
+            print(f"{cart_size:>4} items: {result['orders_per_second']:>7} orders/s  p50 {result['p50_ms']:>7} ms"
+                  f"  p95 {result['p95_ms']:>7} ms  {result['statements_per_order']} statements", file=sys.stderr)
+
+    report = json.dumps({"python": sys.version.split()[0], "runs": runs}, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
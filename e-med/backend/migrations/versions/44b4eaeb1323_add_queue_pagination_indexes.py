@@ -0,0 +1,39 @@
+"""add queue pagination indexes
+
+Revision ID: 44b4eaeb1323
+Revises:
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '44b4eaeb1323'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_orders_status_created_at", "orders", ["status", "created_at"]),
+    ("ix_orders_user_id_created_at", "orders", ["user_id", "created_at"]),
+    ("ix_prescriptions_status_created_at", "prescriptions", ["status", "created_at"]),
+    ("ix_prescriptions_user_id_created_at", "prescriptions", ["user_id", "created_at"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Build the indexes without blocking order writes on Postgres
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,79 @@
+"""add medicine search indexes
+
+Revision ID: bd09c5c71a04
+Revises: 44b4eaeb1323
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bd09c5c71a04'
+down_revision: Union[str, Sequence[str], None] = '44b4eaeb1323'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SQLITE_TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS medicines_fts_insert AFTER INSERT ON medicines BEGIN
+        INSERT INTO medicines_fts(rowid, name, generic_name, description)
+        VALUES (new.id, new.name, new.generic_name, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS medicines_fts_delete AFTER DELETE ON medicines BEGIN
+        INSERT INTO medicines_fts(medicines_fts, rowid, name, generic_name, description)
+        VALUES ('delete', old.id, old.name, old.generic_name, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS medicines_fts_update AFTER UPDATE OF name, generic_name, description ON medicines BEGIN
+        INSERT INTO medicines_fts(medicines_fts, rowid, name, generic_name, description)
+        VALUES ('delete', old.id, old.name, old.generic_name, old.description);
+        INSERT INTO medicines_fts(rowid, name, generic_name, description)
+        VALUES (new.id, new.name, new.generic_name, new.description);
+    END""",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute("""CREATE VIRTUAL TABLE IF NOT EXISTS medicines_fts USING fts5(
+            name, generic_name, description, content='medicines', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )""")
+        for trigger in SQLITE_TRIGGERS:
+            op.execute(trigger)
+        op.execute("INSERT INTO medicines_fts(medicines_fts) VALUES ('rebuild')")
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Adding a stored generated column rewrites the table once
+    op.execute("""ALTER TABLE medicines ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(generic_name, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'C')
+    ) STORED""")
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_medicines_search_vector", "medicines", ["search_vector"],
+            if_not_exists=True, postgresql_using="gin", postgresql_concurrently=True
+        )
+        op.create_index(
+            "ix_medicines_name_trgm", "medicines", [sa.text("name gin_trgm_ops")],
+            if_not_exists=True, postgresql_using="gin", postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        for trigger in ["medicines_fts_insert", "medicines_fts_delete", "medicines_fts_update"]:
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS medicines_fts")
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_medicines_name_trgm", table_name="medicines", if_exists=True, postgresql_concurrently=True)
+        op.drop_index("ix_medicines_search_vector", table_name="medicines", if_exists=True, postgresql_concurrently=True)
+    op.execute("ALTER TABLE medicines DROP COLUMN IF EXISTS search_vector")
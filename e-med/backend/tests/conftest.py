@@ -0,0 +1,80 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
+# The app binds its database at import; TEST_DATABASE_URL runs the suite against Postgres
+os.environ["DATABASE_URL"] = os.environ.get("TEST_DATABASE_URL") or (
+    "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db")
+)
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from main import app
+from app.core.database import Base, SessionLocal, engine
+from app.core.security import create_access_token
+from app.models.medicine import Medicine
+from app.models.user import User, UserRole
+
+
+@pytest.fixture(autouse=True)
+def database():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def make_user(db, email: str, role: UserRole = UserRole.CUSTOMER) -> User:
+    user = User(email=email, phone=email, hashed_password="-", full_name=email.split("@")[0], role=role)
+    db.add(user)
+    db.commit()
+    return user
+
+
+def make_medicine(db, stock: int, price: float = 10.0, name: str = "Paracetamol") -> Medicine:
+    medicine = Medicine(name=name, price=price, stock_quantity=stock)
+    db.add(medicine)
+    db.commit()
+    return medicine
+
+
+@contextmanager
+def count_queries():
+    """Collect every SQL statement the app runs inside the block"""
+    statements = []
+    record = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def auth_headers(user: User) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"}
+
+
+@pytest.fixture
+def customer(db):
+    return make_user(db, "customer@example.com")
+
+
+@pytest.fixture
+def admin(db):
+    return make_user(db, "admin@example.com", UserRole.PHARMACY_ADMIN)
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.order import Order, OrderStatus
+from app.models.prescription import Prescription, PrescriptionStatus
+from conftest import auth_headers, make_user
+
+
+def make_order(db, user, number, status=OrderStatus.PENDING, created_at=None):
+    order = Order(
+        order_number=f"ORD-{number:04d}",
+        user_id=user.id,
+        status=status,
+        subtotal=10.0,
+        total_amount=60.0,
+        delivery_address="1 Main St",
+        created_at=created_at,
+    )
+    db.add(order)
+    return order
+
+
+@pytest.fixture
+def orders(db, customer):
+    other = make_user(db, "other@example.com")
+    start = datetime(2025, 1, 1, 9, 0)
+    # Most rows share the server-default timestamp of one commit, so ties on created_at are common
+    for i in range(40):
+        make_order(db, customer if i % 4 else other, i, OrderStatus.PENDING if i % 3 else OrderStatus.DELIVERED)
+    for i in range(40, 60):
+        make_order(db, customer, i, created_at=start + timedelta(minutes=i // 3))
+    db.commit()
+    return db.query(Order).all()
+
+
+def walk(client, path, headers, limit):
+    """Follow X-Next-Cursor to the end and return the ids in page order"""
+    ids, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = client.get(path, params=params, headers=headers)
+        assert response.status_code == 200
+        ids += [row["id"] for row in response.json()]
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return ids, pages
+
+
+def position(order):
+    return (order.created_at.replace(tzinfo=None), order.id)
+
+
+def test_my_orders_walk_newest_first(client, orders, customer):
+    ids, pages = walk(client, "/api/v1/orders/user/me", auth_headers(customer), limit=7)
+
+    mine = sorted((o for o in orders if o.user_id == customer.id), key=position, reverse=True)
+    assert ids == [o.id for o in mine]
+    assert pages == -(-len(mine) // 7)
+
+
+def test_pending_queue_walk_oldest_first(client, orders, admin):
+    ids, _ = walk(client, "/api/v1/orders/admin/pending", auth_headers(admin), limit=5)
+
+    pending = sorted((o for o in orders if o.status == OrderStatus.PENDING), key=position)
+    assert ids == [o.id for o in pending]
+
+
+def test_page_boundaries_survive_new_orders(client, db, orders, customer):
+    headers = auth_headers(customer)
+    first = client.get("/api/v1/orders/user/me", params={"limit": 10}, headers=headers)
+    make_order(db, customer, 999)
+    db.commit()
+
+    second = client.get("/api/v1/orders/user/me", params={"limit": 10, "cursor": first.headers["X-Next-Cursor"]}, headers=headers)
+
+    mine = sorted((o for o in orders if o.user_id == customer.id), key=position, reverse=True)
+    assert [row["id"] for row in first.json() + second.json()] == [o.id for o in mine[:20]]
+
+
+def test_pending_prescriptions_walk_oldest_first(client, db, customer, admin):
+    for i in range(25):
+        db.add(Prescription(
+            user_id=customer.id,
+            file_url=f"https://example.com/{i}.pdf",
+            status=PrescriptionStatus.PENDING if i % 5 else PrescriptionStatus.VERIFIED,
+        ))
+    db.commit()
+
+    ids, _ = walk(client, "/api/v1/prescriptions/admin/pending", auth_headers(admin), limit=6)
+
+    pending = db.query(Prescription).filter(Prescription.status == PrescriptionStatus.PENDING)
+    assert ids == [p.id for p in sorted(pending, key=position)]
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "WzEsMl0=", "e30="])
+def test_invalid_cursor_is_rejected(client, customer, cursor):
+    response = client.get("/api/v1/orders/user/me", params={"cursor": cursor}, headers=auth_headers(customer))
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
@@ -0,0 +1,56 @@
+import pytest
+
+from app.models.medicine import Medicine
+
+
+@pytest.fixture
+def catalog(db):
+    medicines = [
+        Medicine(name="Paracetamol 500mg", generic_name="Acetaminophen", description="Pain and fever relief", price=2.5, stock_quantity=10),
+        Medicine(name="Crocin Advance", generic_name="Paracetamol", description="Fast fever relief", price=3.0, stock_quantity=0),
+        Medicine(name="Combiflam", generic_name="Ibuprofen and Paracetamol", description="Pain relief", price=4.0, stock_quantity=5),
+        Medicine(name="Ibuprofen 400mg", generic_name="Ibuprofen", description="Anti-inflammatory", price=3.5, stock_quantity=8),
+        Medicine(name="Cetirizine", generic_name="Cetirizine", description="Allergy relief; take after paracetamol if feverish", price=1.5, stock_quantity=20),
+    ]
+    db.add_all(medicines)
+    db.commit()
+    return {m.name: m.id for m in medicines}
+
+
+def names(client, **params):
+    response = client.get("/api/v1/medicines/", params=params)
+    assert response.status_code == 200
+    return [m["name"] for m in response.json()]
+
+
+def test_name_matches_rank_above_generic_and_description(client, catalog):
+    results = names(client, search="paracetamol")
+
+    assert results[0] == "Paracetamol 500mg"
+    assert set(results[1:3]) == {"Crocin Advance", "Combiflam"}
+    assert results[3] == "Cetirizine"
+
+
+def test_search_is_case_insensitive_and_prefix_matches_last_word(client, catalog):
+    assert names(client, search="IBUPRO") == ["Ibuprofen 400mg", "Combiflam"]
+    assert names(client, search="fever rel") == ["Crocin Advance", "Paracetamol 500mg"]
+
+
+def test_search_combines_with_filters(client, catalog):
+    assert names(client, search="paracetamol", in_stock=True, max_price=3.5) == ["Paracetamol 500mg", "Cetirizine"]
+
+
+def test_search_input_is_not_read_as_query_syntax(client, catalog):
+    assert names(client, search='paracetamol OR "') == []
+    assert names(client, search="***") == []
+
+
+def test_index_follows_renames_and_deletes(client, db, catalog):
+    medicine = db.get(Medicine, catalog["Cetirizine"])
+    medicine.name = "Levocetirizine"
+    db.commit()
+    db.delete(db.get(Medicine, catalog["Combiflam"]))
+    db.commit()
+
+    assert names(client, search="levocet") == ["Levocetirizine"]
+    assert "Combiflam" not in names(client, search="paracetamol")
@@ -0,0 +1,52 @@
+from app.models.medicine import Medicine
+from app.models.order import Order, OrderPrescription, OrderType
+from app.models.prescription import Prescription
+from conftest import auth_headers, count_queries, make_medicine, make_user
+
+
+def checkout(client, headers, items, **order):
+    return client.post("/api/v1/orders/", json={"delivery_address": "1 Main St", "items": items, **order}, headers=headers)
+
+
+def test_checkout_statement_count_does_not_grow_with_cart(client, db, customer):
+    medicine_ids = [make_medicine(db, stock=100, name=f"Medicine {i}").id for i in range(30)]
+    cart = [{"medicine_id": medicine_id, "quantity": 2} for medicine_id in medicine_ids]
+    headers = auth_headers(customer)
+
+    with count_queries() as small:
+        assert checkout(client, headers, cart[:1]).status_code == 200
+    with count_queries() as large:
+        response = checkout(client, headers, cart)
+    assert response.status_code == 200
+
+    assert len(response.json()["items"]) == 30
+    assert len(large) == len(small)
+
+
+def test_checkout_reserves_stock_and_links_own_prescriptions(client, db, customer):
+    first = make_medicine(db, stock=10, price=5.0, name="Ibuprofen")
+    second = make_medicine(db, stock=10, price=2.5, name="Cetirizine")
+    other = make_user(db, "other@example.com")
+    own = Prescription(user_id=customer.id, file_url="https://example.com/own.jpg")
+    foreign = Prescription(user_id=other.id, file_url="https://example.com/foreign.jpg")
+    db.add_all([own, foreign])
+    db.commit()
+
+    response = checkout(client, auth_headers(customer), [
+        {"medicine_id": first.id, "quantity": 2},
+        {"medicine_id": second.id, "quantity": 1},
+        {"medicine_id": first.id, "quantity": 3},
+    ], prescription_ids=[own.id, foreign.id, own.id])
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["subtotal"] == 27.5
+    assert [(i["medicine_name"], i["quantity"], i["total_price"]) for i in body["items"]] == [
+        ("Ibuprofen", 2, 10.0), ("Cetirizine", 1, 2.5), ("Ibuprofen", 3, 15.0),
+    ]
+    db.expire_all()
+    assert (db.get(Medicine, first.id).stock_quantity, db.get(Medicine, second.id).stock_quantity) == (5, 9)
+    order = db.get(Order, body["id"])
+    assert order.order_type == OrderType.PRESCRIPTION
+    assert [link.prescription_id for link in db.query(OrderPrescription)] == [own.id]
+
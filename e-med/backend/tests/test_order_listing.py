@@ -0,0 +1,61 @@
+import pytest
+
+from app.models.order import Order, OrderItem, OrderStatus
+from conftest import auth_headers, count_queries, make_medicine
+
+PAGE = 100
+
+
+@pytest.fixture
+def orders(db, customer):
+    medicines = [make_medicine(db, stock=1000, name=f"Medicine {i}") for i in range(5)]
+    orders = [
+        Order(
+            order_number=f"ORD-{i:04d}",
+            user_id=customer.id,
+            status=OrderStatus.PENDING,
+            subtotal=30.0,
+            total_amount=80.0,
+            delivery_address="1 Main St",
+            items=[
+                OrderItem(medicine_id=medicines[(i + j) % 5].id, quantity=1, unit_price=10.0, total_price=10.0)
+                for j in range(3)
+            ],
+        )
+        for i in range(PAGE)
+    ]
+    db.add_all(orders)
+    db.commit()
+    return orders
+
+
+@pytest.mark.parametrize("path, user", [
+    ("/api/v1/orders/", "admin"),
+    ("/api/v1/orders/user/me", "customer"),
+    ("/api/v1/orders/admin/pending", "admin"),
+])
+def test_order_listing_query_count(client, orders, request, path, user):
+    headers = auth_headers(request.getfixturevalue(user))
+
+    with count_queries() as statements:
+        response = client.get(path, params={"limit": PAGE}, headers=headers)
+
+    assert response.status_code == 200
+    page = response.json()
+    assert len(page) == PAGE
+    assert all(len(order["items"]) == 3 for order in page)
+    assert all(item["medicine_name"].startswith("Medicine ") for order in page for item in order["items"])
+    # The current user, the page of orders, and their items with medicine names
+    assert len(statements) == 3
+
+
+def test_created_order_includes_medicine_names(client, db, customer):
+    medicine = make_medicine(db, stock=10)
+
+    response = client.post("/api/v1/orders/", headers=auth_headers(customer), json={
+        "delivery_address": "1 Main St",
+        "items": [{"medicine_id": medicine.id, "quantity": 2}],
+    })
+
+    assert response.status_code == 200
+    assert response.json()["items"][0]["medicine_name"] == "Paracetamol"
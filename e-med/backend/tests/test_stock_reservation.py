@@ -0,0 +1,111 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+
+from app.api.v1.endpoints.orders import cancel_order, create_order
+from app.core.database import SessionLocal
+from app.models.medicine import Medicine
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.user import User
+from app.schemas.order import OrderCreate
+from conftest import auth_headers, make_medicine
+
+ORDERS = 300
+STOCK = 100
+
+
+def run_in_parallel(calls):
+    """Run each call on its own thread and session, released together; returns status codes"""
+    barrier = threading.Barrier(len(calls))
+
+    def run(call):
+        db = SessionLocal()
+        try:
+            barrier.wait()
+            asyncio.run(call(db))
+            return 200
+        except HTTPException as e:
+            return e.status_code
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=len(calls)) as pool:
+        return list(pool.map(run, calls))
+
+
+def test_parallel_orders_never_oversell(db, customer):
+    medicine = make_medicine(db, stock=STOCK)
+    order = OrderCreate(delivery_address="1 Main St", is_emergency=True, items=[{"medicine_id": medicine.id, "quantity": 1}])
+
+    async def place(session):
+        await create_order(order, session, session.get(User, customer.id))
+
+    codes = run_in_parallel([place] * ORDERS)
+
+    assert codes.count(200) == STOCK
+    assert codes.count(400) == ORDERS - STOCK
+    db.expire_all()
+    assert db.get(Medicine, medicine.id).stock_quantity == 0
+    assert db.query(Order).count() == STOCK
+
+
+def test_parallel_orders_over_shared_medicines_do_not_deadlock(db, customer):
+    first = make_medicine(db, stock=STOCK, name="Ibuprofen")
+    second = make_medicine(db, stock=STOCK, name="Cetirizine")
+    # Half the carts list the medicines in the opposite order
+    orders = [
+        OrderCreate(delivery_address="1 Main St", items=[
+            {"medicine_id": a.id, "quantity": 1}, {"medicine_id": b.id, "quantity": 1}
+        ])
+        for a, b in [(first, second), (second, first)]
+    ]
+
+    def place(order):
+        async def call(session):
+            await create_order(order, session, session.get(User, customer.id))
+        return call
+
+    codes = run_in_parallel([place(orders[i % 2]) for i in range(ORDERS)])
+
+    assert codes.count(200) == STOCK
+    db.expire_all()
+    assert db.get(Medicine, first.id).stock_quantity == 0
+    assert db.get(Medicine, second.id).stock_quantity == 0
+
+
+def test_insufficient_stock_writes_nothing(client, db, customer):
+    medicine = make_medicine(db, stock=2)
+
+    response = client.post("/api/v1/orders/", headers=auth_headers(customer), json={
+        "delivery_address": "1 Main St",
+        "items": [{"medicine_id": medicine.id, "quantity": 1}, {"medicine_id": medicine.id, "quantity": 2}],
+    })
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Insufficient stock for Paracetamol. Available: 2"
+    db.expire_all()
+    assert db.get(Medicine, medicine.id).stock_quantity == 2
+    assert db.query(Order).count() == 0
+    assert db.query(OrderItem).count() == 0
+
+
+def test_parallel_cancels_restore_stock_once(client, db, customer):
+    medicine = make_medicine(db, stock=10)
+    response = client.post("/api/v1/orders/", headers=auth_headers(customer), json={
+        "delivery_address": "1 Main St",
+        "items": [{"medicine_id": medicine.id, "quantity": 3}],
+    })
+    order_id = response.json()["id"]
+
+    async def cancel(session):
+        await cancel_order(order_id, session, session.get(User, customer.id))
+
+    codes = run_in_parallel([cancel] * 20)
+
+    assert codes.count(200) == 1
+    assert codes.count(400) == 19
+    db.expire_all()
+    assert db.get(Medicine, medicine.id).stock_quantity == 10
+    assert db.get(Order, order_id).status == OrderStatus.CANCELLED
@@ -142,7 +142,7 @@ export const orderAPI = {
     is_emergency?: boolean;
     delivery_partner_id?: number;
     limit?: number;
-    offset?: number;
+    cursor?: string;
   }): Promise<Order[]> => {
     const response: AxiosResponse<Order[]> = await api.get('/orders/', { params });
     return response.data;
@@ -206,7 +206,7 @@ export const prescriptionAPI = {
   getPrescriptions: async (params?: {
     status?: string;
     limit?: number;
-    offset?: number;
+    cursor?: string;
   }): Promise<Prescription[]> => {
     const response: AxiosResponse<Prescription[]> = await api.get('/prescriptions/', { params });
     return response.data;
@@ -222,7 +222,7 @@ export const prescriptionAPI = {
   getMyPrescriptions: async (params?: {
     status?: string;
     limit?: number;
-    offset?: number;
+    cursor?: string;
   }): Promise<Prescription[]> => {
     const response: AxiosResponse<Prescription[]> = await api.get('/prescriptions/user/me', { params });
     return response.data;
@@ -231,7 +231,7 @@ export const prescriptionAPI = {
   // Get pending prescriptions (Admin only)
   getPendingPrescriptions: async (params?: {
     limit?: number;
-    offset?: number;
+    cursor?: string;
   }): Promise<Prescription[]> => {
     const response: AxiosResponse<Prescription[]> = await api.get('/prescriptions/admin/pending', { params });
     return response.data;
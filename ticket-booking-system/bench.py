@@ -0,0 +1,230 @@
+"""Load-test the main pages and booking endpoint at configurable data scale.
+
+For each ``--bookings`` scale a worker process seeds a throwaway SQLite database
+with synthetic venues, events, ticket types and bookings, then drives the app
+in-process over ASGI from ``--concurrency`` clients with an even mix of
+
+    GET /, GET /bookings, GET /calendar, GET /booking-system/stats, POST /bookings,
+    GET /bookings/search (rare terms: a confirmation code or one event's number;
+    common terms: words found in most bookings)
+
+It reports throughput, p50/p95/p99 latency and SQL statements per request for
+each endpoint as JSON, so runs can be diffed for regressions. Statements are
+counted in a separate sequential pass (on both the request and writer engines),
+so concurrent requests do not blur the per-endpoint numbers. Run from the
+ticket-booking-system directory:
+
+    python bench.py --bookings 1000 100000 1000000 --concurrency 32 --output bench.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+ENDPOINTS = [
+    "GET /", "GET /bookings", "GET /calendar", "GET /booking-system/stats", "POST /bookings",
+    "GET /bookings/search?q=rare", "GET /bookings/search?q=common",
+]
+# Every seeded booking is for a "Standard" ticket at a "Venue n"
+COMMON_TERMS = ["Standard", "Venue", "Stand"]
+SEED_CHUNK = 50000
+
+
+def seed(main, venues: int, events: int, bookings: int):
+    main.run_migrations()
+    # The search index is rebuilt in one pass afterwards, rather than row by row
+    with main.engine.begin() as conn:
+        conn.exec_driver_sql("DROP TRIGGER booking_search_insert")
+    start = main.datetime(2025, 1, 1, 19, 0)
+    with main.engine.begin() as conn:
+        conn.execute(main.Venue.__table__.insert(), [
+            {"id": v, "name": f"Venue {v}", "address": f"{v} Main St", "capacity": 1000000} for v in range(1, venues + 1)
+        ])
+        conn.execute(main.Event.__table__.insert(), [
+            {"id": e, "name": f"Event {e}", "date": start + main.timedelta(days=e % 365), "venue_id": e % venues + 1}
+            for e in range(1, events + 1)
+        ])
+        conn.execute(main.TicketType.__table__.insert(), [
+            {"id": e, "name": "Standard", "price": 25.0, "event_id": e} for e in range(1, events + 1)
+        ])
+    # Bookings are inserted in chunks so a million rows never sit in memory at once
+    for first in range(0, bookings, SEED_CHUNK):
+        with main.engine.begin() as conn:
+            conn.execute(main.Booking.__table__.insert(), [
+                {
+                    "event_id": b % events + 1, "venue_id": (b % events + 1) % venues + 1, "ticket_type_id": b % events + 1,
+                    "quantity": 1, "status": "confirmed", "confirmation_code": f"S{b:09d}", "created_at": start,
+                }
+                for b in range(first, min(first + SEED_CHUNK, bookings))
+            ])
+    with main.engine.begin() as conn:
+        main._migration_booking_search(conn)
+    db = main.SessionLocal()
+    try:
+        main.reconcile_inventory(db)
+    finally:
+        db.close()
+
+
+def next_request(endpoint: str, events: int, venues: int):
+    """Return (method, path, form data) for one request to ``endpoint``."""
+    event_id = random.randint(1, events)
+    if endpoint == "POST /bookings":
+        data = {"event_id": event_id, "venue_id": event_id % venues + 1, "ticket_type_id": event_id, "quantity": 1}
+        return "POST", "/bookings", data
+    if endpoint == "GET /bookings/search?q=rare":
+        # Booking b has code S<b>, and there are at least as many bookings as events; an
+        # event's number alone matches its own bookings, where "Event" would match them all
+        q = random.choice([f"S{random.randint(0, events - 1):09d}", str(event_id)])
+        return "GET", f"/bookings/search?q={q}", None
+    if endpoint == "GET /bookings/search?q=common":
+        return "GET", f"/bookings/search?q={random.choice(COMMON_TERMS)}", None
+    if endpoint == "GET /calendar":
+        month = random.randint(1, 12)
+        return "GET", f"/calendar?from=2025-{month:02d}-01&to=2025-{month:02d}-28", None
+    return endpoint.split(" ", 1)[0], endpoint.split(" ", 1)[1], None
+
+
+def percentile(values, fraction: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def load(main, endpoints, concurrency: int, requests: int, events: int, venues: int):
+    import httpx
+
+    latencies = {endpoint: [] for endpoint in endpoints}
+    errors = dict.fromkeys(endpoints, 0)
+    remaining = iter(range(requests))
+
+    async def client_loop(client):
+        for _ in remaining:
+            endpoint = random.choice(endpoints)
+            method, path, data = next_request(endpoint, events, venues)
+            start = time.perf_counter()
+            # Bodies are read in full, so streamed pages are timed to their last byte
+            response = await client.request(method, path, data=data)
+            latencies[endpoint].append(time.perf_counter() - start)
+            # The booking form answers with a redirect to the bookings page
+            errors[endpoint] += response.status_code >= 400
+
+    transport = httpx.ASGITransport(app=main.app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+
+def count_queries(main, endpoints, events: int, venues: int, runs: int = 5):
+    """Median number of SQL statements per request, measured one request at a time."""
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event as sa_event
+
+    statements = []
+    count = lambda *args, **kwargs: statements.append(1)
+    engines = [main.engine] + ([main.writer_engine] if main.booking_writes is not None else [])
+    counts = {}
+    with TestClient(main.app) as client:
+        for endpoint in endpoints:
+            samples = []
+            for _ in range(runs):
+                method, path, data = next_request(endpoint, events, venues)
+                for engine in engines:
+                    sa_event.listen(engine, "before_cursor_execute", count)
+                try:
+                    statements.clear()
+                    client.request(method, path, data=data, follow_redirects=False)
+                    samples.append(len(statements))
+                finally:
+                    for engine in engines:
+                        sa_event.remove(engine, "before_cursor_execute", count)
+            counts[endpoint] = sorted(samples)[len(samples) // 2]
+    return counts
+
+
+def run_worker(args):
+    os.environ["TICKET_BOOKING_DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+    # The sweeper would only add noise to a run this short
+    os.environ["TICKET_BOOKING_HOLD_SWEEP_SECONDS"] = "0"
+    import main
+
+    random.seed(args.seed)
+    bookings = args.scale
+    events = args.events or max(10, min(10000, bookings // 100))
+    started = time.perf_counter()
+    seed(main, args.venues, events, bookings)
+    seed_seconds = time.perf_counter() - started
+    main.on_startup()
+
+    latencies, errors, elapsed = asyncio.run(load(main, args.endpoints, args.concurrency, args.requests, events, args.venues))
+    queries = count_queries(main, args.endpoints, events, args.venues)
+    report = {
+        "bookings": bookings,
+        "events": events,
+        "venues": args.venues,
+        "concurrency": args.concurrency,
+        "seed_seconds": round(seed_seconds, 2),
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(sum(len(v) for v in latencies.values()) / elapsed, 1),
+        "endpoints": {},
+    }
+    for endpoint in args.endpoints:
+        timings = sorted(latencies[endpoint])
+        if not timings:
+            continue
+        report["endpoints"][endpoint] = {
+            "requests": len(timings),
+            "errors": errors[endpoint],
+            "requests_per_second": round(len(timings) / elapsed, 1),
+            "p50_ms": round(percentile(timings, 0.50) * 1000, 1),
+            "p95_ms": round(percentile(timings, 0.95) * 1000, 1),
+            "p99_ms": round(percentile(timings, 0.99) * 1000, 1),
+            "queries_per_request": queries[endpoint],
+        }
+    print(json.dumps(report))
+
+
+def cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bookings", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="one run per scale, e.g. 1000 100000 1000000")
+    parser.add_argument("--events", type=int, help="events per run (default: one per 100 bookings, 10 to 10000)")
+    parser.add_argument("--venues", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=ENDPOINTS, metavar="ENDPOINT")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--scale", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scale:
+        run_worker(args)
+        return 0
+    runs = []
+    for scale in args.bookings:
+        # Each scale gets its own process, since the app binds its database at import
+        command = [sys.executable, os.path.abspath(__file__), "--scale", str(scale)] + sys.argv[1:]
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        run = json.loads(output.strip().splitlines()[-1])
+        runs.append(run)
+        print(f"{scale} bookings: {run['requests_per_second']} req/s", file=sys.stderr)
+        for endpoint, r in run["endpoints"].items():
+            print(f"  {endpoint:<26} {r['requests_per_second']:>8} req/s  p50 {r['p50_ms']:>7} ms  p95 {r['p95_ms']:>7} ms"
+                  f"  p99 {r['p99_ms']:>7} ms  {r['queries_per_request']:>3} queries  {r['errors']} errors", file=sys.stderr)
+    report = json.dumps({"python": sys.version.split()[0], "runs": runs}, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(cli())
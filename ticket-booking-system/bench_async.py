@@ -0,0 +1,129 @@
+"""Compare the sync and async (TICKET_BOOKING_ASYNC=1) modes under concurrent load.
+
+Each mode runs in its own process against a freshly seeded SQLite database; the
+clients talk to the app in-process over ASGI, so the numbers reflect the app and
+its database access rather than the network. Run from the ticket-booking-system
+directory (async mode needs aiosqlite):
+
+    python bench_async.py --clients 200 --requests 1000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def seed(main, events: int, bookings_per_event: int):
+    main.on_startup()
+    now = main.datetime(2025, 1, 1)
+    with main.engine.begin() as conn:
+        conn.execute(main.Venue.__table__.insert(), [
+            {"id": v, "name": f"Venue {v}", "address": f"{v} Main St", "capacity": 100000} for v in range(1, 11)
+        ])
+        conn.execute(main.Event.__table__.insert(), [
+            {"id": e, "name": f"Event {e}", "date": now, "venue_id": e % 10 + 1} for e in range(1, events + 1)
+        ])
+        conn.execute(main.TicketType.__table__.insert(), [
+            {"id": e, "name": "Standard", "price": 25.0, "event_id": e} for e in range(1, events + 1)
+        ])
+        conn.execute(main.Booking.__table__.insert(), [
+            {
+                "event_id": e, "venue_id": e % 10 + 1, "ticket_type_id": e, "quantity": 2,
+                "status": "confirmed", "confirmation_code": f"B{e:07d}{b:03d}", "created_at": now,
+            }
+            for e in range(1, events + 1) for b in range(bookings_per_event)
+        ])
+    db = main.SessionLocal()
+    try:
+        main.reconcile_inventory(db)
+    finally:
+        db.close()
+
+
+def next_request(events: int, write_ratio: float):
+    event_id = random.randint(1, events)
+    if random.random() < write_ratio:
+        line = {"event_id": event_id, "venue_id": event_id % 10 + 1, "ticket_type_id": event_id, "quantity": 1}
+        return "POST", "/bookings/bulk", {"bookings": [line]}
+    path = random.choice(["/events/{}/available-tickets", "/events/{}/bookings?limit=20", "/events/{}/revenue"])
+    return "GET", path.format(event_id), None
+
+
+async def load(main, clients: int, requests: int, events: int, write_ratio: float):
+    import httpx
+
+    latencies, errors = [], 0
+    remaining = iter(range(requests))
+
+    async def client_loop(client):
+        nonlocal errors
+        for _ in remaining:
+            method, path, body = next_request(events, write_ratio)
+            start = time.perf_counter()
+            response = await client.request(method, path, json=body)
+            latencies.append(time.perf_counter() - start)
+            errors += response.status_code >= 400
+
+    # Server errors (e.g. pool timeouts) are counted, not raised
+    transport = httpx.ASGITransport(app=main.app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+    if main.async_engine is not None:
+        await main.async_engine.dispose()
+    latencies.sort()
+    return {
+        "mode": "async" if main.ASYNC_MODE else "sync",
+        "clients": clients,
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 1),
+    }
+
+
+def run_worker(args):
+    os.environ["TICKET_BOOKING_DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+    os.environ["TICKET_BOOKING_ASYNC"] = "1" if args.mode == "async" else ""
+    import main
+
+    random.seed(0)
+    seed(main, args.events, args.bookings_per_event)
+    print(json.dumps(asyncio.run(load(main, args.clients, args.requests, args.events, args.write_ratio))))
+
+
+def cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--bookings-per-event", type=int, default=20)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--mode", choices=["sync", "async"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_worker(args)
+        return 0
+    results = []
+    for mode in ("sync", "async"):
+        command = [sys.executable, __file__, "--mode", mode] + sys.argv[1:]
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    print(f"{'mode':<6} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}  ({results[0]['requests']} requests, {results[0]['clients']} clients)")
+    for r in results:
+        print(f"{r['mode']:<6} {r['requests_per_second']:>8} {r['p50_ms']:>8} {r['p99_ms']:>8} {r['errors']:>7}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(cli())
@@ -0,0 +1,77 @@
+"""Benchmark the "/" dashboard against a synthetic database.
+
+Seeds a throwaway SQLite database, then times GET / and counts the SQL
+statements it issues. Run from the ticket-booking-system directory:
+
+    python bench_dashboard.py --events 10000 --runs 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ["TICKET_BOOKING_DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event as sa_event
+
+import main
+
+
+def seed(events: int, venues: int, bookings_per_event: int):
+    main.run_migrations()
+    now = main.datetime(2025, 1, 1)
+    with main.engine.begin() as conn:
+        conn.execute(main.Venue.__table__.insert(), [
+            {"id": v, "name": f"Venue {v}", "address": f"{v} Main St", "capacity": 1000} for v in range(1, venues + 1)
+        ])
+        conn.execute(main.Event.__table__.insert(), [
+            {"id": e, "name": f"Event {e}", "date": now, "venue_id": e % venues + 1} for e in range(1, events + 1)
+        ])
+        conn.execute(main.TicketType.__table__.insert(), [
+            {"id": e, "name": "Standard", "price": 25.0, "event_id": e} for e in range(1, events + 1)
+        ])
+        conn.execute(main.Booking.__table__.insert(), [
+            {
+                "event_id": e, "venue_id": e % venues + 1, "ticket_type_id": e, "quantity": 2,
+                "status": "confirmed", "confirmation_code": f"B{e:07d}{b:03d}", "created_at": now,
+            }
+            for e in range(1, events + 1) for b in range(bookings_per_event)
+        ])
+    db = main.SessionLocal()
+    try:
+        main.reconcile_inventory(db)
+    finally:
+        db.close()
+
+
+def cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=10000)
+    parser.add_argument("--venues", type=int, default=100)
+    parser.add_argument("--bookings-per-event", type=int, default=5)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    seed(args.events, args.venues, args.bookings_per_event)
+
+    statements = []
+    sa_event.listen(main.engine, "before_cursor_execute", lambda *a, **k: statements.append(1))
+    timings = []
+    with TestClient(main.app) as client:
+        for _ in range(args.runs):
+            statements.clear()
+            start = time.perf_counter()
+            response = client.get("/")
+            timings.append(time.perf_counter() - start)
+            assert response.status_code == 200
+    print(f"GET / with {args.events} events, {args.events * args.bookings_per_event} bookings")
+    print(f"  queries per request: {len(statements)}")
+    print(f"  median latency: {statistics.median(timings) * 1000:.1f} ms (min {min(timings) * 1000:.1f} ms, {args.runs} runs)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(cli())
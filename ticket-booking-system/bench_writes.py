@@ -0,0 +1,82 @@
+"""Sustained booking write throughput under each storage profile.
+
+Runs the same burst of single-booking POSTs from many threads against a fresh
+SQLite file for each configuration (rollback journal, WAL, WAL + write queue),
+each in its own process. Run from the ticket-booking-system directory:
+
+    python bench_writes.py --threads 32 --bookings 3000
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+CONFIGS = {
+    # The previous setup: driver defaults and SQLAlchemy's default pool
+    "legacy": {"TICKET_BOOKING_SQLITE_PROFILE": "legacy", "TICKET_BOOKING_WRITE_QUEUE": "0", "TICKET_BOOKING_POOL_SIZE": "5", "TICKET_BOOKING_MAX_OVERFLOW": "10"},
+    "wal": {"TICKET_BOOKING_SQLITE_PROFILE": "wal", "TICKET_BOOKING_WRITE_QUEUE": "0"},
+    "wal+queue": {"TICKET_BOOKING_SQLITE_PROFILE": "wal", "TICKET_BOOKING_WRITE_QUEUE": "1"},
+}
+
+
+def run_worker(args):
+    os.environ["TICKET_BOOKING_DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+    from fastapi.testclient import TestClient
+
+    import main
+
+    with TestClient(main.app, raise_server_exceptions=False) as client:
+        client.post("/venues", data={"name": "Arena", "address": "1 Main St", "capacity": 10 ** 9})
+        for e in range(1, 11):
+            client.post("/events", data={"name": f"Event {e}", "date": "2025-08-15T19:00", "venue_id": 1})
+            client.post("/ticket-types", data={"name": "Standard", "price": 50, "event_id": e})
+
+        def book(i):
+            data = {"event_id": i % 10 + 1, "venue_id": 1, "ticket_type_id": i % 10 + 1, "quantity": 1}
+            start = time.perf_counter()
+            status = client.post("/bookings", data=data, follow_redirects=False).status_code
+            return status, time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            results = list(pool.map(book, range(args.bookings)))
+        elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for _, latency in results)
+    booked = sum(status == 303 for status, _ in results)
+    print(json.dumps({
+        "bookings": booked,
+        "errors": len(results) - booked,
+        "bookings_per_second": round(booked / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 1),
+    }))
+
+
+def cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--bookings", type=int, default=3000)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args)
+        return 0
+    print(f"{args.bookings} bookings from {args.threads} threads")
+    print(f"{'config':<10} {'bookings/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for name, env in CONFIGS.items():
+        command = [sys.executable, __file__, "--worker"] + sys.argv[1:]
+        output = subprocess.run(command, check=True, capture_output=True, text=True, env=dict(os.environ, **env)).stdout
+        r = json.loads(output.strip().splitlines()[-1])
+        print(f"{name:<10} {r['bookings_per_second']:>10} {r['p50_ms']:>8} {r['p99_ms']:>8} {r['errors']:>7}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(cli())
@@ -0,0 +1,56 @@
+import os
+import tempfile
+
+# Point the app at a throwaway database before main is imported
+os.environ["TICKET_BOOKING_DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "ticket_booking_test.db")
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+
+@pytest.fixture
+def client():
+    main.Base.metadata.drop_all(bind=main.engine)
+    with main.engine.begin() as conn:
+        conn.exec_driver_sql("PRAGMA user_version = 0")
+    main.invalidate_calendar()
+    with TestClient(main.app) as c:
+        yield c
+
+
+@pytest.fixture
+def query_ceiling(client, monkeypatch):
+    """``query_ceiling("GET", "/", 3)`` requests the URL and fails if it issued more than 3 SQL statements.
+
+    Counts cover the whole response, including streamed bodies and queued writes.
+    """
+    finished = []
+    report = main.report_request_queries
+
+    def record(method, path, stats):
+        finished.append(stats.count)
+        report(method, path, stats)
+
+    monkeypatch.setattr(main, "report_request_queries", record)
+
+    def request(method, url, ceiling, **kwargs):
+        finished.clear()
+        response = client.request(method, url, follow_redirects=False, **kwargs)
+        assert response.status_code < 400, response.text
+        assert finished and finished[-1] <= ceiling, f"{method} {url} issued {finished[-1]} queries (ceiling {ceiling})"
+        return response
+
+    return request
+
+
+@pytest.fixture
+def setup_event(client):
+    """``setup_event(capacity=100)`` creates the Arena venue, its Finals event and a Standard ticket type, all id 1."""
+    def create(capacity=100, price=50):
+        client.post("/venues", data={"name": "Arena", "address": "1 Main St", "capacity": capacity})
+        client.post("/events", data={"name": "Finals", "date": "2025-08-15T19:00", "venue_id": 1})
+        client.post("/ticket-types", data={"name": "Standard", "price": price, "event_id": 1})
+
+    return create
@@ -1,29 +1,204 @@
 from fastapi import FastAPI, HTTPException, Depends, Query, Request, Form
-from sqlalchemy import create_engine, Column, Integer, String, ForeignKey, DateTime, Float, Enum, func
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
+from sqlalchemy import create_engine, Column, Integer, String, ForeignKey, DateTime, Float, Enum, Index, func, case, and_, or_, select, delete
+from sqlalchemy import event as sa_event, inspect as sa_inspect, literal_column, table as sa_table, column as sa_column
 from sqlalchemy.orm import sessionmaker, relationship, declarative_base, Session
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.util.concurrency import await_only, in_greenlet
 from pydantic import BaseModel, Field
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, date, timedelta
+import asyncio
+import base64
+import contextvars
+import csv
 import enum
+import functools
+import hashlib
+import hmac
+import inspect
+import io
+import itertools
+import json
+import logging
 import random
+import re
+import secrets
 import string
+import tempfile
+import threading
+import time
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, Response, StreamingResponse
+from jinja2 import FileSystemBytecodeCache
+from starlette.datastructures import MutableHeaders
 import os
-from collections import defaultdict
+import queue
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Future
 
-DATABASE_URL = "sqlite:///./ticket_booking.db"
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATABASE_URL = os.getenv("TICKET_BOOKING_DATABASE_URL", "sqlite:///./ticket_booking.db")
+ASYNC_MODE = os.getenv("TICKET_BOOKING_ASYNC", "") == "1"
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+# STORAGE PROFILE
+# Pragmas applied to every new SQLite connection. "wal" lets readers run alongside
+# the writer and makes lock waits block (busy_timeout) instead of failing at once;
+# "legacy" keeps the driver defaults (rollback journal). Single pragmas can be
+# overridden, e.g. TICKET_BOOKING_SQLITE_PRAGMAS="synchronous=FULL,mmap_size=0".
+SQLITE_PROFILES = {
+    "legacy": {},
+    "wal": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64 * 1024,  # in KiB
+    },
+}
+
+def sqlite_pragmas() -> dict:
+    pragmas = dict(SQLITE_PROFILES[os.getenv("TICKET_BOOKING_SQLITE_PROFILE", "wal")])
+    for item in filter(None, os.getenv("TICKET_BOOKING_SQLITE_PRAGMAS", "").split(",")):
+        name, _, value = (part.strip() for part in item.partition("="))
+        if not name.isidentifier() or not value.replace("-", "").isalnum():
+            raise ValueError(f"Invalid SQLite pragma setting: {item!r}")
+        pragmas[name] = value
+    return pragmas
+
+SQLITE_PRAGMAS = sqlite_pragmas()
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name} = {value}")
+    cursor.close()
+
+# Enough connections for every threadpool worker (40 by default): with fewer, the
+# workers can all block on the pool while finished requests wait for a worker to
+# release theirs
+POOL_OPTIONS = {} if ":memory:" in DATABASE_URL else {
+    "pool_size": int(os.getenv("TICKET_BOOKING_POOL_SIZE", "10")),
+    "max_overflow": int(os.getenv("TICKET_BOOKING_MAX_OVERFLOW", "30")),
+}
+
+engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False}, **POOL_OPTIONS)
+if engine.dialect.name == "sqlite":
+    sa_event.listen(engine, "connect", apply_sqlite_pragmas)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 app = FastAPI(title="Ticket Booking System")
+logger = logging.getLogger("ticket_booking")
+
+# QUERY COUNTER
+# Every SQL statement issued while serving a request is counted and timed against
+# that request (engine-level hooks, so the writer thread and async mode are
+# included). The totals so far are sent as X-Query-Count and Server-Timing headers;
+# for streamed pages that is what ran before the first byte. Once the response is
+# finished, a request over TICKET_BOOKING_QUERY_BUDGET statements, or one that
+# repeats a statement TICKET_BOOKING_QUERY_REPEAT_LIMIT times (a likely N+1), is
+# logged as a warning. 0 disables either check.
+QUERY_BUDGET = int(os.getenv("TICKET_BOOKING_QUERY_BUDGET", "25"))
+QUERY_REPEAT_LIMIT = int(os.getenv("TICKET_BOOKING_QUERY_REPEAT_LIMIT", "10"))
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = defaultdict(int)  # SQL text -> times issued
+
+_request_queries = contextvars.ContextVar("request_queries", default=None)
+
+@sa_event.listens_for(Engine, "before_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_queries.get()
+    if stats is not None:
+        stats.count += 1
+        stats.statements[statement] += 1
+        conn.info["query_started"] = time.perf_counter()
+
+@sa_event.listens_for(Engine, "after_cursor_execute")
+def _time_query(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_queries.get()
+    if stats is not None and "query_started" in conn.info:
+        stats.seconds += time.perf_counter() - conn.info.pop("query_started")
+
+def report_request_queries(method: str, path: str, stats: QueryStats):
+    if not stats.statements:
+        return
+    statement, repeats = max(stats.statements.items(), key=lambda item: item[1])
+    if QUERY_BUDGET and stats.count > QUERY_BUDGET:
+        logger.warning("%s %s issued %d queries (budget %d, %.1f ms); most repeated (%dx): %s",
+                       method, path, stats.count, QUERY_BUDGET, stats.seconds * 1000, repeats, statement)
+    elif QUERY_REPEAT_LIMIT and repeats >= QUERY_REPEAT_LIMIT:
+        logger.warning("%s %s repeated a query %d times (possible N+1): %s", method, path, repeats, statement)
+
+class QueryCounterMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = QueryStats()
+        token = _request_queries.set(stats)
+
+        async def send_with_counts(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Query-Count", str(stats.count))
+                headers.append("Server-Timing", f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"')
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_counts)
+        finally:
+            _request_queries.reset(token)
+            report_request_queries(scope["method"], scope["path"], stats)
+
+app.add_middleware(QueryCounterMiddleware)
 
 # Set up templates and static files
-templates = Jinja2Templates(directory="static/templates")
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Compiled templates are cached as bytecode on disk, so a restart skips the Jinja compile step
+TEMPLATE_CACHE_DIR = os.getenv("TICKET_BOOKING_TEMPLATE_CACHE", os.path.join(tempfile.gettempdir(), "ticket-booking-templates"))
+os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
+templates = Jinja2Templates(directory=os.path.join(BASE_DIR, "static", "templates"))
+templates.env.bytecode_cache = FileSystemBytecodeCache(TEMPLATE_CACHE_DIR)
+app.mount("/static", StaticFiles(directory=os.path.join(BASE_DIR, "static")), name="static")
+
+STREAM_CHUNK_SIZE = 16 * 1024
+
+def preload_templates():
+    for name in templates.env.list_templates(extensions=["html"]):
+        templates.get_template(name)
+
+def stream_template(name: str, context: dict, session: Optional[Session] = None) -> StreamingResponse:
+    """Render ``name`` incrementally as a chunked response; ``session`` is closed once the body is sent.
+
+    Context values may be generators, so rows are fetched while the page is written.
+    """
+    template = templates.get_template(name)
+
+    def body():
+        try:
+            chunk, size = [], 0
+            for piece in template.generate(context):
+                chunk.append(piece)
+                size += len(piece)
+                if size >= STREAM_CHUNK_SIZE:
+                    yield "".join(chunk)
+                    chunk, size = [], 0
+            yield "".join(chunk)
+        finally:
+            if session is not None:
+                session.close()
+
+    return StreamingResponse(body(), media_type="text/html; charset=utf-8")
 
 # Enum for Booking Status
 class BookingStatus(str, enum.Enum):
@@ -31,6 +206,11 @@ class BookingStatus(str, enum.Enum):
     cancelled = "cancelled"
     pending = "pending"
 
+# Enum for bulk booking behaviour when some lines cannot be booked
+class BulkBookingMode(str, enum.Enum):
+    all_or_nothing = "all_or_nothing"
+    partial = "partial"
+
 # MODELS
 class Venue(Base):
     __tablename__ = "venues"
@@ -42,6 +222,10 @@ class Venue(Base):
 
 class Event(Base):
     __tablename__ = "events"
+    __table_args__ = (
+        Index("ix_events_venue_date", "venue_id", "date"),
+        Index("ix_events_date", "date"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     description = Column(String)
@@ -50,18 +234,31 @@ class Event(Base):
     venue = relationship("Venue", back_populates="events")
     ticket_types = relationship("TicketType", back_populates="event", cascade="all, delete-orphan")
     bookings = relationship("Booking", back_populates="event", cascade="all, delete-orphan")
+    inventory = relationship("EventInventory", uselist=False, cascade="all, delete-orphan")
 
 class TicketType(Base):
     __tablename__ = "ticket_types"
+    __table_args__ = (
+        Index("ix_ticket_types_event_id", "event_id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)  # VIP, Standard, Economy
     price = Column(Float, nullable=False)
     event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
     event = relationship("Event", back_populates="ticket_types")
     bookings = relationship("Booking", back_populates="ticket_type", cascade="all, delete-orphan")
+    inventory = relationship("TicketTypeInventory", uselist=False, cascade="all, delete-orphan")
 
 class Booking(Base):
     __tablename__ = "bookings"
+    # Covering indexes for the hot filters: capacity and revenue sums per event,
+    # per ticket type sums, venue lookups and per-event listings by created_at
+    __table_args__ = (
+        Index("ix_bookings_event_status", "event_id", "status", "ticket_type_id", "quantity"),
+        Index("ix_bookings_ticket_type_status", "ticket_type_id", "status", "quantity"),
+        Index("ix_bookings_venue_id", "venue_id"),
+        Index("ix_bookings_event_created", "event_id", "created_at"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
     venue_id = Column(Integer, ForeignKey("venues.id"), nullable=False)
@@ -74,6 +271,65 @@ class Booking(Base):
     ticket_type = relationship("TicketType", back_populates="bookings")
     # venue relationship is not needed directly, as event.venue is available
 
+# Single-row counter handing out sequence numbers for confirmation codes, next to
+# the key that scrambles them
+class ConfirmationCodeSequence(Base):
+    __tablename__ = "confirmation_code_sequence"
+    id = Column(Integer, primary_key=True)
+    next_value = Column(Integer, nullable=False, default=0)
+    code_key = Column(String)
+
+# Seat inventory counters: confirmed quantity per event / ticket type, kept in step
+# with Booking writes so availability is a primary-key read instead of a SUM.
+class EventInventory(Base):
+    __tablename__ = "event_inventory"
+    event_id = Column(Integer, ForeignKey("events.id"), primary_key=True)
+    capacity = Column(Integer, nullable=False, default=0)
+    booked = Column(Integer, nullable=False, default=0)
+    # Seats reserved by live holds (see SEAT HOLDS); they count against capacity
+    held = Column(Integer, nullable=False, default=0)
+
+    @property
+    def remaining(self):
+        return self.capacity - self.booked - self.held
+
+class TicketTypeInventory(Base):
+    __tablename__ = "ticket_type_inventory"
+    # Covers the per-event revenue rollup
+    __table_args__ = (
+        Index("ix_ticket_type_inventory_event", "event_id", "revenue"),
+    )
+    ticket_type_id = Column(Integer, ForeignKey("ticket_types.id"), primary_key=True)
+    event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
+    booked = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0.0)
+
+# Seats held for a checkout until expires_at; confirming turns the hold into a
+# booking, and lapsed holds are released by the sweeper in expires_at order
+class SeatHold(Base):
+    __tablename__ = "seat_holds"
+    __table_args__ = (
+        Index("ix_seat_holds_expires_at", "expires_at"),
+        Index("ix_seat_holds_event_expires", "event_id", "expires_at"),
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
+    venue_id = Column(Integer, ForeignKey("venues.id"), nullable=False)
+    ticket_type_id = Column(Integer, ForeignKey("ticket_types.id"), nullable=False)
+    quantity = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+
+# Occupancy rollup per venue and day ("YYYY-MM-DD" of the event date), kept in step
+# with the event counters for the analytics endpoints
+class VenueDayOccupancy(Base):
+    __tablename__ = "venue_day_occupancy"
+    venue_id = Column(Integer, ForeignKey("venues.id"), primary_key=True)
+    day = Column(String, primary_key=True)
+    events = Column(Integer, nullable=False, default=0)
+    capacity = Column(Integer, nullable=False, default=0)
+    booked = Column(Integer, nullable=False, default=0)
+
 # SCHEMAS
 class VenueBase(BaseModel):
     name: str
@@ -132,6 +388,69 @@ class BookingOut(BookingBase):
     class Config:
         orm_mode = True
 
+class BulkBookingCreate(BaseModel):
+    bookings: List[BookingCreate]
+    mode: BulkBookingMode = BulkBookingMode.all_or_nothing
+
+class BulkBookingError(BaseModel):
+    index: int
+    detail: str
+
+class BulkBookingResult(BaseModel):
+    created: List[BookingOut]
+    errors: List[BulkBookingError]
+
+class HoldCreate(BaseModel):
+    ticket_type_id: int
+    quantity: int
+    minutes: Optional[int] = None
+
+class HoldOut(BaseModel):
+    id: int
+    event_id: int
+    venue_id: int
+    ticket_type_id: int
+    quantity: int
+    created_at: datetime
+    expires_at: datetime
+    class Config:
+        orm_mode = True
+
+# Keyset-paginated list responses; pass next_cursor back as ?cursor= for the next page
+class BookingPage(BaseModel):
+    items: List[BookingOut]
+    next_cursor: Optional[str] = None
+
+class EventPage(BaseModel):
+    items: List[EventOut]
+    next_cursor: Optional[str] = None
+
+class VenueSummary(BaseModel):
+    id: int
+    name: str
+    address: str
+    capacity: int
+    event_count: int
+    class Config:
+        orm_mode = True
+
+class VenueSummaryPage(BaseModel):
+    items: List[VenueSummary]
+    next_cursor: Optional[str] = None
+
+class TicketTypeSummary(BaseModel):
+    id: int
+    name: str
+    price: float
+    event_id: int
+    booking_count: int
+    class Config:
+        orm_mode = True
+
+class TicketTypeSummaryPage(BaseModel):
+    items: List[TicketTypeSummary]
+    next_cursor: Optional[str] = None
+
 # Dependency
 
 def get_db():
@@ -141,26 +460,634 @@ def get_db():
     finally:
         db.close()
 
+# QUERIES
+# Hot aggregate queries, kept as builders so test_query_plans.py can check their plans
+def confirmed_quantity_query(db: Session, event_id: int):
+    return db.query(func.sum(Booking.quantity)).filter(Booking.event_id == event_id, Booking.status == BookingStatus.confirmed)
+
+def event_revenue_query(db: Session, event_id: int):
+    return db.query(func.sum(TicketTypeInventory.revenue)).filter(TicketTypeInventory.event_id == event_id)
+
+def venue_occupancy_query(db: Session, venue_id: Optional[int] = None):
+    query = db.query(Venue.id, Venue.name, Venue.capacity, Event.id, Event.name, EventInventory.booked).outerjoin(
+        Event, Event.venue_id == Venue.id
+    ).outerjoin(EventInventory, EventInventory.event_id == Event.id)
+    if venue_id is not None:
+        query = query.filter(Venue.id == venue_id)
+    return query.order_by(Venue.id, Event.id)
+
+# INVENTORY HELPERS
+def _increment_booked(db: Session, model, criterion, delta: int) -> int:
+    return db.query(model).filter(criterion).update({model.booked: model.booked + delta}, synchronize_session=False)
+
+def build_event_inventory(db: Session, event_id: int):
+    # Fallback for events created before the counters existed; startup backfill covers the rest
+    event = db.query(Event).filter(Event.id == event_id).first()
+    if event is None:
+        return None
+    venue = db.query(Venue).filter(Venue.id == event.venue_id).first()
+    booked = confirmed_quantity_query(db, event_id).scalar()
+    held = db.query(func.sum(SeatHold.quantity)).filter(SeatHold.event_id == event_id).scalar()
+    inventory = EventInventory(event_id=event_id, capacity=venue.capacity if venue else 0, booked=int(booked or 0), held=int(held or 0))
+    db.add(inventory)
+    db.flush()
+    return inventory
+
+def build_ticket_type_inventory(db: Session, ticket_type_id: int):
+    ticket_type = db.query(TicketType).filter(TicketType.id == ticket_type_id).first()
+    if ticket_type is None:
+        return None
+    booked = db.query(func.sum(Booking.quantity)).filter(Booking.ticket_type_id == ticket_type_id, Booking.status == BookingStatus.confirmed).scalar()
+    inventory = TicketTypeInventory(ticket_type_id=ticket_type_id, event_id=ticket_type.event_id, booked=int(booked or 0), revenue=int(booked or 0) * ticket_type.price)
+    db.add(inventory)
+    db.flush()
+    return inventory
+
+def get_event_inventory(db: Session, event_id: int):
+    inventory = db.query(EventInventory).filter(EventInventory.event_id == event_id).first()
+    if inventory is None:
+        inventory = build_event_inventory(db, event_id)
+    return inventory
+
+def adjust_inventory(db: Session, event_id: int, ticket_type_id: int, delta: int):
+    """Apply a change in confirmed quantity to the event and ticket type counters.
+
+    Must be called before the booking change itself is flushed, so that a counter
+    built on the fly from Booking rows does not count the change twice.
+    """
+    if not delta:
+        return
+    mark_event_changed(db, event_id)
+    if not _increment_booked(db, EventInventory, EventInventory.event_id == event_id, delta):
+        if build_event_inventory(db, event_id) is None:
+            count_ticket_type_seats(db, ticket_type_id, delta)
+            return
+        _increment_booked(db, EventInventory, EventInventory.event_id == event_id, delta)
+    count_venue_day_seats(db, event_id, delta)
+    count_ticket_type_seats(db, ticket_type_id, delta)
+
+def _reserve_event_seats(db: Session, event_id: int, quantity: int, column) -> bool:
+    """Add ``quantity`` to ``column`` (booked or held) with a conditional UPDATE on the event counter.
+
+    The capacity check and the increment are one statement, so two concurrent
+    requests can never both pass the check. When the event looks full, its lapsed
+    holds are released and the claim is tried once more.
+    """
+    def claim():
+        return db.query(EventInventory).filter(
+            EventInventory.event_id == event_id,
+            EventInventory.booked + EventInventory.held + quantity <= EventInventory.capacity,
+        ).update({column: column + quantity}, synchronize_session=False)
+
+    if claim():
+        return True
+    if db.query(EventInventory.event_id).filter(EventInventory.event_id == event_id).first() is None:
+        return build_event_inventory(db, event_id) is not None and bool(claim())
+    return expire_holds(db, event_id=event_id) > 0 and bool(claim())
+
+def claim_event_seats(db: Session, event_id: int, quantity: int) -> bool:
+    """Claim confirmed seats; returns False if the event would be oversold (or does not exist)."""
+    if not _reserve_event_seats(db, event_id, quantity, EventInventory.booked):
+        return False
+    mark_event_changed(db, event_id)
+    count_venue_day_seats(db, event_id, quantity)
+    return True
+
+def _increment_ticket_type(db: Session, ticket_type_id: int, quantity: int) -> int:
+    price = db.query(TicketType.price).filter(TicketType.id == ticket_type_id).scalar_subquery()
+    return db.query(TicketTypeInventory).filter(TicketTypeInventory.ticket_type_id == ticket_type_id).update({
+        TicketTypeInventory.booked: TicketTypeInventory.booked + quantity,
+        TicketTypeInventory.revenue: TicketTypeInventory.revenue + quantity * func.coalesce(price, 0.0),
+    }, synchronize_session=False)
+
+def count_ticket_type_seats(db: Session, ticket_type_id: int, quantity: int):
+    # Ticket types have no capacity of their own, so this never refuses
+    if not _increment_ticket_type(db, ticket_type_id, quantity):
+        if build_ticket_type_inventory(db, ticket_type_id) is not None:
+            _increment_ticket_type(db, ticket_type_id, quantity)
+
+def build_venue_day_occupancy(db: Session, venue_id: int, day: str):
+    # Summed from the event counters, so call it after they include the change being made
+    events, capacity, booked = db.query(func.count(Event.id), func.sum(EventInventory.capacity), func.sum(EventInventory.booked)).join(
+        EventInventory, EventInventory.event_id == Event.id
+    ).filter(Event.venue_id == venue_id, func.date(Event.date) == day).one()
+    occupancy = VenueDayOccupancy(venue_id=venue_id, day=day, events=events, capacity=int(capacity or 0), booked=int(booked or 0))
+    db.add(occupancy)
+    db.flush()
+    return occupancy
+
+def count_venue_day_seats(db: Session, event_id: int, quantity: int):
+    venue_id = db.query(Event.venue_id).filter(Event.id == event_id).scalar_subquery()
+    day = db.query(func.date(Event.date)).filter(Event.id == event_id).scalar_subquery()
+    if not _increment_booked(db, VenueDayOccupancy, and_(VenueDayOccupancy.venue_id == venue_id, VenueDayOccupancy.day == day), quantity):
+        key = db.query(Event.venue_id, func.date(Event.date)).filter(Event.id == event_id).first()
+        if key is not None:
+            build_venue_day_occupancy(db, *key)
+
+def count_venue_day_event(db: Session, event: Event):
+    """Add a newly flushed event (with its inventory) to its venue/day rollup."""
+    day = event.date.strftime("%Y-%m-%d")
+    criterion = and_(VenueDayOccupancy.venue_id == event.venue_id, VenueDayOccupancy.day == day)
+    if not db.query(VenueDayOccupancy).filter(criterion).update({
+        VenueDayOccupancy.events: VenueDayOccupancy.events + 1,
+        VenueDayOccupancy.capacity: VenueDayOccupancy.capacity + event.inventory.capacity,
+    }, synchronize_session=False):
+        build_venue_day_occupancy(db, event.venue_id, day)
+
+def reserve_inventory(db: Session, event_id: int, ticket_type_id: int, quantity: int) -> bool:
+    if not claim_event_seats(db, event_id, quantity):
+        return False
+    count_ticket_type_seats(db, ticket_type_id, quantity)
+    return True
+
+def check_quantity(quantity: int):
+    # A zero or negative quantity would lower the counters and let later bookings oversell
+    if quantity < 1:
+        raise HTTPException(status_code=400, detail="Quantity must be at least 1.")
+
+def claim_inventory(db: Session, booking: Booking) -> bool:
+    if booking.status == BookingStatus.confirmed:
+        return reserve_inventory(db, booking.event_id, booking.ticket_type_id, booking.quantity)
+    return True
+
+def release_inventory(db: Session, booking: Booking):
+    if booking.status == BookingStatus.confirmed:
+        adjust_inventory(db, booking.event_id, booking.ticket_type_id, -booking.quantity)
+
+BUSY_RETRIES = 8
+# Revenue counters are float sums built up one booking at a time
+REVENUE_TOLERANCE = 0.005
+
+def _is_sqlite_busy(exc: OperationalError) -> bool:
+    message = str(exc.orig).lower()
+    return "database is locked" in message or "database is busy" in message
+
+def _busy_backoff(attempt: int):
+    delay = random.uniform(0, 0.005 * 2 ** attempt)
+    if in_greenlet():
+        # Async mode: the endpoint runs in AsyncSession.run_sync on the event loop
+        await_only(asyncio.sleep(delay))
+    else:
+        time.sleep(delay)
+
+def commit_with_retry(db: Session, work):
+    """Run ``work()`` and commit, replaying the whole transaction if SQLite is busy.
+
+    ``work`` must be safe to re-run from scratch: any exception rolls the session
+    back, and only "database is locked" errors are retried (with jittered backoff).
+    """
+    for attempt in range(BUSY_RETRIES):
+        try:
+            result = work()
+            db.commit()
+            return result
+        except OperationalError as exc:
+            db.rollback()
+            if not _is_sqlite_busy(exc) or attempt == BUSY_RETRIES - 1:
+                raise
+            _busy_backoff(attempt)
+        except Exception:
+            db.rollback()
+            raise
+
+# WRITE QUEUE
+# Booking inserts are handed to one writer thread with its own connection instead of
+# racing each other for SQLite's write lock. The writer takes whatever is queued (up
+# to WRITE_BATCH_SIZE jobs), opens one BEGIN IMMEDIATE transaction, runs each job in
+# a SAVEPOINT so a failing job (e.g. sold out) is undone alone, and commits the batch
+# once. On by default for SQLite; TICKET_BOOKING_WRITE_QUEUE=0 turns it off. Async
+# mode does not use it, as waiting for the writer would block the event loop.
+WRITE_BATCH_SIZE = 64
+
+class BookingWriteQueue:
+    def __init__(self, session_factory, batch_size: int = WRITE_BATCH_SIZE):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.jobs = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def submit(self, work):
+        """Run ``work(session)`` in the writer's next batch; returns its result or raises its exception."""
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="booking-writer", daemon=True)
+                self.thread.start()
+        future = Future()
+        # Run in the caller's context, so its statements count towards its request
+        self.jobs.put((functools.partial(contextvars.copy_context().run, work), future))
+        return future.result()
+
+    def run(self):
+        while True:
+            batch = [self.jobs.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.jobs.get_nowait())
+                except queue.Empty:
+                    break
+            self.run_batch(batch)
+
+    def run_batch(self, batch):
+        # Jobs are replayable (as with commit_with_retry), so a busy commit reruns the batch
+        for attempt in range(BUSY_RETRIES):
+            session = self.session_factory()
+            outcomes = []
+            try:
+                for work, future in batch:
+                    savepoint = session.begin_nested()
+                    try:
+                        result = work(session)
+                        savepoint.commit()
+                        outcomes.append((future, result, None))
+                    except Exception as exc:
+                        if isinstance(exc, OperationalError) and _is_sqlite_busy(exc):
+                            raise
+                        savepoint.rollback()
+                        outcomes.append((future, None, exc))
+                session.commit()
+            except OperationalError as exc:
+                session.rollback()
+                session.close()
+                if _is_sqlite_busy(exc) and attempt < BUSY_RETRIES - 1:
+                    _busy_backoff(attempt)
+                    continue
+                for _, future in batch:
+                    future.set_exception(exc)
+                return
+            except Exception as exc:
+                session.rollback()
+                session.close()
+                for _, future in batch:
+                    future.set_exception(exc)
+                return
+            session.close()
+            for future, result, exc in outcomes:
+                if exc is None:
+                    future.set_result(result)
+                else:
+                    future.set_exception(exc)
+            return
+
+def _begin_immediate(conn):
+    conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+def _autocommit_driver(dbapi_connection, connection_record):
+    # Let SQLAlchemy issue BEGIN itself (the driver's implicit one breaks SAVEPOINTs)
+    dbapi_connection.isolation_level = None
+
+booking_writes = None
+if engine.dialect.name == "sqlite" and not ASYNC_MODE and os.getenv("TICKET_BOOKING_WRITE_QUEUE", "1") == "1":
+    writer_engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False}, pool_size=1, max_overflow=0)
+    sa_event.listen(writer_engine, "connect", apply_sqlite_pragmas)
+    sa_event.listen(writer_engine, "connect", _autocommit_driver)
+    sa_event.listen(writer_engine, "begin", _begin_immediate)
+    # Results are handed to other threads after the writer's session is closed, so
+    # they must stay loaded rather than expire on commit
+    booking_writes = BookingWriteQueue(sessionmaker(bind=writer_engine, autoflush=False, expire_on_commit=False))
+
+def run_booking_write(db: Session, work):
+    """Commit ``work(session)`` through the write queue when it is enabled, else on ``db``."""
+    if booking_writes is not None:
+        return booking_writes.submit(work)
+    return commit_with_retry(db, lambda: work(db))
+
+def reconcile_inventory(db: Session, apply: bool = True, missing_only: bool = False):
+    """Rebuild the inventory counters from Booking rows and report drift.
+
+    With ``missing_only`` only absent counter rows are created (used on startup);
+    with ``apply=False`` nothing is written and the drift is only reported.
+    """
+    events = db.query(Event.id, Event.venue_id, func.date(Event.date), Venue.capacity).outerjoin(Venue, Event.venue_id == Venue.id).all()
+    capacities = {event_id: capacity for event_id, _, _, capacity in events}
+    ticket_type_events = dict(db.query(TicketType.id, TicketType.event_id).all())
+    event_booked = dict(db.query(Booking.event_id, func.sum(Booking.quantity)).filter(Booking.status == BookingStatus.confirmed).group_by(Booking.event_id).all())
+    type_totals = {
+        ticket_type_id: (booked, revenue)
+        for ticket_type_id, booked, revenue in db.query(Booking.ticket_type_id, func.sum(Booking.quantity), func.sum(Booking.quantity * TicketType.price)).join(
+            TicketType, Booking.ticket_type_id == TicketType.id
+        ).filter(Booking.status == BookingStatus.confirmed).group_by(Booking.ticket_type_id)
+    }
+    event_held = dict(db.query(SeatHold.event_id, func.sum(SeatHold.quantity)).group_by(SeatHold.event_id).all())
+    event_rows = {i.event_id: i for i in db.query(EventInventory).all()}
+    type_rows = {i.ticket_type_id: i for i in db.query(TicketTypeInventory).all()}
+    day_rows = {(i.venue_id, i.day): i for i in db.query(VenueDayOccupancy).all()}
+    drift = []
+
+    for event_id, capacity in capacities.items():
+        actual = {"capacity": int(capacity or 0), "booked": int(event_booked.get(event_id) or 0), "held": int(event_held.get(event_id) or 0)}
+        row = event_rows.pop(event_id, None)
+        if row is None:
+            drift.append({"table": "event_inventory", "id": event_id, "stored": None, "actual": actual})
+            if apply:
+                db.add(EventInventory(event_id=event_id, **actual))
+        elif not missing_only and (row.capacity, row.booked, row.held) != (actual["capacity"], actual["booked"], actual["held"]):
+            drift.append({"table": "event_inventory", "id": event_id, "stored": {"capacity": row.capacity, "booked": row.booked, "held": row.held}, "actual": actual})
+            if apply:
+                row.capacity, row.booked, row.held = actual["capacity"], actual["booked"], actual["held"]
+
+    for ticket_type_id, event_id in ticket_type_events.items():
+        booked, revenue = type_totals.get(ticket_type_id, (0, 0.0))
+        actual = {"event_id": event_id, "booked": int(booked or 0), "revenue": float(revenue or 0.0)}
+        row = type_rows.pop(ticket_type_id, None)
+        if row is None:
+            drift.append({"table": "ticket_type_inventory", "id": ticket_type_id, "stored": None, "actual": actual})
+            if apply:
+                db.add(TicketTypeInventory(ticket_type_id=ticket_type_id, **actual))
+        elif not missing_only and ((row.event_id, row.booked) != (actual["event_id"], actual["booked"]) or abs(row.revenue - actual["revenue"]) > REVENUE_TOLERANCE):
+            drift.append({"table": "ticket_type_inventory", "id": ticket_type_id, "stored": {"event_id": row.event_id, "booked": row.booked, "revenue": row.revenue}, "actual": actual})
+            if apply:
+                row.event_id, row.booked, row.revenue = actual["event_id"], actual["booked"], actual["revenue"]
+
+    # Venue/day rollups, summed from the actual per-event figures above
+    venue_days = defaultdict(lambda: {"events": 0, "capacity": 0, "booked": 0})
+    for event_id, venue_id, day, capacity in events:
+        totals = venue_days[(venue_id, day)]
+        totals["events"] += 1
+        totals["capacity"] += int(capacity or 0)
+        totals["booked"] += int(event_booked.get(event_id) or 0)
+    for (venue_id, day), actual in venue_days.items():
+        row = day_rows.pop((venue_id, day), None)
+        if row is None:
+            drift.append({"table": "venue_day_occupancy", "id": [venue_id, day], "stored": None, "actual": actual})
+            if apply:
+                db.add(VenueDayOccupancy(venue_id=venue_id, day=day, **actual))
+        elif not missing_only and (row.events, row.capacity, row.booked) != (actual["events"], actual["capacity"], actual["booked"]):
+            drift.append({"table": "venue_day_occupancy", "id": [venue_id, day], "stored": {"events": row.events, "capacity": row.capacity, "booked": row.booked}, "actual": actual})
+            if apply:
+                row.events, row.capacity, row.booked = actual["events"], actual["capacity"], actual["booked"]
+
+    # Counters left over for events / ticket types / days that no longer exist
+    if not missing_only:
+        for table, rows in (("event_inventory", event_rows), ("ticket_type_inventory", type_rows), ("venue_day_occupancy", day_rows)):
+            for key, row in rows.items():
+                drift.append({"table": table, "id": list(key) if isinstance(key, tuple) else key, "stored": {"booked": row.booked}, "actual": None})
+                if apply:
+                    db.delete(row)
+
+    if apply:
+        db.commit()
+        if drift:
+            invalidate_calendar()
+    return {"events_checked": len(capacities), "ticket_types_checked": len(ticket_type_events), "drift": drift}
+
+# SCHEMA MIGRATIONS
+# Applied in order on startup; SQLite's PRAGMA user_version records how many have
+# run. The first step creates the full current schema on a fresh database, so
+# later steps must be idempotent (checkfirst) and only matter for older files.
+def _migration_initial_schema(conn):
+    Base.metadata.create_all(bind=conn)
+
+def _migration_hot_filter_indexes(conn):
+    for table in (Booking.__table__, Event.__table__, TicketType.__table__):
+        for index in table.indexes:
+            index.create(bind=conn, checkfirst=True)
+
+def _migration_confirmation_code_sequence(conn):
+    ConfirmationCodeSequence.__table__.create(bind=conn, checkfirst=True)
+    if conn.execute(ConfirmationCodeSequence.__table__.select()).first() is None:
+        conn.execute(ConfirmationCodeSequence.__table__.insert().values(id=1, next_value=0))
+
+def _migration_analytics_rollups(conn):
+    columns = {column["name"] for column in sa_inspect(conn).get_columns("ticket_type_inventory")}
+    if "revenue" not in columns:
+        conn.exec_driver_sql("ALTER TABLE ticket_type_inventory ADD COLUMN revenue FLOAT NOT NULL DEFAULT 0")
+        conn.exec_driver_sql(
+            "UPDATE ticket_type_inventory SET revenue = booked * "
+            "COALESCE((SELECT price FROM ticket_types WHERE ticket_types.id = ticket_type_inventory.ticket_type_id), 0)"
+        )
+    for index in TicketTypeInventory.__table__.indexes:
+        index.create(bind=conn, checkfirst=True)
+    # Rows are filled in by the startup backfill (reconcile_inventory)
+    VenueDayOccupancy.__table__.create(bind=conn, checkfirst=True)
+
+def _migration_seat_holds(conn):
+    columns = {column["name"] for column in sa_inspect(conn).get_columns("event_inventory")}
+    if "held" not in columns:
+        conn.exec_driver_sql("ALTER TABLE event_inventory ADD COLUMN held INTEGER NOT NULL DEFAULT 0")
+    SeatHold.__table__.create(bind=conn, checkfirst=True)
+    for index in SeatHold.__table__.indexes:
+        index.create(bind=conn, checkfirst=True)
+
+# booking_search rows are a copy of each booking's searchable text (rowid = booking
+# id); the triggers keep them in step with bookings and with renamed or deleted
+# events, venues and ticket types
+BOOKING_SEARCH_TEXT = """
+    (SELECT name FROM events WHERE id = {b}.event_id),
+    (SELECT name FROM venues WHERE id = {b}.venue_id),
+    (SELECT name FROM ticket_types WHERE id = {b}.ticket_type_id),
+    {b}.confirmation_code
+"""
+BOOKING_SEARCH_TRIGGERS = {
+    "booking_search_insert": f"""
+        AFTER INSERT ON bookings BEGIN
+            INSERT INTO booking_search (rowid, event_name, venue_name, ticket_type_name, confirmation_code)
+            VALUES (new.id, {BOOKING_SEARCH_TEXT.format(b="new")});
+        END""",
+    "booking_search_update": f"""
+        AFTER UPDATE OF event_id, venue_id, ticket_type_id, confirmation_code ON bookings BEGIN
+            DELETE FROM booking_search WHERE rowid = old.id;
+            INSERT INTO booking_search (rowid, event_name, venue_name, ticket_type_name, confirmation_code)
+            VALUES (new.id, {BOOKING_SEARCH_TEXT.format(b="new")});
+        END""",
+    "booking_search_delete": """
+        AFTER DELETE ON bookings BEGIN
+            DELETE FROM booking_search WHERE rowid = old.id;
+        END""",
+}
+for table_name, column_name, foreign_key in [("events", "event_name", "event_id"), ("venues", "venue_name", "venue_id"), ("ticket_types", "ticket_type_name", "ticket_type_id")]:
+    BOOKING_SEARCH_TRIGGERS[f"booking_search_{table_name}_rename"] = f"""
+        AFTER UPDATE OF name ON {table_name} BEGIN
+            UPDATE booking_search SET {column_name} = new.name
+            WHERE rowid IN (SELECT id FROM bookings WHERE {foreign_key} = new.id);
+        END"""
+    BOOKING_SEARCH_TRIGGERS[f"booking_search_{table_name}_delete"] = f"""
+        AFTER DELETE ON {table_name} BEGIN
+            UPDATE booking_search SET {column_name} = NULL
+            WHERE rowid IN (SELECT id FROM bookings WHERE {foreign_key} = old.id);
+        END"""
+
+def _migration_confirmation_code_key(conn):
+    # The key itself is written on startup by load_confirmation_code_key
+    columns = {column["name"] for column in sa_inspect(conn).get_columns("confirmation_code_sequence")}
+    if "code_key" not in columns:
+        conn.exec_driver_sql("ALTER TABLE confirmation_code_sequence ADD COLUMN code_key VARCHAR")
+
+def _migration_booking_search(conn):
+    # Rebuilt from scratch: the index holds nothing that can't be derived from bookings
+    conn.exec_driver_sql("DROP TABLE IF EXISTS booking_search")
+    conn.exec_driver_sql(
+        "CREATE VIRTUAL TABLE booking_search USING fts5("
+        "event_name, venue_name, ticket_type_name, confirmation_code, "
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    )
+    # Rank with bm25, a confirmation code match weighing the most
+    conn.exec_driver_sql("INSERT INTO booking_search (booking_search, rank) VALUES ('rank', 'bm25(2.0, 1.0, 1.0, 10.0)')")
+    conn.exec_driver_sql(
+        "INSERT INTO booking_search (rowid, event_name, venue_name, ticket_type_name, confirmation_code) "
+        f"SELECT b.id, {BOOKING_SEARCH_TEXT.format(b='b')} FROM bookings AS b"
+    )
+    conn.exec_driver_sql("INSERT INTO booking_search (booking_search) VALUES ('optimize')")
+    for name, body in BOOKING_SEARCH_TRIGGERS.items():
+        conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {name}")
+        conn.exec_driver_sql(f"CREATE TRIGGER {name} {body}")
+
+MIGRATIONS = [
+    _migration_initial_schema,
+    _migration_hot_filter_indexes,
+    _migration_confirmation_code_sequence,
+    _migration_analytics_rollups,
+    _migration_seat_holds,
+    _migration_booking_search,
+    _migration_confirmation_code_key,
+]
+
+def run_migrations(bind=engine):
+    if bind.dialect.name != "sqlite":
+        Base.metadata.create_all(bind=bind)
+        return
+    with bind.begin() as conn:
+        version = conn.exec_driver_sql("PRAGMA user_version").scalar()
+        for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+            migration(conn)
+            conn.exec_driver_sql(f"PRAGMA user_version = {number}")
+
 # DB INIT
 @app.on_event("startup")
 def on_startup():
-    Base.metadata.create_all(bind=engine)
+    run_migrations()
+    load_confirmation_code_key()
+    preload_templates()
+    db = SessionLocal()
+    try:
+        reconcile_inventory(db, missing_only=True)
+    finally:
+        db.close()
+    start_hold_sweeper()
+
+# PAGINATION
+# Keyset pagination: a page continues after the (sort value, id) of the previous
+# page's last row, carried in an opaque base64 cursor, so deep pages don't scan
+# and skip rows the way OFFSET does.
+def encode_cursor(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values, default=str).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str):
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+
+def read_cursor(cursor: str, parse=None):
+    """Return the (sort value, id) in ``cursor``; ``parse`` converts a non-NULL sort value, e.g. ``datetime.fromisoformat``."""
+    try:
+        value, last_id = decode_cursor(cursor)
+        if not isinstance(last_id, int):
+            raise TypeError(last_id)
+        # Anything else (a list or object) would only fail once bound to the query
+        if value is not None and not isinstance(value, (str, int, float)):
+            raise TypeError(value)
+        if parse is not None and value is not None:
+            value = parse(value)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+    return value, last_id
+
+def keyset_filter(query, column, id_column, value, last_id, descending: bool = False):
+    # SQLite sorts NULLs first, so a NULL sort value sits before everything else
+    if value is None:
+        if descending:
+            return query.filter(column.is_(None), id_column < last_id)
+        return query.filter(or_(column.isnot(None), id_column > last_id))
+    if descending:
+        return query.filter(or_(column < value, and_(column == value, id_column < last_id), column.is_(None)))
+    return query.filter(or_(column > value, and_(column == value, id_column > last_id)))
+
+def keyset_page(query, column, id_column, cursor: Optional[str], limit: int):
+    """One ascending page of ORM rows ordered by (datetime column, id); returns (rows, next_cursor)."""
+    if cursor:
+        value, last_id = read_cursor(cursor, datetime.fromisoformat)
+        query = keyset_filter(query, column, id_column, value, last_id)
+    rows = query.order_by(column.asc(), id_column.asc()).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([getattr(rows[-1], column.key), rows[-1].id])
+    return rows, next_cursor
+
+# COUNTED LISTINGS
+# Venues and ticket types are listed with the number of events / bookings they
+# have. A page is one statement: the LEFT JOIN ... GROUP BY is wrapped in a
+# subquery, so the count can be sorted on and paged through with the same keyset
+# cursors as the bookings table.
+LISTING_PAGE_MAX_LIMIT = 1000
+VENUE_SORTS = ("id", "name", "address", "capacity", "event_count")
+TICKET_TYPE_SORTS = ("id", "name", "price", "event_id", "booking_count")
+
+def venue_counts(db: Session):
+    return db.query(
+        Venue.id, Venue.name, Venue.address, Venue.capacity, func.count(Event.id).label("event_count")
+    ).outerjoin(Event, Event.venue_id == Venue.id).group_by(Venue.id).subquery()
+
+def ticket_type_counts(db: Session):
+    return db.query(
+        TicketType.id, TicketType.name, TicketType.price, TicketType.event_id, func.count(Booking.id).label("booking_count")
+    ).outerjoin(Booking, Booking.ticket_type_id == TicketType.id).group_by(TicketType.id).subquery()
+
+def counted_page(db: Session, counts, sorts, sort: str, order: str, cursor: Optional[str], limit: int):
+    """One page of ``counts`` rows ordered by ``sort`` then id; returns (rows, next_cursor)."""
+    if sort not in sorts:
+        raise HTTPException(status_code=400, detail=f"Cannot sort by {sort}.")
+    column, id_column = counts.c[sort], counts.c.id
+    descending = order == "desc"
+    query = db.query(counts)
+    if cursor:
+        value, last_id = read_cursor(cursor)
+        query = keyset_filter(query, column, id_column, value, last_id, descending)
+    if descending:
+        query = query.order_by(column.desc(), id_column.desc())
+    else:
+        query = query.order_by(column.asc(), id_column.asc())
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([getattr(rows[-1], sort), rows[-1].id])
+    return rows, next_cursor
+
+def counted_page_links(request: Request, sorts, sort: str, order: str, next_cursor: Optional[str]):
+    links = page_links(request, sort, order, sorts)
+    if next_cursor:
+        links["pager"]["next_url"] = _relative_url(request.url.include_query_params(cursor=next_cursor))
+    return links
 
 # VENUE ENDPOINTS
 @app.get("/venues", response_class=HTMLResponse)
-def venues_page(request: Request, db: Session = Depends(get_db)):
-    venues = db.query(Venue).all()
-    venues_out = []
-    for v in venues:
-        event_count = db.query(Event).filter(Event.venue_id == v.id).count()
-        venues_out.append({
-            "id": v.id,
-            "name": v.name,
-            "address": v.address,
-            "capacity": v.capacity,
-            "event_count": event_count
-        })
-    return templates.TemplateResponse("venues.html", {"request": request, "venues": venues_out})
+def venues_page(
+    request: Request,
+    sort: str = "id",
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=LISTING_PAGE_MAX_LIMIT),
+    db: Session = Depends(get_db),
+):
+    venues, next_cursor = counted_page(db, venue_counts(db), VENUE_SORTS, sort, order, cursor, limit)
+    return templates.TemplateResponse("venues.html", {
+        "request": request,
+        "venues": venues,
+        **counted_page_links(request, VENUE_SORTS, sort, order, next_cursor)
+    })
+
+@app.get("/venues/summary", response_model=VenueSummaryPage)
+def get_venue_summary(
+    sort: str = "id",
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=LISTING_PAGE_MAX_LIMIT),
+    db: Session = Depends(get_db),
+):
+    venues, next_cursor = counted_page(db, venue_counts(db), VENUE_SORTS, sort, order, cursor, limit)
+    return {"items": venues, "next_cursor": next_cursor}
 
 @app.post("/venues", response_class=HTMLResponse)
 def add_venue(request: Request, name: str = Form(...), address: str = Form(...), capacity: int = Form(...), db: Session = Depends(get_db)):
@@ -169,10 +1096,11 @@ def add_venue(request: Request, name: str = Form(...), address: str = Form(...),
     db.commit()
     return RedirectResponse(url="/venues", status_code=303)
 
-@app.get("/venues/{venue_id}/events", response_model=List[EventOut])
-def get_events_at_venue(venue_id: int, db: Session = Depends(get_db)):
-    events = db.query(Event).filter(Event.venue_id == venue_id).all()
-    return events
+@app.get("/venues/{venue_id}/events", response_model=EventPage)
+def get_events_at_venue(venue_id: int, cursor: Optional[str] = None, limit: int = Query(100, ge=1, le=1000), db: Session = Depends(get_db)):
+    query = db.query(Event).filter(Event.venue_id == venue_id)
+    events, next_cursor = keyset_page(query, Event.date, Event.id, cursor, limit)
+    return {"items": events, "next_cursor": next_cursor}
 
 # EVENT ENDPOINTS
 @app.get("/events", response_class=HTMLResponse)
@@ -187,62 +1115,166 @@ def add_event(request: Request, name: str = Form(...), description: str = Form(N
     except Exception:
         event_date = datetime.now()
     db_event = Event(name=name, description=description, date=event_date, venue_id=venue_id)
+    venue = db.query(Venue).filter(Venue.id == venue_id).first()
+    db_event.inventory = EventInventory(capacity=venue.capacity if venue else 0, booked=0)
     db.add(db_event)
+    db.flush()
+    count_venue_day_event(db, db_event)
+    db.info.setdefault("changed_dates", set()).add(event_date.strftime("%Y-%m-%d"))
     db.commit()
     return RedirectResponse(url="/events", status_code=303)
 
-@app.get("/events/{event_id}/bookings", response_model=List[BookingOut])
-def get_bookings_for_event(event_id: int, db: Session = Depends(get_db)):
-    bookings = db.query(Booking).filter(Booking.event_id == event_id).all()
-    return bookings
+@app.get("/events/{event_id}/bookings", response_model=BookingPage)
+def get_bookings_for_event(event_id: int, cursor: Optional[str] = None, limit: int = Query(100, ge=1, le=1000), db: Session = Depends(get_db)):
+    query = db.query(Booking).filter(Booking.event_id == event_id)
+    bookings, next_cursor = keyset_page(query, Booking.created_at, Booking.id, cursor, limit)
+    return {"items": bookings, "next_cursor": next_cursor}
 
 # TICKET TYPE ENDPOINTS
 @app.get("/ticket-types", response_class=HTMLResponse)
-def ticket_types_page(request: Request, db: Session = Depends(get_db)):
-    ticket_types = db.query(TicketType).all()
-    ticket_types_out = []
-    for t in ticket_types:
-        booking_count = db.query(Booking).filter(Booking.ticket_type_id == t.id).count()
-        ticket_types_out.append({
-            "id": t.id,
-            "name": t.name,
-            "price": t.price,
-            "event_id": t.event_id,
-            "booking_count": booking_count
-        })
-    return templates.TemplateResponse("ticket_types.html", {"request": request, "ticket_types": ticket_types_out})
+def ticket_types_page(
+    request: Request,
+    sort: str = "id",
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=LISTING_PAGE_MAX_LIMIT),
+    db: Session = Depends(get_db),
+):
+    ticket_types, next_cursor = counted_page(db, ticket_type_counts(db), TICKET_TYPE_SORTS, sort, order, cursor, limit)
+    return templates.TemplateResponse("ticket_types.html", {
+        "request": request,
+        "ticket_types": ticket_types,
+        **counted_page_links(request, TICKET_TYPE_SORTS, sort, order, next_cursor)
+    })
+
+@app.get("/ticket-types/summary", response_model=TicketTypeSummaryPage)
+def get_ticket_type_summary(
+    sort: str = "id",
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=LISTING_PAGE_MAX_LIMIT),
+    db: Session = Depends(get_db),
+):
+    ticket_types, next_cursor = counted_page(db, ticket_type_counts(db), TICKET_TYPE_SORTS, sort, order, cursor, limit)
+    return {"items": ticket_types, "next_cursor": next_cursor}
 
 @app.post("/ticket-types", response_class=HTMLResponse)
 def add_ticket_type(request: Request, name: str = Form(...), price: float = Form(...), event_id: int = Form(...), db: Session = Depends(get_db)):
     db_type = TicketType(name=name, price=price, event_id=event_id)
+    db_type.inventory = TicketTypeInventory(event_id=event_id, booked=0)
     db.add(db_type)
     db.commit()
     return RedirectResponse(url="/ticket-types", status_code=303)
 
-@app.get("/ticket-types/{type_id}/bookings", response_model=List[BookingOut])
-def get_bookings_for_ticket_type(type_id: int, db: Session = Depends(get_db)):
-    bookings = db.query(Booking).filter(Booking.ticket_type_id == type_id).all()
-    return bookings
+@app.get("/ticket-types/{type_id}/bookings", response_model=BookingPage)
+def get_bookings_for_ticket_type(type_id: int, cursor: Optional[str] = None, limit: int = Query(100, ge=1, le=1000), db: Session = Depends(get_db)):
+    query = db.query(Booking).filter(Booking.ticket_type_id == type_id)
+    bookings, next_cursor = keyset_page(query, Booking.created_at, Booking.id, cursor, limit)
+    return {"items": bookings, "next_cursor": next_cursor}
 
 # BOOKING ENDPOINTS
 
-def generate_confirmation_code(length=8):
-    return ''.join(random.choices(string.ascii_uppercase + string.digits, k=length))
+# CONFIRMATION CODES
+# A code is a sequence number from confirmation_code_sequence run through a keyed
+# Feistel permutation (so consecutive bookings get unrelated codes), written as 8
+# base-36 characters plus a Luhn mod 36 check character. The permutation is a
+# bijection, so distinct sequence numbers can never collide, and the 9-character
+# length keeps new codes apart from the older 8-character random ones.
+# The key is stored in the database: codes issued under one key can collide with
+# codes issued under another, so it must never change once codes exist.
+CODE_ALPHABET = string.digits + string.ascii_uppercase
+CODE_BODY_LENGTH = 8
+CODE_HALF_BITS = 20  # 2**40 sequence numbers, all of which fit in 8 base-36 digits
+CODE_ROUNDS = 4
+CONFIRMATION_CODE_KEY: Optional[bytes] = None  # set by load_confirmation_code_key
+
+def load_confirmation_code_key(bind=engine):
+    """Read the confirmation code key, creating it on first start.
+
+    A new database takes ``TICKET_BOOKING_CODE_KEY`` if it is set, otherwise a
+    random key. Startup fails if the variable is set to anything other than the
+    stored key, since switching keys would reissue existing codes.
+    """
+    global CONFIRMATION_CODE_KEY
+    sequence = ConfirmationCodeSequence.__table__
+    configured = os.getenv("TICKET_BOOKING_CODE_KEY")
+    with bind.begin() as conn:
+        if conn.execute(sequence.select().where(sequence.c.id == 1)).first() is None:
+            conn.execute(sequence.insert().values(id=1, next_value=0))
+        stored = conn.execute(select(sequence.c.code_key).where(sequence.c.id == 1)).scalar()
+        if stored is None:
+            stored = configured or secrets.token_hex(32)
+            conn.execute(sequence.update().where(sequence.c.id == 1).values(code_key=stored))
+    if configured is not None and configured != stored:
+        raise RuntimeError(
+            "TICKET_BOOKING_CODE_KEY does not match the key this database has issued confirmation codes with; "
+            "unset it or restore the original key."
+        )
+    CONFIRMATION_CODE_KEY = stored.encode()
+
+def _feistel_round(round_number: int, value: int) -> int:
+    digest = hmac.new(CONFIRMATION_CODE_KEY, f"{round_number}:{value}".encode(), hashlib.sha256).digest()
+    return int.from_bytes(digest[:4], "big") & ((1 << CODE_HALF_BITS) - 1)
+
+def _permute(sequence: int) -> int:
+    left, right = sequence >> CODE_HALF_BITS, sequence & ((1 << CODE_HALF_BITS) - 1)
+    for round_number in range(CODE_ROUNDS):
+        left, right = right, left ^ _feistel_round(round_number, right)
+    return (left << CODE_HALF_BITS) | right
+
+def _check_character(body: str) -> str:
+    # Luhn mod N: catches every single-character typo and most adjacent swaps
+    total, factor = 0, 2
+    for char in reversed(body):
+        addend = factor * CODE_ALPHABET.index(char)
+        total += addend // len(CODE_ALPHABET) + addend % len(CODE_ALPHABET)
+        factor = 1 if factor == 2 else 2
+    return CODE_ALPHABET[-total % len(CODE_ALPHABET)]
+
+def encode_confirmation_code(sequence: int) -> str:
+    if not 0 <= sequence < 1 << (2 * CODE_HALF_BITS):
+        raise ValueError("Confirmation code sequence exhausted.")
+    value, body = _permute(sequence), ""
+    for _ in range(CODE_BODY_LENGTH):
+        value, digit = divmod(value, len(CODE_ALPHABET))
+        body = CODE_ALPHABET[digit] + body
+    return body + _check_character(body)
+
+def is_valid_confirmation_code(code: str) -> bool:
+    if len(code) != CODE_BODY_LENGTH + 1 or any(char not in CODE_ALPHABET for char in code):
+        return False
+    return _check_character(code[:-1]) == code[-1]
+
+def generate_confirmation_codes(db: Session, count: int) -> List[str]:
+    """Allocate ``count`` sequence numbers in one UPDATE and encode them.
+
+    Runs inside the caller's transaction, so a rolled-back booking also gives
+    its sequence numbers back.
+    """
+    sequence = ConfirmationCodeSequence.__table__
+    db.execute(sequence.update().where(sequence.c.id == 1).values(next_value=sequence.c.next_value + count))
+    end = db.execute(sequence.select().with_only_columns(sequence.c.next_value).where(sequence.c.id == 1)).scalar()
+    return [encode_confirmation_code(n) for n in range(end - count, end)]
+
+def generate_confirmation_code(db: Session) -> str:
+    return generate_confirmation_codes(db, 1)[0]
 
 # Move this endpoint up
 @app.post("/bookings", response_class=HTMLResponse)
 def add_booking(request: Request, event_id: int = Form(...), venue_id: int = Form(...), ticket_type_id: int = Form(...), quantity: int = Form(...), db: Session = Depends(get_db)):
-    from datetime import datetime
-    from random import choices
-    import string
-    confirmation_code = ''.join(choices(string.ascii_uppercase + string.digits, k=8))
-    db_booking = Booking(event_id=event_id, venue_id=venue_id, ticket_type_id=ticket_type_id, quantity=quantity, status=BookingStatus.confirmed, confirmation_code=confirmation_code, created_at=datetime.now())
-    db.add(db_booking)
-    db.commit()
+    check_quantity(quantity)
+    def place(db):
+        db_booking = Booking(event_id=event_id, venue_id=venue_id, ticket_type_id=ticket_type_id, quantity=quantity, status=BookingStatus.confirmed, created_at=datetime.now())
+        if not claim_inventory(db, db_booking):
+            raise HTTPException(status_code=400, detail="Venue capacity exceeded.")
+        db_booking.confirmation_code = generate_confirmation_code(db)
+        db.add(db_booking)
+    run_booking_write(db, place)
     return RedirectResponse(url="/bookings", status_code=303)
 
 @app.post("/bookings", response_model=BookingOut)
 def create_booking(booking: BookingCreate, db: Session = Depends(get_db)):
+    check_quantity(booking.quantity)
     # Validate event, venue, ticket type
     event = db.query(Event).filter(Event.id == booking.event_id).first()
     if event is None:
@@ -256,52 +1288,374 @@ def create_booking(booking: BookingCreate, db: Session = Depends(get_db)):
     # Check venue matches event
     if event.venue_id != venue.id:
         raise HTTPException(status_code=400, detail="Venue does not match event.")
-    # Check capacity
-    total_booked = db.query(func.sum(Booking.quantity)).filter(Booking.event_id == event.id, Booking.status == BookingStatus.confirmed).scalar() or 0
-    if total_booked + booking.quantity > venue.capacity:
-        raise HTTPException(status_code=400, detail="Venue capacity exceeded.")
-    # Check ticket availability (per ticket type)
-    type_booked = db.query(func.sum(Booking.quantity)).filter(Booking.ticket_type_id == ticket_type.id, Booking.status == BookingStatus.confirmed).scalar() or 0
-    # For now, assume unlimited per type unless you want to set a limit
-    # Generate confirmation code
-    confirmation_code = generate_confirmation_code()
-    db_booking = Booking(**booking.dict(), status=BookingStatus.confirmed, confirmation_code=confirmation_code)
-    db.add(db_booking)
-    db.commit()
-    db.refresh(db_booking)
+    # Reserve seats and insert in one transaction; the capacity check is part of the
+    # conditional counter update, so concurrent requests cannot oversell the venue.
+    # Ticket types have no limit of their own; their counters are tracked for reporting
+    def place(db):
+        db_booking = Booking(**booking.model_dump(), status=BookingStatus.confirmed)
+        if not claim_inventory(db, db_booking):
+            raise HTTPException(status_code=400, detail="Venue capacity exceeded.")
+        db_booking.confirmation_code = generate_confirmation_code(db)
+        db.add(db_booking)
+        return db_booking
+    return run_booking_write(db, place)
+
+@app.get("/bookings/by-code/{code}", response_model=BookingOut)
+def get_booking_by_code(code: str, db: Session = Depends(get_db)):
+    code = code.strip().upper()
+    # Current codes carry a check character, so typos are rejected without a query;
+    # older 8-character codes are looked up as-is
+    if len(code) == CODE_BODY_LENGTH + 1 and not is_valid_confirmation_code(code):
+        raise HTTPException(status_code=404, detail="Booking not found.")
+    db_booking = db.query(Booking).filter(Booking.confirmation_code == code).first()
+    if db_booking is None:
+        raise HTTPException(status_code=404, detail="Booking not found.")
     return db_booking
 
-@app.get("/bookings", response_class=HTMLResponse)
-def bookings_page(request: Request, db: Session = Depends(get_db)):
-    bookings = db.query(Booking).all()
-    events = db.query(Event).all()
-    venues = db.query(Venue).all()
-    ticket_types = db.query(TicketType).all()
-    bookings_out = []
-    for b in bookings:
-        event = next((e for e in events if e.id == b.event_id), None)
-        venue = next((v for v in venues if v.id == b.venue_id), None)
-        ticket_type = next((t for t in ticket_types if t.id == b.ticket_type_id), None)
-        bookings_out.append({
-            "id": b.id,
-            "event_name": event.name if event else b.event_id,
-            "venue_name": venue.name if venue else b.venue_id,
-            "ticket_type_name": ticket_type.name if ticket_type else b.ticket_type_id,
-            "quantity": b.quantity,
-            "status": b.status,
-            "confirmation_code": b.confirmation_code,
-            "created_at": b.created_at.strftime("%Y-%m-%d %H:%M")
-        })
-    return templates.TemplateResponse("bookings.html", {
+BULK_BOOKING_LIMIT = 5000
+
+@app.post("/bookings/bulk", response_model=BulkBookingResult)
+def create_bookings_bulk(payload: BulkBookingCreate, db: Session = Depends(get_db)):
+    """Validate and insert many bookings in one transaction.
+
+    References are checked with one IN-query per table and capacity is claimed
+    once per event for the combined quantity. In ``all_or_nothing`` mode any
+    failing line rejects the whole batch (400, with every error listed); in
+    ``partial`` mode the failing lines are reported and the rest are booked.
+    """
+    lines = payload.bookings
+    if len(lines) > BULK_BOOKING_LIMIT:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_BOOKING_LIMIT} bookings per request.")
+    partial = payload.mode == BulkBookingMode.partial
+    events = {e.id: e for e in db.query(Event.id, Event.venue_id).filter(Event.id.in_({l.event_id for l in lines}))}
+    venues = {v_id for v_id, in db.query(Venue.id).filter(Venue.id.in_({l.venue_id for l in lines}))}
+    ticket_types = dict(db.query(TicketType.id, TicketType.event_id).filter(TicketType.id.in_({l.ticket_type_id for l in lines})))
+
+    # Same checks as create_booking, per line, without touching the database
+    errors = {}
+    for index, line in enumerate(lines):
+        event = events.get(line.event_id)
+        if line.quantity < 1:
+            errors[index] = "Quantity must be at least 1."
+        elif event is None:
+            errors[index] = "Event not found."
+        elif line.venue_id not in venues:
+            errors[index] = "Venue not found."
+        elif ticket_types.get(line.ticket_type_id) != line.event_id:
+            errors[index] = "Ticket type not found for this event."
+        elif event.venue_id != line.venue_id:
+            errors[index] = "Venue does not match event."
+    if errors and not partial:
+        raise HTTPException(status_code=400, detail=[{"index": i, "detail": d} for i, d in sorted(errors.items())])
+
+    def place(db):
+        failed = dict(errors)
+        by_event = defaultdict(list)
+        for index, line in enumerate(lines):
+            if index not in failed:
+                by_event[line.event_id].append(index)
+        for event_id, indexes in by_event.items():
+            if claim_event_seats(db, event_id, sum(lines[i].quantity for i in indexes)):
+                continue
+            if not partial:
+                raise HTTPException(status_code=400, detail=[{"index": i, "detail": "Venue capacity exceeded."} for i in indexes])
+            # Not everything fits: the claim above already holds SQLite's write lock, so
+            # the remaining seats can't move under us; book lines in order while they fit
+            remaining = db.query(EventInventory.capacity - EventInventory.booked - EventInventory.held).filter(EventInventory.event_id == event_id).scalar() or 0
+            fitting = []
+            for i in indexes:
+                if lines[i].quantity <= remaining:
+                    fitting.append(i)
+                    remaining -= lines[i].quantity
+                else:
+                    failed[i] = "Venue capacity exceeded."
+            if fitting and not claim_event_seats(db, event_id, sum(lines[i].quantity for i in fitting)):
+                failed.update((i, "Venue capacity exceeded.") for i in fitting)
+        accepted = [i for i in range(len(lines)) if i not in failed]
+        type_totals = defaultdict(int)
+        for i in accepted:
+            type_totals[lines[i].ticket_type_id] += lines[i].quantity
+        for ticket_type_id, quantity in type_totals.items():
+            count_ticket_type_seats(db, ticket_type_id, quantity)
+        created_at = datetime.now()
+        codes = generate_confirmation_codes(db, len(accepted)) if accepted else []
+        created = [
+            dict(lines[i].model_dump(), status=BookingStatus.confirmed, confirmation_code=code, created_at=created_at)
+            for i, code in zip(accepted, codes)
+        ]
+        if created:
+            # One executemany instead of an ORM flush, which inserts row by row on
+            # SQLite; ids are then read back through the confirmation code index
+            db.execute(Booking.__table__.insert(), created)
+            codes = [row["confirmation_code"] for row in created]
+            ids = {}
+            for start in range(0, len(codes), 500):
+                ids.update(db.query(Booking.confirmation_code, Booking.id).filter(Booking.confirmation_code.in_(codes[start:start + 500])))
+            for row in created:
+                row["id"] = ids[row["confirmation_code"]]
+        return created, failed
+
+    created, failed = run_booking_write(db, place)
+    return {
+        "created": created,
+        "errors": [{"index": i, "detail": d} for i, d in sorted(failed.items())]
+    }
+
+# SEAT HOLDS
+# Two-phase checkout: a hold reserves seats (event_inventory.held) for a few
+# minutes, and confirming it turns the held seats into a confirmed booking. Lapsed
+# holds are deleted oldest first through ix_seat_holds_expires_at, by a background
+# sweeper and, for a single event, whenever that event looks sold out.
+HOLD_DEFAULT_MINUTES = 10
+HOLD_MAX_MINUTES = 60
+HOLD_SWEEP_SECONDS = float(os.getenv("TICKET_BOOKING_HOLD_SWEEP_SECONDS", "30"))
+HOLD_SWEEP_BATCH = 1000
+
+def _release_held_seats(db: Session, released):
+    totals = defaultdict(int)
+    for event_id, quantity in released:
+        totals[event_id] += quantity
+    for event_id, quantity in totals.items():
+        db.query(EventInventory).filter(EventInventory.event_id == event_id).update(
+            {EventInventory.held: EventInventory.held - quantity}, synchronize_session=False
+        )
+        mark_event_changed(db, event_id)
+
+def expire_holds(db: Session, now: Optional[datetime] = None, event_id: Optional[int] = None, limit: int = HOLD_SWEEP_BATCH) -> int:
+    """Delete up to ``limit`` lapsed holds, oldest first, and give their seats back; returns how many."""
+    lapsed = select(SeatHold.id).where(SeatHold.expires_at <= (now or datetime.utcnow()))
+    if event_id is not None:
+        lapsed = lapsed.where(SeatHold.event_id == event_id)
+    # DELETE ... RETURNING reports exactly the rows this statement removed, so a hold
+    # confirmed concurrently is never released twice
+    released = db.execute(
+        delete(SeatHold).where(SeatHold.id.in_(lapsed.order_by(SeatHold.expires_at).limit(limit))).returning(SeatHold.event_id, SeatHold.quantity),
+        execution_options={"synchronize_session": False},
+    ).all()
+    _release_held_seats(db, released)
+    return len(released)
+
+def sweep_expired_holds():
+    """Release every lapsed hold, one committed batch at a time."""
+    db = SessionLocal()
+    try:
+        total = 0
+        while True:
+            released = commit_with_retry(db, lambda: expire_holds(db))
+            total += released
+            if released < HOLD_SWEEP_BATCH:
+                return total
+    finally:
+        db.close()
+
+_hold_sweeper = []
+
+def start_hold_sweeper():
+    if _hold_sweeper or HOLD_SWEEP_SECONDS <= 0:
+        return
+
+    def run():
+        while True:
+            time.sleep(HOLD_SWEEP_SECONDS)
+            try:
+                sweep_expired_holds()
+            except Exception:
+                # Keep sweeping; a failed round is retried on the next tick
+                pass
+
+    thread = threading.Thread(target=run, name="hold-sweeper", daemon=True)
+    thread.start()
+    _hold_sweeper.append(thread)
+
+@app.post("/events/{event_id}/holds", response_model=HoldOut)
+def create_hold(event_id: int, hold: HoldCreate, db: Session = Depends(get_db)):
+    event = db.query(Event.id, Event.venue_id).filter(Event.id == event_id).first()
+    if event is None:
+        raise HTTPException(status_code=404, detail="Event not found.")
+    if db.query(TicketType.id).filter(TicketType.id == hold.ticket_type_id, TicketType.event_id == event_id).first() is None:
+        raise HTTPException(status_code=404, detail="Ticket type not found for this event.")
+    if hold.quantity < 1:
+        raise HTTPException(status_code=400, detail="Quantity must be at least 1.")
+    minutes = hold.minutes if hold.minutes is not None else HOLD_DEFAULT_MINUTES
+    if not 1 <= minutes <= HOLD_MAX_MINUTES:
+        raise HTTPException(status_code=400, detail=f"Holds last between 1 and {HOLD_MAX_MINUTES} minutes.")
+
+    def place(db):
+        if not _reserve_event_seats(db, event_id, hold.quantity, EventInventory.held):
+            raise HTTPException(status_code=400, detail="Venue capacity exceeded.")
+        mark_event_changed(db, event_id)
+        now = datetime.utcnow()
+        db_hold = SeatHold(
+            event_id=event_id, venue_id=event.venue_id, ticket_type_id=hold.ticket_type_id,
+            quantity=hold.quantity, created_at=now, expires_at=now + timedelta(minutes=minutes),
+        )
+        db.add(db_hold)
+        return db_hold
+    return run_booking_write(db, place)
+
+@app.post("/holds/{hold_id}/confirm", response_model=BookingOut)
+def confirm_hold(hold_id: int, db: Session = Depends(get_db)):
+    def place(db):
+        hold = db.query(SeatHold).filter(SeatHold.id == hold_id).first()
+        if hold is None:
+            raise HTTPException(status_code=404, detail="Hold not found.")
+        # Taking the hold is a conditional DELETE, so it converts (or lapses) only once
+        now = datetime.utcnow()
+        if not db.query(SeatHold).filter(SeatHold.id == hold_id, SeatHold.expires_at > now).delete(synchronize_session=False):
+            raise HTTPException(status_code=410, detail="Hold has expired.")
+        # The seats are already reserved: move them from held to booked, no capacity check
+        db.query(EventInventory).filter(EventInventory.event_id == hold.event_id).update({
+            EventInventory.held: EventInventory.held - hold.quantity,
+            EventInventory.booked: EventInventory.booked + hold.quantity,
+        }, synchronize_session=False)
+        mark_event_changed(db, hold.event_id)
+        count_venue_day_seats(db, hold.event_id, hold.quantity)
+        count_ticket_type_seats(db, hold.ticket_type_id, hold.quantity)
+        db_booking = Booking(
+            event_id=hold.event_id, venue_id=hold.venue_id, ticket_type_id=hold.ticket_type_id, quantity=hold.quantity,
+            status=BookingStatus.confirmed, confirmation_code=generate_confirmation_code(db), created_at=now,
+        )
+        db.add(db_booking)
+        return db_booking
+    return run_booking_write(db, place)
+
+@app.delete("/holds/{hold_id}")
+def release_hold(hold_id: int, db: Session = Depends(get_db)):
+    def apply():
+        released = db.execute(
+            delete(SeatHold).where(SeatHold.id == hold_id).returning(SeatHold.event_id, SeatHold.quantity),
+            execution_options={"synchronize_session": False},
+        ).all()
+        if not released:
+            raise HTTPException(status_code=404, detail="Hold not found.")
+        _release_held_seats(db, released)
+    commit_with_retry(db, apply)
+    return {"detail": "Hold released."}
+
+# BOOKING LISTING
+# Bookings are listed through one joined, column-projected query, sorted on the
+# server and keyset-paginated (see PAGINATION). The HTML pages are streamed, so a
+# large ``limit`` costs neither time-to-first-byte nor memory per row.
+BOOKING_PAGE_MAX_LIMIT = 50000
+BOOKING_STREAM_BATCH = 500
+BOOKING_SORTS = {
+    "id": Booking.id,
+    "created_at": Booking.created_at,
+    "event": func.coalesce(Event.name, ""),
+    "venue": func.coalesce(Venue.name, ""),
+    "ticket_type": func.coalesce(TicketType.name, ""),
+    "quantity": Booking.quantity,
+    "status": Booking.status,
+}
+
+def booking_rows_query(db: Session):
+    return db.query(
+        Booking.id, Booking.event_id, Booking.venue_id, Booking.ticket_type_id,
+        Event.name.label("event_name"), Venue.name.label("venue_name"), TicketType.name.label("ticket_type_name"),
+        Booking.quantity, Booking.status, Booking.confirmation_code, Booking.created_at,
+    ).outerjoin(Event, Booking.event_id == Event.id).outerjoin(
+        Venue, Booking.venue_id == Venue.id
+    ).outerjoin(TicketType, Booking.ticket_type_id == TicketType.id)
+
+def booking_rows_ordered(query, sort: str, order: str, cursor: Optional[str], sorts=BOOKING_SORTS):
+    """Apply sorting and the keyset position from ``cursor`` to ``booking_rows_query``."""
+    if sort not in sorts:
+        raise HTTPException(status_code=400, detail=f"Cannot sort by {sort}.")
+    column, id_column = sorts[sort], sorts["id"]
+    descending = order == "desc"
+    if cursor:
+        value, last_id = read_cursor(cursor, datetime.fromisoformat if sort == "created_at" else None)
+        if column is id_column:
+            query = query.filter(id_column < last_id if descending else id_column > last_id)
+        else:
+            query = keyset_filter(query, column, id_column, value, last_id, descending)
+    ordering = [column] if column is id_column else [column, id_column]
+    return query.order_by(*(c.desc() if descending else c.asc() for c in ordering))
+
+def booking_row_cursor(row, sort: str) -> str:
+    sort_value = {"event": row.event_name or "", "venue": row.venue_name or "", "ticket_type": row.ticket_type_name or ""}.get(sort, getattr(row, sort, None))
+    if isinstance(sort_value, enum.Enum):
+        sort_value = sort_value.value
+    return encode_cursor([sort_value, row.id])
+
+def iter_booking_rows(request: Request, query, sort: str, limit: int, pager: dict):
+    """Yield up to ``limit`` rows for the template as they are fetched.
+
+    ``pager["next_url"]`` is set once the page is exhausted, so the template reads it after the table.
+    """
+    last = None
+    for n, row in enumerate(query.limit(limit + 1).yield_per(BOOKING_STREAM_BATCH)):
+        if n == limit:
+            pager["next_url"] = _relative_url(request.url.include_query_params(cursor=booking_row_cursor(last, sort)))
+            return
+        last = row
+        yield booking_row_out(row)
+
+def booking_row_out(row):
+    return {
+        "id": row.id,
+        "event_name": row.event_name if row.event_name is not None else row.event_id,
+        "venue_name": row.venue_name if row.venue_name is not None else row.venue_id,
+        "ticket_type_name": row.ticket_type_name if row.ticket_type_name is not None else row.ticket_type_id,
+        "quantity": row.quantity,
+        "status": row.status,
+        "confirmation_code": row.confirmation_code,
+        "created_at": row.created_at.strftime("%Y-%m-%d %H:%M") if row.created_at else ""
+    }
+
+def _relative_url(url) -> str:
+    return url.path + ("?" + url.query if url.query else "")
+
+def page_links(request: Request, sort: str, order: str, sorts):
+    base_url = request.url.remove_query_params("cursor")
+    sort_urls = {
+        key: _relative_url(base_url.include_query_params(sort=key, order="desc" if key == sort and order == "asc" else "asc"))
+        for key in sorts
+    }
+    return {"sort": sort, "order": order, "sort_urls": sort_urls, "first_url": _relative_url(base_url), "pager": {"next_url": None}}
+
+def stream_booking_page(request: Request, name: str, query, sort: str, order: str, cursor: Optional[str], limit: int, context: dict, sorts=BOOKING_SORTS):
+    """Stream a bookings table page; rows are read on a session of their own while the page is sent."""
+    rows_db = SessionLocal()
+    links = page_links(request, sort, order, sorts)
+    try:
+        query = booking_rows_ordered(query.with_session(rows_db), sort, order, cursor, sorts)
+        rows = iter_booking_rows(request, query, sort, limit, links["pager"])
+        # Run the page query before the response starts, so a failing query is
+        # answered with an error status rather than a truncated 200 page
+        first = next(rows, None)
+    except Exception:
+        rows_db.close()
+        raise
+    return stream_template(name, {
         "request": request,
-        "bookings": bookings_out,
+        "bookings": rows if first is None else itertools.chain([first], rows),
+        **context,
+        **links
+    }, session=rows_db)
+
+@app.get("/bookings", response_class=HTMLResponse)
+def bookings_page(
+    request: Request,
+    sort: str = "id",
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=BOOKING_PAGE_MAX_LIMIT),
+    db: Session = Depends(get_db),
+):
+    # Only id/name are needed for the form dropdowns
+    events = db.query(Event.id, Event.name).order_by(Event.id).all()
+    venues = db.query(Venue.id, Venue.name).order_by(Venue.id).all()
+    ticket_types = db.query(TicketType.id, TicketType.name).order_by(TicketType.id).all()
+    return stream_booking_page(request, "bookings.html", booking_rows_query(db), sort, order, cursor, limit, {
         "events": events,
         "venues": venues,
-        "ticket_types": ticket_types
+        "ticket_types": ticket_types,
     })
 
 @app.put("/bookings/{booking_id}", response_model=BookingOut)
 def update_booking(booking_id: int, booking: BookingCreate, db: Session = Depends(get_db)):
+    check_quantity(booking.quantity)
     db_booking = db.query(Booking).filter(Booking.id == booking_id).first()
     if db_booking is None:
         raise HTTPException(status_code=404, detail="Booking not found.")
@@ -316,11 +1670,15 @@ def update_booking(booking_id: int, booking: BookingCreate, db: Session = Depend
         raise HTTPException(status_code=400, detail="Invalid event, venue, or ticket type.")
     if event.venue_id != venue.id:
         raise HTTPException(status_code=400, detail="Venue does not match event.")
-    setattr(db_booking, 'event_id', booking.event_id)
-    setattr(db_booking, 'venue_id', booking.venue_id)
-    setattr(db_booking, 'ticket_type_id', booking.ticket_type_id)
-    setattr(db_booking, 'quantity', booking.quantity)
-    db.commit()
+    def apply():
+        release_inventory(db, db_booking)
+        setattr(db_booking, 'event_id', booking.event_id)
+        setattr(db_booking, 'venue_id', booking.venue_id)
+        setattr(db_booking, 'ticket_type_id', booking.ticket_type_id)
+        setattr(db_booking, 'quantity', booking.quantity)
+        if not claim_inventory(db, db_booking):
+            raise HTTPException(status_code=400, detail="Venue capacity exceeded.")
+    commit_with_retry(db, apply)
     db.refresh(db_booking)
     return db_booking
 
@@ -329,8 +1687,10 @@ def delete_booking(booking_id: int, db: Session = Depends(get_db)):
     db_booking = db.query(Booking).filter(Booking.id == booking_id).first()
     if db_booking is None:
         raise HTTPException(status_code=404, detail="Booking not found.")
-    db.delete(db_booking)
-    db.commit()
+    def apply():
+        release_inventory(db, db_booking)
+        db.delete(db_booking)
+    commit_with_retry(db, apply)
     return {"detail": "Booking deleted."}
 
 @app.patch("/bookings/{booking_id}/status", response_model=BookingOut)
@@ -338,8 +1698,12 @@ def update_booking_status(booking_id: int, status: BookingStatus, db: Session =
     db_booking = db.query(Booking).filter(Booking.id == booking_id).first()
     if db_booking is None:
         raise HTTPException(status_code=404, detail="Booking not found.")
-    setattr(db_booking, 'status', status)
-    db.commit()
+    def apply():
+        release_inventory(db, db_booking)
+        setattr(db_booking, 'status', status)
+        if not claim_inventory(db, db_booking):
+            raise HTTPException(status_code=400, detail="Venue capacity exceeded.")
+    commit_with_retry(db, apply)
     db.refresh(db_booking)
     return db_booking
 
@@ -349,8 +1713,10 @@ def delete_booking_html(booking_id: int, db: Session = Depends(get_db)):
     db_booking = db.query(Booking).filter(Booking.id == booking_id).first()
     if db_booking is None:
         raise HTTPException(status_code=404, detail="Booking not found.")
-    db.delete(db_booking)
-    db.commit()
+    def apply():
+        release_inventory(db, db_booking)
+        db.delete(db_booking)
+    commit_with_retry(db, apply)
     return RedirectResponse(url="/bookings", status_code=303)
 
 # HTML-friendly patch status endpoint
@@ -359,8 +1725,12 @@ def update_booking_status_html(booking_id: int, status: BookingStatus = Form(...
     db_booking = db.query(Booking).filter(Booking.id == booking_id).first()
     if db_booking is None:
         raise HTTPException(status_code=404, detail="Booking not found.")
-    setattr(db_booking, 'status', status.value)
-    db.commit()
+    def apply():
+        release_inventory(db, db_booking)
+        setattr(db_booking, 'status', status.value)
+        if not claim_inventory(db, db_booking):
+            raise HTTPException(status_code=400, detail="Venue capacity exceeded.")
+    commit_with_retry(db, apply)
     return RedirectResponse(url="/bookings", status_code=303)
 
 # Render edit form for a booking
@@ -377,14 +1747,19 @@ def edit_booking_page(request: Request, booking_id: int, db: Session = Depends(g
 # Handle edit form submission
 @app.post("/bookings/{booking_id}/edit")
 def edit_booking_submit(request: Request, booking_id: int, event_id: int = Form(...), venue_id: int = Form(...), ticket_type_id: int = Form(...), quantity: int = Form(...), db: Session = Depends(get_db)):
+    check_quantity(quantity)
     booking = db.query(Booking).filter(Booking.id == booking_id).first()
     if booking is None:
         return HTMLResponse("Booking not found", status_code=404)
-    setattr(booking, 'event_id', event_id)
-    setattr(booking, 'venue_id', venue_id)
-    setattr(booking, 'ticket_type_id', ticket_type_id)
-    setattr(booking, 'quantity', quantity)
-    db.commit()
+    def apply():
+        release_inventory(db, booking)
+        setattr(booking, 'event_id', event_id)
+        setattr(booking, 'venue_id', venue_id)
+        setattr(booking, 'ticket_type_id', ticket_type_id)
+        setattr(booking, 'quantity', quantity)
+        if not claim_inventory(db, booking):
+            raise HTTPException(status_code=400, detail="Venue capacity exceeded.")
+    commit_with_retry(db, apply)
     return RedirectResponse(url="/bookings", status_code=303)
 
 # AVAILABLE TICKETS FOR EVENT
@@ -396,79 +1771,106 @@ def get_available_tickets(event_id: int, db: Session = Depends(get_db)):
     venue = db.query(Venue).filter(Venue.id == event.venue_id).first()
     if venue is None:
         raise HTTPException(status_code=404, detail="Venue not found.")
-    total_booked = db.query(func.sum(Booking.quantity)).filter(Booking.event_id == event_id, Booking.status == BookingStatus.confirmed).scalar()
-    total_booked = int(total_booked or 0)
-    available = venue.capacity - total_booked
+    inventory = get_event_inventory(db, event_id)
+    available = venue.capacity - inventory.booked - inventory.held
     return {"event_id": event_id, "available_tickets": available, "venue_capacity": venue.capacity}
 
+# BOOKING SEARCH
+# ``q`` is matched against the booking_search index: every word must match the
+# start of a word in the event, venue or ticket type name or the confirmation
+# code, ignoring case and accents. Results are ranked by relevance (bm25) and
+# paged with a (rank, id) cursor like any other sort.
+booking_search = sa_table("booking_search", sa_column("rowid"), sa_column("rank"))
+# The index returns matches in rowid (= booking id) order, so an id-sorted search
+# stops after one page instead of sorting every match
+SEARCH_SORTS = {**BOOKING_SORTS, "id": booking_search.c.rowid, "relevance": booking_search.c.rank}
+
+def booking_search_terms(q: str) -> Optional[str]:
+    """Turn free text into an FTS5 query of quoted terms, or None if it has no words.
+
+    Only the last word is a prefix (search as you type): a prefix term has to merge
+    the postings of every word it expands to, an exact one can be skipped through.
+    """
+    words = [f'"{word}"' for word in re.findall(r"\w+", q)]
+    if not words:
+        return None
+    return " ".join(words) + "*"
+
+def search_booking_rows(query, q: str, ranked: bool):
+    terms = booking_search_terms(q)
+    if terms is None:
+        return query
+    query = query.join(booking_search, booking_search.c.rowid == Booking.id).filter(
+        literal_column("booking_search").op("MATCH")(terms)
+    )
+    # bm25 needs the frequency of every term, so it is only computed when sorting by it
+    return query.add_columns(booking_search.c.rank.label("relevance")) if ranked else query
+
 @app.get("/bookings/search", response_class=HTMLResponse)
-def bookings_search_page(request: Request, event: str = "", venue: str = "", ticket_type: str = "", db: Session = Depends(get_db)):
-    events = db.query(Event).all()
-    venues = db.query(Venue).all()
-    ticket_types = db.query(TicketType).all()
-    # Filter bookings using the API logic
-    query = db.query(Booking)
+def bookings_search_page(
+    request: Request,
+    q: str = "",
+    event: str = "",
+    venue: str = "",
+    ticket_type: str = "",
+    sort: Optional[str] = None,
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=BOOKING_PAGE_MAX_LIMIT),
+    db: Session = Depends(get_db),
+):
+    # Filter bookings using the API logic; the names are already joined in
+    searching = booking_search_terms(q) is not None
+    sort = sort or ("relevance" if searching else "id")
+    if sort == "relevance" and not searching:
+        raise HTTPException(status_code=400, detail="Sorting by relevance needs a search query.")
+    query = search_booking_rows(booking_rows_query(db), q, ranked=sort == "relevance")
     if event:
-        query = query.join(Event).filter(Event.name == event)
+        query = query.filter(Event.name == event)
     if venue:
-        query = query.join(Venue, Booking.venue_id == Venue.id).filter(Venue.name == venue)
+        query = query.filter(Venue.name == venue)
     if ticket_type:
-        query = query.join(TicketType).filter(TicketType.name == ticket_type)
-    bookings = query.all()
-    bookings_out = []
-    for b in bookings:
-        event_obj = next((e for e in events if e.id == b.event_id), None)
-        venue_obj = next((v for v in venues if v.id == b.venue_id), None)
-        ticket_type_obj = next((t for t in ticket_types if t.id == b.ticket_type_id), None)
-        bookings_out.append({
-            "id": b.id,
-            "event_name": event_obj.name if event_obj else b.event_id,
-            "venue_name": venue_obj.name if venue_obj else b.venue_id,
-            "ticket_type_name": ticket_type_obj.name if ticket_type_obj else b.ticket_type_id,
-            "quantity": b.quantity,
-            "status": b.status,
-            "confirmation_code": b.confirmation_code,
-            "created_at": b.created_at.strftime("%Y-%m-%d %H:%M")
-        })
-    return templates.TemplateResponse("bookings_search.html", {
-        "request": request,
-        "bookings": bookings_out,
-        "events": events,
-        "venues": venues,
-        "ticket_types": ticket_types,
+        query = query.filter(TicketType.name == ticket_type)
+    return stream_booking_page(request, "bookings_search.html", query, sort, order, cursor, limit, {
+        "q": q,
         "selected_event": event,
         "selected_venue": venue,
-        "selected_ticket_type": ticket_type
-    })
+        "selected_ticket_type": ticket_type,
+    }, sorts=SEARCH_SORTS if searching else BOOKING_SORTS)
 
 @app.get("/booking-system/stats")
 def booking_system_stats(db: Session = Depends(get_db)):
-    total_bookings = db.query(Booking).count()
-    total_events = db.query(Event).count()
-    total_venues = db.query(Venue).count()
-    total_available_tickets = 0
-    for event in db.query(Event).all():
-        venue = db.query(Venue).filter(Venue.id == event.venue_id).first()
-        if isinstance(venue, Venue) and hasattr(venue, 'capacity') and isinstance(venue.capacity, int):
-            total_booked = db.query(func.sum(Booking.quantity)).filter(Booking.event_id == event.id, Booking.status == BookingStatus.confirmed).scalar()
-            total_booked = int(total_booked or 0)
-            venue_capacity = venue.capacity
-            total_available_tickets += max(venue_capacity - total_booked, 0)
-        else:
-            continue
+    # Available seats per event come from the inventory counters; events whose venue
+    # no longer exists are skipped, as before
+    remaining = Venue.capacity - func.coalesce(EventInventory.booked + EventInventory.held, 0)
+    available = db.query(func.sum(case((remaining > 0, remaining), else_=0))).select_from(Event).join(Venue, Event.venue_id == Venue.id).outerjoin(EventInventory, EventInventory.event_id == Event.id)
+    totals = db.query(
+        db.query(func.count(Booking.id)).scalar_subquery(),
+        db.query(func.count(Event.id)).scalar_subquery(),
+        db.query(func.count(Venue.id)).scalar_subquery(),
+        available.scalar_subquery(),
+    ).one()
     return {
-        "total_bookings": total_bookings,
-        "total_events": total_events,
-        "total_venues": total_venues,
-        "total_available_tickets": total_available_tickets
+        "total_bookings": totals[0],
+        "total_events": totals[1],
+        "total_venues": totals[2],
+        "total_available_tickets": int(totals[3] or 0)
     }
 
+def event_revenues_api(db: Session):
+    # One grouped query over the per-ticket-type revenue rollup
+    revenue = func.coalesce(func.sum(TicketTypeInventory.revenue), 0.0)
+    rows = db.query(Event.id, Event.name, revenue).outerjoin(
+        TicketTypeInventory, TicketTypeInventory.event_id == Event.id
+    ).group_by(Event.id, Event.name).order_by(Event.id).all()
+    return [{"event_id": event_id, "event_name": name, "revenue": total} for event_id, name, total in rows]
+
 @app.get("/events/{event_id}/revenue")
 def event_revenue(event_id: int, db: Session = Depends(get_db)):
     event = db.query(Event).filter(Event.id == event_id).first()
     if event is None:
         raise HTTPException(status_code=404, detail="Event not found.")
-    revenue = db.query(func.sum(Booking.quantity * TicketType.price)).join(TicketType, Booking.ticket_type_id == TicketType.id).filter(Booking.event_id == event_id, Booking.status == BookingStatus.confirmed).scalar() or 0.0
+    revenue = event_revenue_query(db, event_id).scalar() or 0.0
     return {"event_id": event_id, "revenue": revenue}
 
 @app.get("/venues/{venue_id}/occupancy")
@@ -476,23 +1878,7 @@ def venue_occupancy(venue_id: int, db: Session = Depends(get_db)):
     venue = db.query(Venue).filter(Venue.id == venue_id).first()
     if venue is None:
         raise HTTPException(status_code=404, detail="Venue not found.")
-    events = db.query(Event).filter(Event.venue_id == venue_id).all()
-    occupancy = []
-    for event in events:
-        total_booked = db.query(func.sum(Booking.quantity)).filter(Booking.event_id == event.id, Booking.status == BookingStatus.confirmed).scalar()
-        total_booked = int(total_booked or 0)
-        if hasattr(venue, 'capacity') and isinstance(venue.capacity, int):
-            venue_capacity = venue.capacity
-        else:
-            venue_capacity = 0
-        occupancy_rate = (total_booked / venue_capacity) if venue_capacity > 0 else 0
-        occupancy.append({
-            "event_id": event.id,
-            "event_name": event.name,
-            "booked": total_booked,
-            "capacity": venue_capacity,
-            "occupancy_rate": occupancy_rate
-        })
+    occupancy = venue_occupancy_api(db, venue_id).get(venue_id, {"occupancy": []})["occupancy"]
     return {"venue_id": venue_id, "venue_name": venue.name, "occupancy": occupancy}
 
 @app.get("/", response_class=HTMLResponse)
@@ -500,17 +1886,9 @@ def dashboard_page(request: Request, db: Session = Depends(get_db)):
     # Stats
     stats = booking_system_stats(db)
     # Event revenues
-    events = db.query(Event).all()
-    event_revenues = []
-    for event in events:
-        revenue = db.query(func.sum(Booking.quantity * TicketType.price)).join(TicketType, Booking.ticket_type_id == TicketType.id).filter(Booking.event_id == event.id, Booking.status == BookingStatus.confirmed).scalar() or 0.0
-        event_revenues.append({"event_name": event.name, "revenue": revenue})
+    event_revenues = event_revenues_api(db)
     # Venue occupancy
-    venues = db.query(Venue).all()
-    venue_occupancy = []
-    for venue in venues:
-        occ = venue_occupancy_api(venue.id, db)
-        venue_occupancy.append({"venue_name": venue.name, "occupancy": occ["occupancy"]})
+    venue_occupancy = list(venue_occupancy_api(db).values())
     return templates.TemplateResponse("dashboard.html", {
         "request": request,
         "stats": stats,
@@ -518,45 +1896,546 @@ def dashboard_page(request: Request, db: Session = Depends(get_db)):
         "venue_occupancy": venue_occupancy
     })
 
-# Helper for venue occupancy (API logic reused for dashboard)
-def venue_occupancy_api(venue_id: int, db: Session):
-    venue = db.query(Venue).filter(Venue.id == venue_id).first()
-    if venue is None:
-        return {"occupancy": []}
-    events = db.query(Event).filter(Event.venue_id == venue_id).all()
-    occupancy = []
-    for event in events:
-        total_booked = db.query(func.sum(Booking.quantity)).filter(Booking.event_id == event.id, Booking.status == BookingStatus.confirmed).scalar()
-        total_booked = int(total_booked or 0)
-        venue_capacity = int(venue.capacity) if venue.capacity is not None else 0
-        occupancy_rate = (total_booked / venue_capacity) if venue_capacity > 0 else 0
-        occupancy.append({
-            "event_id": event.id,
-            "event_name": event.name,
-            "booked": total_booked,
+# Helper for venue occupancy (API logic reused for dashboard): one joined query over
+# venues, their events and the inventory counters, grouped by venue in Python
+def venue_occupancy_api(db: Session, venue_id: Optional[int] = None):
+    venues = {}
+    for v_id, venue_name, capacity, event_id, event_name, booked in venue_occupancy_query(db, venue_id):
+        entry = venues.setdefault(v_id, {"venue_id": v_id, "venue_name": venue_name, "occupancy": []})
+        if event_id is None:
+            continue
+        if booked is None:
+            booked = get_event_inventory(db, event_id).booked
+        venue_capacity = int(capacity) if capacity is not None else 0
+        occupancy_rate = (booked / venue_capacity) if venue_capacity > 0 else 0
+        entry["occupancy"].append({
+            "event_id": event_id,
+            "event_name": event_name,
+            "booked": booked,
             "capacity": venue_capacity,
             "occupancy_rate": occupancy_rate
         })
-    return {"occupancy": occupancy}
+    return venues
 
-@app.get("/calendar", response_class=HTMLResponse)
-def calendar_page(request: Request, db: Session = Depends(get_db)):
-    events = db.query(Event).all()
-    venues = {v.id: v for v in db.query(Venue).all()}
-    calendar = defaultdict(list)
-    for event in events:
-        date_str = event.date.strftime("%Y-%m-%d")
-        venue = venues.get(event.venue_id)
-        # Calculate available tickets
-        total_booked = db.query(func.sum(Booking.quantity)).filter(Booking.event_id == event.id, Booking.status == BookingStatus.confirmed).scalar() or 0
-        venue_capacity = venue.capacity if venue else 0
-        available_tickets = venue_capacity - total_booked
-        calendar[date_str].append({
-            "name": event.name,
-            "venue_name": venue.name if venue else event.venue_id,
-            "available_tickets": available_tickets,
-            "venue_capacity": venue_capacity
+# ANALYTICS
+# Served from the rollups maintained on write (ticket_type_inventory.revenue and
+# venue_day_occupancy), so the cost depends on the number of ticket types, events
+# and venue days, never on the number of bookings.
+ANALYTICS_REVENUE_GROUPS = {
+    "ticket_type": (TicketTypeInventory.ticket_type_id, TicketType.name),
+    "event": (TicketTypeInventory.event_id, Event.name),
+    "venue": (Event.venue_id, Venue.name),
+    "day": (func.date(Event.date), None),
+}
+
+@app.get("/analytics/revenue")
+def analytics_revenue(group_by: str = Query("event", pattern="^(ticket_type|event|venue|day)$"), db: Session = Depends(get_db)):
+    key, label = ANALYTICS_REVENUE_GROUPS[group_by]
+    columns = [key] + ([label] if label is not None else [])
+    query = db.query(*columns, func.sum(TicketTypeInventory.booked), func.sum(TicketTypeInventory.revenue)).select_from(TicketTypeInventory)
+    if group_by == "ticket_type":
+        query = query.outerjoin(TicketType, TicketType.id == TicketTypeInventory.ticket_type_id)
+    else:
+        query = query.join(Event, Event.id == TicketTypeInventory.event_id)
+        if group_by == "venue":
+            query = query.outerjoin(Venue, Venue.id == Event.venue_id)
+    results = []
+    for row in query.group_by(*columns).order_by(key):
+        entry = {group_by if group_by == "day" else f"{group_by}_id": row[0]}
+        if label is not None:
+            entry[f"{group_by}_name"] = row[1]
+        entry["quantity"] = int(row[-2] or 0)
+        entry["revenue"] = float(row[-1] or 0.0)
+        results.append(entry)
+    return {"group_by": group_by, "results": results}
+
+@app.get("/analytics/occupancy")
+def analytics_occupancy(group_by: str = Query("venue", pattern="^(venue|day)$"), db: Session = Depends(get_db)):
+    key = VenueDayOccupancy.venue_id if group_by == "venue" else VenueDayOccupancy.day
+    rows = db.query(
+        key, func.sum(VenueDayOccupancy.events), func.sum(VenueDayOccupancy.capacity), func.sum(VenueDayOccupancy.booked)
+    ).group_by(key).order_by(key).all()
+    names = dict(db.query(Venue.id, Venue.name).all()) if group_by == "venue" else {}
+    results = []
+    for value, events, capacity, booked in rows:
+        entry = {"venue_id": value, "venue_name": names.get(value)} if group_by == "venue" else {"day": value}
+        entry.update({
+            "events": int(events or 0),
+            "booked": int(booked or 0),
+            "capacity": int(capacity or 0),
+            "occupancy_rate": (booked / capacity) if capacity else 0,
         })
-    # Sort calendar by date
-    calendar = dict(sorted(calendar.items()))
-    return templates.TemplateResponse("calendar.html", {"request": request, "calendar": calendar}) 
\ No newline at end of file
+        results.append(entry)
+    return {"group_by": group_by, "results": results}
+
+# EXPORTS
+# Bookings and revenue lines for finance, as CSV or Parquet. Rows are read in
+# batches of EXPORT_BATCH (yield_per) on a session of the export's own, written out
+# and dropped, so memory stays flat however many rows match. CSV is sent in
+# STREAM_CHUNK_SIZE pieces, Parquet as one row group per batch. Parquet needs the
+# optional pyarrow package.
+EXPORT_BATCH = 10000
+EXPORT_COLUMNS = {
+    "bookings": [
+        ("booking_id", "int"), ("confirmation_code", "str"), ("status", "str"), ("created_at", "datetime"),
+        ("event_id", "int"), ("event_name", "str"), ("venue_id", "int"), ("venue_name", "str"),
+        ("ticket_type_id", "int"), ("ticket_type_name", "str"), ("quantity", "int"),
+    ],
+    "revenue": [
+        ("booking_id", "int"), ("created_at", "datetime"), ("event_id", "int"), ("event_name", "str"),
+        ("ticket_type_id", "int"), ("ticket_type_name", "str"), ("quantity", "int"), ("unit_price", "float"), ("amount", "float"),
+    ],
+}
+EXPORT_MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "parquet": "application/vnd.apache.parquet"}
+
+def export_query(db: Session, kind: str, date_from: Optional[date], date_to: Optional[date], event_id: Optional[int]):
+    """Rows for an export in booking id order; ``date_from``/``date_to`` bound the booking date, inclusive."""
+    if kind == "bookings":
+        query = db.query(
+            Booking.id, Booking.confirmation_code, Booking.status, Booking.created_at,
+            Booking.event_id, Event.name, Booking.venue_id, Venue.name, Booking.ticket_type_id, TicketType.name, Booking.quantity,
+        ).outerjoin(Event, Booking.event_id == Event.id).outerjoin(
+            Venue, Booking.venue_id == Venue.id
+        ).outerjoin(TicketType, Booking.ticket_type_id == TicketType.id)
+    else:
+        # Confirmed bookings priced like the revenue rollup
+        query = db.query(
+            Booking.id, Booking.created_at, Booking.event_id, Event.name, Booking.ticket_type_id, TicketType.name,
+            Booking.quantity, TicketType.price, Booking.quantity * TicketType.price,
+        ).join(TicketType, Booking.ticket_type_id == TicketType.id).outerjoin(
+            Event, Booking.event_id == Event.id
+        ).filter(Booking.status == BookingStatus.confirmed)
+    if date_from:
+        query = query.filter(Booking.created_at >= datetime(date_from.year, date_from.month, date_from.day))
+    if date_to:
+        query = query.filter(Booking.created_at < datetime(date_to.year, date_to.month, date_to.day) + timedelta(days=1))
+    if event_id is not None:
+        query = query.filter(Booking.event_id == event_id)
+    return query.order_by(Booking.id)
+
+def export_values(row) -> list:
+    return [value.value if isinstance(value, enum.Enum) else value for value in row]
+
+def export_csv(query, columns):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for name, _ in columns])
+    for row in query.yield_per(EXPORT_BATCH):
+        writer.writerow(export_values(row))
+        if buffer.tell() >= STREAM_CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+class _ChunkSink:
+    """Write-only file for ParquetWriter that hands out what was written so far."""
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self) -> bytes:
+        data, self.chunks = b"".join(self.chunks), []
+        return data
+
+def export_parquet(query, columns):
+    import pyarrow
+    import pyarrow.parquet
+
+    types = {"int": pyarrow.int64(), "str": pyarrow.string(), "datetime": pyarrow.timestamp("us"), "float": pyarrow.float64()}
+    schema = pyarrow.schema([(name, types[kind]) for name, kind in columns])
+    sink = _ChunkSink()
+    writer = pyarrow.parquet.ParquetWriter(sink, schema)
+
+    def row_group(batch):
+        arrays = [pyarrow.array(values, type=field.type) for values, field in zip(zip(*batch), schema)]
+        writer.write_table(pyarrow.Table.from_arrays(arrays, schema=schema))
+        return sink.take()
+
+    batch = []
+    for row in query.yield_per(EXPORT_BATCH):
+        batch.append(export_values(row))
+        if len(batch) == EXPORT_BATCH:
+            yield row_group(batch)
+            batch = []
+    if batch:
+        yield row_group(batch)
+    writer.close()
+    yield sink.take()
+
+def stream_export(kind: str, format: str, date_from: Optional[date], date_to: Optional[date], event_id: Optional[int]) -> StreamingResponse:
+    if format == "parquet":
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            raise HTTPException(status_code=501, detail="Parquet exports need pyarrow installed.")
+    export_db = SessionLocal()
+    query = export_query(export_db, kind, date_from, date_to, event_id)
+    write = export_parquet if format == "parquet" else export_csv
+
+    def body():
+        try:
+            yield from write(query, EXPORT_COLUMNS[kind])
+        finally:
+            export_db.close()
+
+    return StreamingResponse(body(), media_type=EXPORT_MEDIA_TYPES[format], headers={
+        "Content-Disposition": f'attachment; filename="{kind}.{format}"',
+    })
+
+@app.get("/exports/bookings")
+def export_bookings(
+    format: str = Query("csv", pattern="^(csv|parquet)$"),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    event_id: Optional[int] = None,
+):
+    return stream_export("bookings", format, date_from, date_to, event_id)
+
+@app.get("/exports/revenue")
+def export_revenue(
+    format: str = Query("csv", pattern="^(csv|parquet)$"),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    event_id: Optional[int] = None,
+):
+    return stream_export("revenue", format, date_from, date_to, event_id)
+
+# CALENDAR CACHE
+# Rendered calendar entries are cached per day in this process. Writes record the
+# events they touched on the session, and once the transaction commits only the
+# affected days are dropped and their version bumped. The ETag of a range is
+# derived from those versions, so a matching If-None-Match is answered with 304
+# without touching the database. The cache is per process: with several workers,
+# each one only sees its own invalidations. It holds at most CALENDAR_CACHE_DAYS
+# days, dropping the least recently requested first; ETags come from the versions
+# alone, so a 304 does not depend on the day still being cached.
+_calendar_lock = threading.Lock()
+_calendar_days = OrderedDict()  # "YYYY-MM-DD" -> list of entries, least recently used first
+_calendar_event_dates = {}   # event id -> "YYYY-MM-DD", for events in cached days
+_calendar_versions = defaultdict(int)
+_calendar_generation = [os.urandom(4).hex(), 0]
+CALENDAR_MAX_DAYS = 366
+CALENDAR_CACHE_DAYS = int(os.getenv("TICKET_BOOKING_CALENDAR_CACHE_DAYS", "1100"))
+
+def mark_event_changed(db: Session, event_id: int):
+    db.info.setdefault("changed_events", set()).add(event_id)
+
+def invalidate_calendar(dates=None):
+    with _calendar_lock:
+        if dates is None:
+            _calendar_days.clear()
+            _calendar_event_dates.clear()
+            _calendar_generation[1] += 1
+            return
+        for day in dates:
+            _calendar_versions[day] += 1
+            for event_id, _ in _calendar_days.pop(day, ()):
+                _calendar_event_dates.pop(event_id, None)
+
+@sa_event.listens_for(Session, "after_commit")
+def _invalidate_calendar_after_commit(session):
+    if session.in_nested_transaction():
+        # A SAVEPOINT release (one job of a write-queue batch) is not visible yet
+        return
+    event_ids = session.info.pop("changed_events", set())
+    dates = session.info.pop("changed_dates", set())
+    if event_ids:
+        with _calendar_lock:
+            dates.update(_calendar_event_dates[e] for e in event_ids if e in _calendar_event_dates)
+    if dates:
+        invalidate_calendar(dates)
+    if event_ids:
+        if in_greenlet():
+            # Async mode commits on the event loop; the counts are read with a
+            # sync session, so fetch them on a worker thread instead
+            asyncio.get_running_loop().run_in_executor(None, _publish_availability, event_ids)
+        else:
+            _publish_availability(event_ids)
+
+def _publish_availability(event_ids):
+    try:
+        availability_hub.publish(event_ids)
+    except Exception:
+        # The write itself is committed; watchers pick up the next change
+        pass
+
+@sa_event.listens_for(Session, "after_rollback")
+def _forget_changes_after_rollback(session):
+    if session.in_nested_transaction():
+        # Only one job's SAVEPOINT was undone; the rest of the batch still commits
+        return
+    session.info.pop("changed_events", None)
+    session.info.pop("changed_dates", None)
+
+def calendar_etag(days) -> str:
+    with _calendar_lock:
+        versions = ",".join(f"{day}:{_calendar_versions[day]}" for day in days if _calendar_versions.get(day))
+        key = f"{_calendar_generation[0]}:{_calendar_generation[1]}|{days[0]}|{days[-1]}|{versions}"
+    return '"cal-' + hashlib.sha1(key.encode()).hexdigest()[:20] + '"'
+
+def load_calendar_days(db: Session, days):
+    """Return {day: entries} for ``days``, querying only the days not cached yet."""
+    with _calendar_lock:
+        cached = {day: _calendar_days[day] for day in days if day in _calendar_days}
+        for day in cached:
+            _calendar_days.move_to_end(day)
+        missing = [day for day in days if day not in cached]
+        versions = {day: _calendar_versions.get(day, 0) for day in missing}
+    if not missing:
+        return cached
+    start = datetime.fromisoformat(missing[0])
+    end = datetime.fromisoformat(missing[-1]) + timedelta(days=1)
+    rows = db.query(Event.id, Event.name, Event.date, Event.venue_id, Venue.name, Venue.capacity, EventInventory.booked + EventInventory.held).outerjoin(
+        Venue, Event.venue_id == Venue.id
+    ).outerjoin(EventInventory, EventInventory.event_id == Event.id).filter(
+        Event.date >= start, Event.date < end
+    ).order_by(Event.date, Event.id).all()
+    loaded = {day: [] for day in missing}
+    for event_id, name, event_date, venue_id, venue_name, capacity, taken in rows:
+        day = event_date.strftime("%Y-%m-%d")
+        if day not in loaded:
+            continue
+        if taken is None:
+            inventory = get_event_inventory(db, event_id)
+            taken = inventory.booked + inventory.held
+        venue_capacity = capacity if capacity is not None else 0
+        loaded[day].append((event_id, {
+            "name": name,
+            "venue_name": venue_name if venue_name is not None else venue_id,
+            "available_tickets": venue_capacity - taken,
+            "venue_capacity": venue_capacity
+        }))
+    with _calendar_lock:
+        for day, entries in loaded.items():
+            # Skip days invalidated while we were reading: our rows may predate that commit
+            if _calendar_versions.get(day, 0) == versions[day]:
+                _calendar_days[day] = entries
+                _calendar_event_dates.update((event_id, day) for event_id, _ in entries)
+        while len(_calendar_days) > CALENDAR_CACHE_DAYS:
+            _, evicted = _calendar_days.popitem(last=False)
+            for event_id, _ in evicted:
+                _calendar_event_dates.pop(event_id, None)
+    cached.update(loaded)
+    return cached
+
+@app.get("/calendar", response_class=HTMLResponse)
+def calendar_page(
+    request: Request,
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    db: Session = Depends(get_db),
+):
+    # Default to the current month
+    if date_from is None:
+        date_from = (date_to or date.today()).replace(day=1)
+    if date_to is None:
+        date_to = (date_from.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+    if date_to < date_from or (date_to - date_from).days >= CALENDAR_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"'to' must be on or after 'from' and at most {CALENDAR_MAX_DAYS} days later.")
+    days = [(date_from + timedelta(days=n)).isoformat() for n in range((date_to - date_from).days + 1)]
+    etag = calendar_etag(days)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+    loaded = load_calendar_days(db, days)
+    calendar = {day: [entry for _, entry in loaded[day]] for day in days if loaded[day]}
+    previous_start = (date_from - timedelta(days=1)).replace(day=1)
+    next_start = date_to + timedelta(days=1)
+    return templates.TemplateResponse("calendar.html", {
+        "request": request,
+        "calendar": calendar,
+        "date_from": date_from,
+        "date_to": date_to,
+        "previous_url": f"/calendar?from={previous_start.isoformat()}&to={(date_from - timedelta(days=1)).isoformat()}",
+        "next_url": f"/calendar?from={next_start.isoformat()}",
+    }, headers=headers)
+
+# AVAILABILITY STREAM
+# Live remaining-ticket counts over server-sent events. When a commit moves the
+# counters of events that have watchers, the committing thread reads their counts
+# once (one query for all of them) and hands the result to each watcher's event
+# loop, so the number of watchers never adds queries. Only commits made by this
+# process are seen.
+AVAILABILITY_HEARTBEAT_SECONDS = 15
+
+def read_availability(event_ids) -> dict:
+    db = SessionLocal()
+    try:
+        rows = db.query(EventInventory.event_id, EventInventory.capacity, EventInventory.booked + EventInventory.held).filter(
+            EventInventory.event_id.in_(list(event_ids))
+        ).all()
+    finally:
+        db.close()
+    return {
+        event_id: {"event_id": event_id, "available_tickets": capacity - taken, "venue_capacity": capacity}
+        for event_id, capacity, taken in rows
+    }
+
+def _fan_out(deliveries):
+    for watcher, payload in deliveries:
+        # Watchers only need the latest count: replace one they have not read yet
+        while not watcher.empty():
+            watcher.get_nowait()
+        watcher.put_nowait(payload)
+
+class AvailabilityHub:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.watchers = defaultdict(dict)  # event id -> {asyncio.Queue: its event loop}
+        self.latest = {}                   # last published counts, while an event has watchers
+
+    def subscribe(self, event_id: int, loop):
+        """Register a watcher; returns its queue and the current counts if already known."""
+        watcher = asyncio.Queue()
+        with self.lock:
+            self.watchers[event_id][watcher] = loop
+            return watcher, self.latest.get(event_id)
+
+    def remember(self, event_id: int, payload):
+        """Keep a freshly read snapshot for later watchers; returns the counts to send.
+
+        A count published since the read is newer, so it wins over ``payload``.
+        """
+        with self.lock:
+            if event_id not in self.watchers:
+                return payload
+            return self.latest.setdefault(event_id, payload)
+
+    def unsubscribe(self, event_id: int, watcher):
+        with self.lock:
+            watchers = self.watchers.get(event_id, {})
+            watchers.pop(watcher, None)
+            if not watchers:
+                self.watchers.pop(event_id, None)
+                self.latest.pop(event_id, None)
+
+    def publish(self, event_ids):
+        with self.lock:
+            watched = [event_id for event_id in event_ids if event_id in self.watchers]
+        if not watched:
+            return
+        counts = read_availability(watched)
+        by_loop = defaultdict(list)
+        with self.lock:
+            for event_id, payload in counts.items():
+                if event_id in self.watchers:
+                    self.latest[event_id] = payload
+                    for watcher, loop in self.watchers[event_id].items():
+                        by_loop[loop].append((watcher, payload))
+        for loop, deliveries in by_loop.items():
+            try:
+                loop.call_soon_threadsafe(_fan_out, deliveries)
+            except RuntimeError:
+                # The watcher's loop has closed; it unsubscribes when its stream ends
+                pass
+
+availability_hub = AvailabilityHub()
+
+@app.get("/events/{event_id}/availability/stream")
+async def availability_stream(event_id: int, request: Request):
+    watcher, snapshot = availability_hub.subscribe(event_id, asyncio.get_running_loop())
+    if snapshot is None:
+        snapshot = (await run_in_threadpool(read_availability, [event_id])).get(event_id)
+        if snapshot is None:
+            availability_hub.unsubscribe(event_id, watcher)
+            raise HTTPException(status_code=404, detail="Event not found.")
+        snapshot = availability_hub.remember(event_id, snapshot)
+
+    async def stream():
+        try:
+            payload = snapshot
+            while True:
+                if payload is not None:
+                    yield f"event: availability\ndata: {json.dumps(payload)}\n\n"
+                try:
+                    payload = await asyncio.wait_for(watcher.get(), AVAILABILITY_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    payload = None
+                    yield ": keep-alive\n\n"
+        finally:
+            availability_hub.unsubscribe(event_id, watcher)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+# ASYNC MODE
+# Opt-in with TICKET_BOOKING_ASYNC=1 (needs aiosqlite). Every route that takes a
+# ``db: Session`` is re-registered as an ``async def`` with an AsyncSession, and its
+# unchanged body runs through ``AsyncSession.run_sync``: queries await the driver
+# instead of holding a threadpool worker for the whole round trip. Scripts, startup
+# and the streamed bookings rows keep using the sync engine.
+ASYNC_DATABASE_URL = os.getenv("TICKET_BOOKING_ASYNC_DATABASE_URL", DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1))
+async_engine = None
+AsyncSessionLocal = None
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def async_endpoint(endpoint):
+    """Wrap a sync endpoint taking ``db: Session`` into a coroutine using ``get_async_db``."""
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    signature = inspect.signature(endpoint)
+    parameters = [
+        param.replace(annotation=AsyncSession, default=Depends(get_async_db)) if name == "db" else param
+        for name, param in signature.parameters.items()
+    ]
+
+    @functools.wraps(endpoint)
+    async def wrapper(**kwargs):
+        db = kwargs.pop("db")
+        return await db.run_sync(lambda session: endpoint(db=session, **kwargs))
+
+    wrapper.__signature__ = signature.replace(parameters=parameters)
+    return wrapper
+
+def enable_async_mode():
+    global async_engine, AsyncSessionLocal
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, **POOL_OPTIONS)
+    if async_engine.dialect.name == "sqlite":
+        sa_event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+    # Responses are serialised after run_sync returns, outside the greenlet, so
+    # committed objects must not be expired (that would need a lazy load)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    routes = app.router.routes
+    for i, route in enumerate(routes):
+        if isinstance(route, APIRoute) and "db" in inspect.signature(route.endpoint).parameters:
+            routes[i] = APIRoute(
+                route.path,
+                async_endpoint(route.endpoint),
+                response_model=route.response_model,
+                status_code=route.status_code,
+                methods=route.methods,
+                name=route.name,
+                response_class=route.response_class,
+                include_in_schema=route.include_in_schema,
+            )
+
+    @app.on_event("shutdown")
+    async def dispose_async_engine():
+        # Pooled aiosqlite connections belong to the event loop that opened them
+        await async_engine.dispose()
+
+if ASYNC_MODE:
+    enable_async_mode()
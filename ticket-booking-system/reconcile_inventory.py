@@ -0,0 +1,33 @@
+"""Rebuild the seat inventory counters and analytics rollups from Booking rows and report drift.
+
+Run from the ticket-booking-system directory:
+
+    python reconcile_inventory.py            # fix drift and print the report
+    python reconcile_inventory.py --dry-run  # only report
+
+Exits with status 1 when drift was found, so it can be used from cron/CI.
+"""
+import argparse
+import json
+import sys
+
+from main import SessionLocal, reconcile_inventory, run_migrations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconcile inventory counters and revenue/occupancy rollups with bookings")
+    parser.add_argument("--dry-run", action="store_true", help="report drift without writing corrections")
+    args = parser.parse_args()
+
+    run_migrations()
+    db = SessionLocal()
+    try:
+        report = reconcile_inventory(db, apply=not args.dry_run)
+    finally:
+        db.close()
+    print(json.dumps(report, indent=2))
+    return 1 if report["drift"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""Analytics rollups: maintained on every write and equal to a rebuild from bookings."""
+import main
+
+
+def setup(client):
+    client.post("/venues", data={"name": "Arena", "address": "1 Main St", "capacity": 100})
+    client.post("/venues", data={"name": "Club", "address": "2 Side St", "capacity": 50})
+    client.post("/events", data={"name": "Finals", "date": "2025-08-15T19:00", "venue_id": 1})
+    client.post("/events", data={"name": "Encore", "date": "2025-08-15T22:00", "venue_id": 1})
+    client.post("/events", data={"name": "Jazz", "date": "2025-08-16T20:00", "venue_id": 2})
+    client.post("/ticket-types", data={"name": "VIP", "price": 100, "event_id": 1})
+    client.post("/ticket-types", data={"name": "Standard", "price": 40, "event_id": 1})
+    client.post("/ticket-types", data={"name": "Standard", "price": 25.5, "event_id": 3})
+
+
+def results(client, path):
+    return client.get(path).json()["results"]
+
+
+def test_rollups_follow_writes(client):
+    setup(client)
+    client.post("/bookings/bulk", json={"bookings": [
+        {"event_id": 1, "venue_id": 1, "ticket_type_id": 1, "quantity": 2},
+        {"event_id": 1, "venue_id": 1, "ticket_type_id": 2, "quantity": 5},
+        {"event_id": 3, "venue_id": 2, "ticket_type_id": 3, "quantity": 4},
+    ]})
+    client.post("/bookings", data={"event_id": 1, "venue_id": 1, "ticket_type_id": 2, "quantity": 1})
+    client.patch("/bookings/1/status", params={"status": "cancelled"})
+
+    assert client.get("/events/1/revenue").json()["revenue"] == 240.0
+    assert results(client, "/analytics/revenue?group_by=event") == [
+        {"event_id": 1, "event_name": "Finals", "quantity": 6, "revenue": 240.0},
+        {"event_id": 3, "event_name": "Jazz", "quantity": 4, "revenue": 102.0},
+    ]
+    assert [(r["venue_name"], r["revenue"]) for r in results(client, "/analytics/revenue?group_by=venue")] == [("Arena", 240.0), ("Club", 102.0)]
+    assert [(r["day"], r["quantity"]) for r in results(client, "/analytics/revenue?group_by=day")] == [("2025-08-15", 6), ("2025-08-16", 4)]
+    assert [r["quantity"] for r in results(client, "/analytics/revenue?group_by=ticket_type")] == [0, 6, 4]
+
+    by_day = results(client, "/analytics/occupancy?group_by=day")
+    assert [(r["day"], r["events"], r["booked"], r["capacity"]) for r in by_day] == [("2025-08-15", 2, 6, 200), ("2025-08-16", 1, 4, 50)]
+    assert results(client, "/analytics/occupancy")[1]["occupancy_rate"] == 4 / 50
+    assert client.get("/analytics/revenue?group_by=month").status_code == 422
+
+    db = main.SessionLocal()
+    try:
+        assert main.reconcile_inventory(db, apply=False)["drift"] == []
+    finally:
+        db.close()
+
+
+def test_reconcile_rebuilds_rollups(client):
+    setup(client)
+    client.post("/bookings", data={"event_id": 1, "venue_id": 1, "ticket_type_id": 1, "quantity": 3})
+    db = main.SessionLocal()
+    try:
+        db.query(main.VenueDayOccupancy).delete()
+        db.query(main.TicketTypeInventory).update({main.TicketTypeInventory.revenue: 0.0})
+        db.commit()
+        tables = {d["table"] for d in main.reconcile_inventory(db)["drift"]}
+        assert tables == {"venue_day_occupancy", "ticket_type_inventory"}
+        assert main.reconcile_inventory(db, apply=False)["drift"] == []
+    finally:
+        db.close()
+    assert client.get("/events/1/revenue").json()["revenue"] == 300.0
+    assert results(client, "/analytics/occupancy")[0]["booked"] == 3
@@ -0,0 +1,97 @@
+"""Async mode: the same endpoints on an AsyncSession, run in a separate process.
+
+The mode is chosen when ``main`` is imported, so the endpoint checks run in a
+child interpreter with TICKET_BOOKING_ASYNC=1. The event-loop checks run here,
+calling the shared code the way async mode does.
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+
+import pytest
+from sqlalchemy.util.concurrency import greenlet_spawn
+
+import main
+
+pytest.importorskip("aiosqlite")
+
+SCRIPT = textwrap.dedent("""
+    import asyncio
+    import httpx
+    import main
+
+    assert main.ASYNC_MODE
+    main.on_startup()
+
+    async def run():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            await client.post("/venues", data={"name": "Arena", "address": "1 Main St", "capacity": 100})
+            await client.post("/events", data={"name": "Finals", "date": "2025-08-15T19:00", "venue_id": 1})
+            await client.post("/ticket-types", data={"name": "Standard", "price": 10, "event_id": 1})
+            line = {"event_id": 1, "venue_id": 1, "ticket_type_id": 1, "quantity": 3}
+            responses = await asyncio.gather(*(client.post("/bookings/bulk", json={"bookings": [line]}) for _ in range(60)))
+            assert {r.status_code for r in responses} <= {200, 400}
+            assert sum(r.status_code == 200 for r in responses) == 33
+            assert (await client.get("/events/1/available-tickets")).json()["available_tickets"] == 1
+            assert (await client.get("/events/1/revenue")).json()["revenue"] == 990.0
+            assert len((await client.get("/events/1/bookings?limit=1000")).json()["items"]) == 33
+            patched = await client.patch("/bookings/1/status", params={"status": "cancelled"})
+            assert patched.json()["status"] == "cancelled"
+            assert "4 / 100" in (await client.get("/calendar?from=2025-08-01")).text
+        await main.async_engine.dispose()
+
+    asyncio.run(run())
+    print("ok")
+""")
+
+
+def test_async_mode_books_without_overselling(tmp_path):
+    env = dict(os.environ, TICKET_BOOKING_ASYNC="1", TICKET_BOOKING_DATABASE_URL=f"sqlite:///{tmp_path / 'async.db'}")
+    result = subprocess.run([sys.executable, "-c", SCRIPT], cwd=os.path.dirname(os.path.abspath(__file__)), env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().endswith("ok")
+
+
+def run_on_event_loop(function, *args):
+    """Call ``function`` the way async mode runs endpoint bodies: in a greenlet on the loop."""
+    async def run():
+        result = await greenlet_spawn(function, *args)
+        # Let work handed to the default executor finish before the loop closes
+        await asyncio.get_running_loop().shutdown_default_executor()
+        return result
+
+    return asyncio.run(run())
+
+
+def test_busy_backoff_does_not_block_the_event_loop(monkeypatch):
+    def blocking_sleep(seconds):
+        raise AssertionError("time.sleep on the event loop")
+
+    monkeypatch.setattr(main.time, "sleep", blocking_sleep)
+
+    run_on_event_loop(main._busy_backoff, 3)
+
+
+def test_commit_publishes_availability_off_the_event_loop(client, monkeypatch):
+    readers = []
+    monkeypatch.setattr(main, "read_availability", lambda event_ids: readers.append(threading.get_ident()) or {})
+    watcher, _ = main.availability_hub.subscribe(1, asyncio.new_event_loop())
+
+    def commit():
+        db = main.SessionLocal()
+        try:
+            db.info["changed_events"] = {1}
+            db.commit()
+        finally:
+            db.close()
+
+    try:
+        run_on_event_loop(commit)
+    finally:
+        main.availability_hub.unsubscribe(1, watcher)
+
+    assert readers and readers[0] != threading.get_ident()
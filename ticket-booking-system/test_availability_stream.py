@@ -0,0 +1,50 @@
+"""Availability stream: one query per commit, fanned out to every watcher."""
+import asyncio
+
+from sqlalchemy import event as sa_event
+
+import main
+
+
+class Watching:
+    """Stands in for a connected client's Request."""
+    async def is_disconnected(self):
+        return False
+
+
+def test_commits_are_pushed_to_all_watchers(client, setup_event):
+    setup_event()
+
+    async def watch():
+        statements = []
+        count = lambda *args, **kwargs: statements.append(1)
+        sa_event.listen(main.engine, "before_cursor_execute", count)
+        try:
+            # Only the first watcher reads the counts; the rest are served its snapshot
+            responses = [await main.availability_stream(1, Watching()) for _ in range(50)]
+            assert len(statements) == 1
+            streams = [response.body_iterator for response in responses]
+            first = [await stream.__anext__() for stream in streams]
+            assert all('"available_tickets": 100' in message for message in first)
+
+            statements.clear()
+            main.availability_hub.publish({1})
+            assert len(statements) == 1
+        finally:
+            sa_event.remove(main.engine, "before_cursor_execute", count)
+
+        # A real booking commit reaches every watcher
+        await asyncio.to_thread(client.post, "/bookings", data={"event_id": 1, "venue_id": 1, "ticket_type_id": 1, "quantity": 3})
+        updates = [await asyncio.wait_for(stream.__anext__(), 5) for stream in streams]
+        assert all("event: availability" in message and '"available_tickets": 97' in message for message in updates)
+        for stream in streams:
+            await stream.aclose()
+        assert 1 not in main.availability_hub.watchers
+
+    asyncio.run(watch())
+
+
+def test_unknown_event_is_404(client):
+    response = client.get("/events/9/availability/stream")
+    assert response.status_code == 404
+    assert not main.availability_hub.watchers
@@ -0,0 +1,42 @@
+"""Load-test harness: a small end-to-end run of bench.py and the shape of its report."""
+import json
+import os
+import subprocess
+import sys
+
+import bench
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_bench_reports_every_endpoint_at_each_scale(tmp_path):
+    output = tmp_path / "bench.json"
+    result = subprocess.run(
+        [sys.executable, "bench.py", "--bookings", "500", "3000", "--venues", "5", "--concurrency", "4", "--requests", "100", "--output", str(output)],
+        cwd=HERE, capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stderr
+
+    runs = json.loads(output.read_text())["runs"]
+    assert [(run["bookings"], run["events"], run["venues"]) for run in runs] == [(500, 10, 5), (3000, 30, 5)]
+    for run in runs:
+        assert set(run["endpoints"]) == set(bench.ENDPOINTS)
+        assert sum(r["requests"] for r in run["endpoints"].values()) == 100
+        for endpoint, report in run["endpoints"].items():
+            assert report["errors"] == 0
+            assert 0 < report["p50_ms"] <= report["p95_ms"] <= report["p99_ms"]
+            # Calendar months are mostly cached by the time statements are counted
+            assert report["queries_per_request"] <= 1 if endpoint == "GET /calendar" else report["queries_per_request"] >= 1
+    # None of the endpoints costs more statements at six times the data
+    costs = [{e: r["queries_per_request"] for e, r in run["endpoints"].items() if e != "GET /calendar"} for run in runs]
+    assert costs[0] == costs[1]
+
+
+def test_requests_stay_within_the_seeded_ids():
+    for _ in range(200):
+        method, path, data = bench.next_request("POST /bookings", events=30, venues=5)
+        assert (method, path) == ("POST", "/bookings")
+        assert 1 <= data["event_id"] <= 30 and data["ticket_type_id"] == data["event_id"]
+        assert data["venue_id"] == data["event_id"] % 5 + 1
+    method, path, _ = bench.next_request("GET /calendar", events=30, venues=5)
+    assert method == "GET" and path.startswith("/calendar?from=2025-")
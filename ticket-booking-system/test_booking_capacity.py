@@ -0,0 +1,155 @@
+"""Concurrency stress tests: parallel bookings on one event must never oversell it."""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func
+
+import main
+
+CAPACITY = 500
+ATTEMPTS = 2000
+
+
+def confirmed_total(db):
+    return db.query(func.sum(main.Booking.quantity)).filter(
+        main.Booking.event_id == 1, main.Booking.status == main.BookingStatus.confirmed
+    ).scalar() or 0
+
+
+def test_parallel_form_bookings_never_oversell(client, setup_event):
+    setup_event(capacity=CAPACITY)
+
+    def book(i):
+        data = {"event_id": 1, "venue_id": 1, "ticket_type_id": 1, "quantity": i % 3 + 1}
+        return client.post("/bookings", data=data, follow_redirects=False).status_code
+
+    with ThreadPoolExecutor(max_workers=64) as pool:
+        codes = list(pool.map(book, range(ATTEMPTS)))
+
+    assert set(codes) <= {303, 400}
+    db = main.SessionLocal()
+    try:
+        total = confirmed_total(db)
+        inventory = db.query(main.EventInventory).filter(main.EventInventory.event_id == 1).one()
+        type_inventory = db.query(main.TicketTypeInventory).filter(main.TicketTypeInventory.ticket_type_id == 1).one()
+        # Sold out, but never past capacity, and the counters agree with the rows
+        assert CAPACITY - 2 <= total <= CAPACITY
+        assert inventory.booked == type_inventory.booked == total
+        assert main.reconcile_inventory(db, apply=False)["drift"] == []
+    finally:
+        db.close()
+
+
+def test_parallel_json_bookings_never_oversell(client, setup_event):
+    setup_event(capacity=200)
+
+    def book(_):
+        db = main.SessionLocal()
+        try:
+            main.create_booking(main.BookingCreate(event_id=1, venue_id=1, ticket_type_id=1, quantity=1), db)
+            return True
+        except HTTPException as exc:
+            assert exc.status_code == 400
+            return False
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=64) as pool:
+        results = list(pool.map(book, range(1000)))
+
+    assert results.count(True) == 200
+    db = main.SessionLocal()
+    try:
+        assert confirmed_total(db) == 200
+    finally:
+        db.close()
+
+
+def test_status_change_cannot_oversell(client, setup_event):
+    setup_event(capacity=5)
+    client.post("/bookings", data={"event_id": 1, "venue_id": 1, "ticket_type_id": 1, "quantity": 5})
+    client.patch("/bookings/1/status", params={"status": "cancelled"})
+    client.post("/bookings", data={"event_id": 1, "venue_id": 1, "ticket_type_id": 1, "quantity": 5})
+
+    response = client.patch("/bookings/1/status", params={"status": "confirmed"})
+    assert response.status_code == 400
+    assert client.get("/events/1/available-tickets").json()["available_tickets"] == 0
+
+
+@pytest.mark.parametrize("quantity", [0, -10])
+def test_non_positive_quantity_is_rejected(client, setup_event, quantity):
+    setup_event(capacity=10)
+    data = {"event_id": 1, "venue_id": 1, "ticket_type_id": 1, "quantity": 10}
+    assert client.post("/bookings", data=data, follow_redirects=False).status_code == 303
+
+    bad = dict(data, quantity=quantity)
+    assert client.post("/bookings", data=bad, follow_redirects=False).status_code == 400
+    assert client.post("/bookings/1/edit", data=bad, follow_redirects=False).status_code == 400
+    assert client.put("/bookings/1", json=bad).status_code == 400
+    db = main.SessionLocal()
+    try:
+        with pytest.raises(HTTPException) as error:
+            main.create_booking(main.BookingCreate(**bad), db)
+        assert error.value.detail == "Quantity must be at least 1."
+        inventory = db.query(main.EventInventory).filter(main.EventInventory.event_id == 1).one()
+        assert inventory.booked == confirmed_total(db) == 10
+    finally:
+        db.close()
+    # The venue is still full, so a further booking cannot slip in
+    assert client.post("/bookings", data=data, follow_redirects=False).status_code == 400
+
+
+def line(quantity, event_id=1, venue_id=1, ticket_type_id=1):
+    return {"event_id": event_id, "venue_id": venue_id, "ticket_type_id": ticket_type_id, "quantity": quantity}
+
+
+def test_bulk_all_or_nothing_rejects_whole_batch(client, setup_event):
+    setup_event(capacity=10)
+
+    response = client.post("/bookings/bulk", json={"bookings": [line(4), line(4), line(4)]})
+
+    assert response.status_code == 400
+    assert [e["index"] for e in response.json()["detail"]] == [0, 1, 2]
+    assert client.get("/events/1/available-tickets").json()["available_tickets"] == 10
+
+
+def test_bulk_partial_books_lines_that_fit(client, setup_event):
+    setup_event(capacity=10)
+
+    response = client.post("/bookings/bulk", json={
+        "mode": "partial",
+        "bookings": [line(4), line(4), line(4), line(2), line(1, event_id=99)],
+    })
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [b["quantity"] for b in body["created"]] == [4, 4, 2]
+    assert body["errors"] == [
+        {"index": 2, "detail": "Venue capacity exceeded."},
+        {"index": 4, "detail": "Event not found."},
+    ]
+    assert client.get("/events/1/available-tickets").json()["available_tickets"] == 0
+
+
+@pytest.fixture
+def local_time_ahead_of_utc(monkeypatch):
+    monkeypatch.setenv("TZ", "Asia/Kolkata")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_bulk_and_form_bookings_share_a_clock(client, setup_event, local_time_ahead_of_utc):
+    setup_event()
+    client.post("/bookings", data={"event_id": 1, "venue_id": 1, "ticket_type_id": 1, "quantity": 1})
+    client.post("/bookings/bulk", json={"bookings": [line(1)]})
+
+    db = main.SessionLocal()
+    try:
+        form, bulk = [b.created_at for b in db.query(main.Booking).order_by(main.Booking.id)]
+    finally:
+        db.close()
+    assert abs((bulk - form).total_seconds()) < 60
@@ -0,0 +1,66 @@
+"""Bookings list: one joined query per page, names included, keyset-paged in any sort order."""
+import re
+
+import pytest
+
+ROW = re.compile(r"<tr>\s*<td>(\d+)</td>\s*<td>(.*?)</td>\s*<td>(.*?)</td>\s*<td>(.*?)</td>\s*<td>(\d+)</td>")
+NEXT = re.compile(r'href="([^"]*cursor=[^"]*)"[^>]*>Next page')
+
+
+def seed(client, bookings=24):
+    client.post("/venues", data={"name": "Arena", "address": "1 Main St", "capacity": 1000})
+    client.post("/venues", data={"name": "Club", "address": "2 Side St", "capacity": 1000})
+    client.post("/events", data={"name": "Finals", "date": "2025-08-15T19:00", "venue_id": 1})
+    client.post("/events", data={"name": "Blues Night", "date": "2025-08-16T20:00", "venue_id": 2})
+    client.post("/ticket-types", data={"name": "Standard", "price": 50, "event_id": 1})
+    client.post("/ticket-types", data={"name": "VIP", "price": 90, "event_id": 2})
+    client.post("/bookings/bulk", json={"bookings": [
+        {"event_id": 1 + n % 2, "venue_id": 1 + n % 2, "ticket_type_id": 1 + n % 2, "quantity": 1 + n % 4} for n in range(bookings)
+    ]})
+
+
+def walk(client, url):
+    rows, pages = [], 0
+    while url:
+        page = client.get(url)
+        assert page.status_code == 200
+        rows += [(int(i), event, venue, ticket_type, int(quantity)) for i, event, venue, ticket_type, quantity in ROW.findall(page.text)]
+        pages += 1
+        next_url = NEXT.search(page.text)
+        url = next_url.group(1).replace("&amp;", "&") if next_url else None
+    return rows, pages
+
+
+def test_rows_carry_joined_names(client):
+    seed(client, bookings=2)
+    rows, _ = walk(client, "/bookings")
+    assert rows == [(1, "Finals", "Arena", "Standard", 1), (2, "Blues Night", "Club", "VIP", 2)]
+
+
+@pytest.mark.parametrize("sort, order, key", [
+    ("event", "asc", lambda row: (row[1], row[0])),
+    ("venue", "desc", lambda row: (row[2], row[0])),
+    ("quantity", "desc", lambda row: (row[4], row[0])),
+    ("id", "desc", lambda row: row[0]),
+])
+def test_pages_walk_every_row_in_sort_order(client, sort, order, key):
+    seed(client)
+
+    rows, pages = walk(client, f"/bookings?sort={sort}&order={order}&limit=5")
+
+    assert pages == 5
+    assert rows == sorted(rows, key=key, reverse=order == "desc")
+    assert sorted(row[0] for row in rows) == list(range(1, 25))
+
+
+def test_page_queries_do_not_grow_with_bookings(client):
+    seed(client, bookings=3)
+    few = client.get("/bookings?sort=event").headers["X-Query-Count"]
+    client.post("/bookings/bulk", json={"bookings": [
+        {"event_id": 2, "venue_id": 2, "ticket_type_id": 2, "quantity": 1} for _ in range(300)
+    ]})
+
+    response = client.get("/bookings?sort=event&limit=200")
+    assert response.headers["X-Query-Count"] == few
+    assert len(ROW.findall(response.text)) == 200
+    assert client.get("/bookings?sort=price").status_code == 400
@@ -0,0 +1,71 @@
+"""Bookings pages: streamed in chunks, sorted and keyset-paginated."""
+import asyncio
+import re
+
+from fastapi.testclient import TestClient
+
+import main
+
+
+def book(client, setup_event, count):
+    setup_event(capacity=100000)
+    client.post("/bookings/bulk", json={"bookings": [
+        {"event_id": 1, "venue_id": 1, "ticket_type_id": 1, "quantity": 1} for _ in range(count)
+    ]})
+
+
+def test_bookings_page_streams_and_paginates(client, setup_event):
+    book(client, setup_event, 1200)
+    response = client.get("/bookings?limit=1000&sort=id&order=desc")
+    assert response.status_code == 200
+    page = response.text
+    assert page.count("/delete") == 1000
+    assert "<td>1200</td>" in page and "<td>201</td>" in page and "<td>200</td>" not in page
+
+    next_url = re.search(r'href="([^"]*cursor=[^"]*)"[^>]*>Next page', page).group(1).replace("&amp;", "&")
+    rest = client.get(next_url).text
+    assert rest.count("/delete") == 200
+    assert "<td>200</td>" in rest and "<td>1</td>" in rest
+    assert "Next page" not in rest
+
+
+def test_search_page_streams_filtered_rows(client, setup_event):
+    book(client, setup_event, 30)
+    page = client.get("/bookings/search?event=Finals&limit=25").text
+    assert page.count("<tr>") == 26
+    assert "Next page" in page
+    assert client.get("/bookings/search?event=Nope").text.count("<tr>") == 1
+    assert client.get("/bookings/search?sort=bogus").status_code == 400
+
+
+def test_stream_template_sends_chunks():
+    rows = ({"id": n, "event_name": "Finals", "status": "confirmed"} for n in range(2000))
+    response = main.stream_template("bookings_search.html", {
+        "bookings": rows, "events": [], "venues": [], "ticket_types": [],
+        "sort_urls": {}, "first_url": "/bookings/search", "pager": {"next_url": None},
+    })
+
+    async def collect():
+        return [chunk async for chunk in response.body_iterator]
+
+    chunks = asyncio.run(collect())
+    assert len(chunks) > 2
+    assert all(len(chunk) < 2 * main.STREAM_CHUNK_SIZE for chunk in chunks)
+    assert "".join(chunks).count("<tr>") == 2001
+
+
+def test_templates_are_bytecode_cached():
+    main.preload_templates()
+    assert main.templates.env.bytecode_cache is not None
+    assert main.os.listdir(main.TEMPLATE_CACHE_DIR)
+
+
+def test_failing_page_query_is_an_error_not_a_truncated_page(client, setup_event):
+    book(client, setup_event, 3)
+    with main.engine.begin() as conn:
+        conn.exec_driver_sql("DROP TABLE booking_search")
+
+    with TestClient(main.app, raise_server_exceptions=False) as failing:
+        response = failing.get("/bookings/search?q=Finals")
+
+    assert response.status_code == 500
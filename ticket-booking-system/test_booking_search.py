@@ -0,0 +1,84 @@
+"""Booking search: FTS5 index kept in sync by triggers, ranked and paginated."""
+import re
+
+import main
+
+
+def setup(client):
+    client.post("/venues", data={"name": "Arena", "address": "1 Main St", "capacity": 1000})
+    client.post("/venues", data={"name": "Olympia Hall", "address": "2 Main St", "capacity": 1000})
+    client.post("/events", data={"name": "Café Finals", "date": "2025-08-15T19:00", "venue_id": 1})
+    client.post("/events", data={"name": "Spring Gala", "date": "2025-09-01T19:00", "venue_id": 2})
+    client.post("/ticket-types", data={"name": "VIP", "price": 90, "event_id": 1})
+    client.post("/ticket-types", data={"name": "Standard", "price": 20, "event_id": 2})
+    client.post("/bookings/bulk", json={"bookings": [
+        {"event_id": 1, "venue_id": 1, "ticket_type_id": 1, "quantity": 1} for _ in range(3)
+    ] + [
+        {"event_id": 2, "venue_id": 2, "ticket_type_id": 2, "quantity": 1} for _ in range(4)
+    ]})
+
+
+def found(client, url):
+    page = client.get(url)
+    assert page.status_code == 200
+    return [int(n) for n in re.findall(r"<tr>\s*<td>(\d+)</td>", page.text)]
+
+
+def test_prefix_terms_match_names_ignoring_case_and_accents(client):
+    setup(client)
+    assert sorted(found(client, "/bookings/search?q=cafe")) == [1, 2, 3]
+    assert sorted(found(client, "/bookings/search?q=OLYM")) == [4, 5, 6, 7]
+    # Every word has to match, in any column
+    assert sorted(found(client, "/bookings/search?q=gala+stand")) == [4, 5, 6, 7]
+    assert found(client, "/bookings/search?q=gala+vip") == []
+    # Punctuation is not FTS syntax
+    assert sorted(found(client, '/bookings/search?q="vip" (arena*')) == [1, 2, 3]
+
+
+def test_confirmation_code_lookup(client):
+    setup(client)
+    db = main.SessionLocal()
+    try:
+        code = db.query(main.Booking.confirmation_code).filter(main.Booking.id == 6).scalar()
+    finally:
+        db.close()
+    assert found(client, f"/bookings/search?q={code}") == [6]
+    assert 6 in found(client, f"/bookings/search?q={code[:5].lower()}")
+
+
+def test_index_follows_bookings_and_renames(client):
+    setup(client)
+    client.put("/bookings/2", json={"event_id": 2, "venue_id": 2, "ticket_type_id": 2, "quantity": 1})
+    client.delete("/bookings/3")
+    assert found(client, "/bookings/search?q=cafe") == [1]
+    assert 2 in found(client, "/bookings/search?q=spring")
+
+    with main.engine.begin() as conn:
+        conn.exec_driver_sql("UPDATE events SET name = 'Summer Gala' WHERE id = 2")
+    assert found(client, "/bookings/search?q=spring") == []
+    assert sorted(found(client, "/bookings/search?q=summer")) == [2, 4, 5, 6, 7]
+
+
+def test_ranked_results_page_through_every_match(client):
+    setup(client)
+    with main.engine.begin() as conn:
+        conn.exec_driver_sql("UPDATE venues SET name = 'Gala Arena' WHERE id = 1")
+    # "gala" is in both the event and the venue name of 4-7, only the venue of 1-3
+    first = found(client, "/bookings/search?q=gala&limit=3")
+    assert first == [4, 5, 6]
+    page = client.get("/bookings/search?q=gala&limit=3").text
+    seen = list(first)
+    while "Next page" in page:
+        next_url = re.search(r'href="([^"]*cursor=[^"]*)"[^>]*>Next page', page).group(1).replace("&amp;", "&")
+        page = client.get(next_url).text
+        seen += [int(n) for n in re.findall(r"<tr>\s*<td>(\d+)</td>", page)]
+    assert seen == [4, 5, 6, 7, 1, 2, 3]
+    assert client.get("/bookings/search?sort=relevance").status_code == 400
+
+
+def test_migration_backfills_existing_bookings(client):
+    setup(client)
+    with main.engine.begin() as conn:
+        main._migration_booking_search(conn)
+        assert conn.exec_driver_sql("SELECT count(*) FROM booking_search").scalar() == 7
+    assert sorted(found(client, "/bookings/search?q=arena")) == [1, 2, 3]
@@ -0,0 +1,54 @@
+"""Calendar cache: 304 on unchanged days, and only the days a write touched are refreshed."""
+import main
+
+AUGUST = "/calendar?from=2025-08-01&to=2025-08-31"
+
+
+def test_calendar_etag_and_invalidation(client, setup_event):
+    setup_event()
+    client.post("/events", data={"name": "Encore", "date": "2025-08-20T19:00", "venue_id": 1})
+
+    first = client.get(AUGUST)
+    assert first.status_code == 200
+    assert "100 / 100" in first.text
+    etag = first.headers["etag"]
+    assert client.get(AUGUST, headers={"If-None-Match": etag}).status_code == 304
+
+    # A booking on the 15th changes the ETag and the rendered availability...
+    client.post("/bookings", data={"event_id": 1, "venue_id": 1, "ticket_type_id": 1, "quantity": 5})
+    assert "2025-08-15" not in main._calendar_days
+    assert "2025-08-20" in main._calendar_days
+    second = client.get(AUGUST, headers={"If-None-Match": etag})
+    assert second.status_code == 200
+    assert "95 / 100" in second.text
+    # ...but leaves ranges that do not include that day untouched
+    late = "/calendar?from=2025-08-16&to=2025-08-31"
+    late_etag = client.get(late).headers["etag"]
+    client.post("/bookings", data={"event_id": 1, "venue_id": 1, "ticket_type_id": 1, "quantity": 1})
+    assert client.get(late, headers={"If-None-Match": late_etag}).status_code == 304
+
+    # New events invalidate their day too
+    client.post("/events", data={"name": "Matinee", "date": "2025-08-20T14:00", "venue_id": 1})
+    assert "Matinee" in client.get(AUGUST).text
+
+
+def test_calendar_range_is_validated(client):
+    assert client.get("/calendar?from=2025-08-31&to=2025-08-01").status_code == 400
+    assert client.get("/calendar?from=2025-01-01&to=2026-06-01").status_code == 400
+    assert client.get("/calendar").status_code == 200
+
+
+def test_cache_keeps_only_the_most_recently_requested_days(client, setup_event, monkeypatch):
+    monkeypatch.setattr(main, "CALENDAR_CACHE_DAYS", 40)
+    setup_event()
+    client.get(AUGUST)
+    client.get("/calendar?from=2025-08-25&to=2025-08-31")
+    client.get("/calendar?from=2025-09-01&to=2025-09-30")
+
+    assert list(main._calendar_days) == [f"2025-08-{d}" for d in range(22, 32)] + [f"2025-09-{d:02d}" for d in range(1, 31)]
+    assert 1 not in main._calendar_event_dates
+    # Evicted days are read again; the ETag still answers 304 without them
+    etag = client.get(AUGUST).headers["etag"]
+    response = client.get(AUGUST, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["X-Query-Count"] == "0"
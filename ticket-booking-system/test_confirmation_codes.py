@@ -0,0 +1,72 @@
+"""Confirmation codes: unique by construction, typo-checked, and found by index."""
+import pytest
+
+import main
+
+
+def test_codes_are_unique_and_well_formed(client):
+    codes = [main.encode_confirmation_code(n) for n in range(50000)]
+    assert len(set(codes)) == len(codes)
+    assert all(len(code) == 9 and main.is_valid_confirmation_code(code) for code in codes)
+    # Neighbouring sequence numbers don't produce neighbouring codes
+    assert codes[0][:6] != codes[1][:6]
+
+
+def test_check_character_rejects_single_character_typos(client):
+    code = main.encode_confirmation_code(12345)
+    for position in range(len(code)):
+        for char in main.CODE_ALPHABET:
+            if char != code[position]:
+                typo = code[:position] + char + code[position + 1:]
+                assert not main.is_valid_confirmation_code(typo)
+
+
+def test_lookup_by_code(client, setup_event):
+    setup_event()
+    response = client.post("/bookings/bulk", json={"bookings": [
+        {"event_id": 1, "venue_id": 1, "ticket_type_id": 1, "quantity": 1} for _ in range(3)
+    ]})
+    codes = [b["confirmation_code"] for b in response.json()["created"]]
+    assert len(set(codes)) == 3
+
+    found = client.get(f"/bookings/by-code/{codes[1].lower()}")
+    assert found.status_code == 200
+    assert found.json()["id"] == response.json()["created"][1]["id"]
+    assert client.get("/bookings/by-code/" + codes[1][:-1] + ("0" if codes[1][-1] != "0" else "1")).status_code == 404
+
+
+def stored_key():
+    with main.engine.begin() as conn:
+        return conn.execute(main.select(main.ConfirmationCodeSequence.code_key)).scalar()
+
+
+def test_key_is_generated_once_and_kept(client):
+    key = stored_key()
+    code = main.encode_confirmation_code(7)
+    assert key and main.CONFIRMATION_CODE_KEY == key.encode()
+
+    main.load_confirmation_code_key()
+
+    assert stored_key() == key
+    assert main.encode_confirmation_code(7) == code
+
+
+def test_new_database_takes_the_configured_key(client, monkeypatch):
+    with main.engine.begin() as conn:
+        conn.execute(main.ConfirmationCodeSequence.__table__.update().values(code_key=None))
+    monkeypatch.setenv("TICKET_BOOKING_CODE_KEY", "configured-key")
+
+    main.load_confirmation_code_key()
+
+    assert stored_key() == "configured-key"
+    assert main.CONFIRMATION_CODE_KEY == b"configured-key"
+
+
+def test_startup_refuses_a_changed_key(client, monkeypatch):
+    key = stored_key()
+    monkeypatch.setenv("TICKET_BOOKING_CODE_KEY", "some-other-key")
+
+    with pytest.raises(RuntimeError, match="TICKET_BOOKING_CODE_KEY"):
+        main.load_confirmation_code_key()
+
+    assert stored_key() == key
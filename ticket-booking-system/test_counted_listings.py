@@ -0,0 +1,88 @@
+"""Venue and ticket type listings: one grouped query per page, sortable by count."""
+import base64
+import json
+
+import pytest
+
+import main
+
+
+def seed(venues=30):
+    # Venue n hosts n % 7 events; event e's ticket type has e % 5 bookings
+    with main.engine.begin() as conn:
+        conn.execute(main.Venue.__table__.insert(), [
+            {"id": v, "name": f"Venue {v}", "address": f"{v} Main St", "capacity": 1000} for v in range(1, venues + 1)
+        ])
+        events = [(v, n) for v in range(1, venues + 1) for n in range(v % 7)]
+        conn.execute(main.Event.__table__.insert(), [
+            {"id": e, "name": f"Event {e}", "date": main.datetime(2025, 8, 15), "venue_id": v} for e, (v, _) in enumerate(events, 1)
+        ])
+        conn.execute(main.TicketType.__table__.insert(), [
+            {"id": e, "name": "Standard", "price": 20.0, "event_id": e} for e in range(1, len(events) + 1)
+        ])
+        conn.execute(main.Booking.__table__.insert(), [
+            {"event_id": e, "venue_id": v, "ticket_type_id": e, "quantity": 1, "status": "confirmed",
+             "confirmation_code": f"C{e:05d}{b}", "created_at": main.datetime(2025, 8, 1)}
+            for e, (v, _) in enumerate(events, 1) for b in range(e % 5)
+        ])
+    return venues, len(events)
+
+
+def walk(client, url):
+    items, cursor = [], None
+    while True:
+        page = client.get(url + (f"&cursor={cursor}" if cursor else "")).json()
+        items += page["items"]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return items
+
+
+def test_pages_are_one_query_regardless_of_size(client, query_ceiling):
+    seed(venues=60)
+    query_ceiling("GET", "/venues", 1)
+    query_ceiling("GET", "/ticket-types", 1)
+    query_ceiling("GET", "/venues/summary?sort=event_count&order=desc&limit=10", 1)
+    query_ceiling("GET", "/ticket-types/summary?sort=booking_count&limit=10", 1)
+
+
+def test_venues_sorted_by_event_count_across_pages(client):
+    venues, _ = seed()
+    items = walk(client, "/venues/summary?sort=event_count&order=desc&limit=4")
+    assert len(items) == venues
+    assert [(v["event_count"], v["id"]) for v in items] == sorted(((v % 7, v) for v in range(1, venues + 1)), reverse=True)
+    assert items[0] == {"id": 27, "name": "Venue 27", "address": "27 Main St", "capacity": 1000, "event_count": 6}
+
+
+def test_ticket_types_sorted_by_booking_count_across_pages(client):
+    _, events = seed()
+    items = walk(client, "/ticket-types/summary?sort=booking_count&limit=7")
+    assert [(t["booking_count"], t["id"]) for t in items] == sorted((e % 5, e) for e in range(1, events + 1))
+
+
+def test_html_pages_show_counts_and_link_the_next_page(client):
+    seed()
+    response = client.get("/venues?sort=event_count&order=desc&limit=2")
+    assert response.status_code == 200
+    assert "<td>Venue 27</td>" in response.text and "<td>Venue 20</td>" in response.text
+    assert "<td>6</td>" in response.text
+    assert "Next page" in response.text and "cursor=" in response.text
+    assert 'href="/venues?limit=2&amp;sort=event_count&amp;order=asc"' in response.text
+
+    response = client.get("/ticket-types?sort=booking_count&order=desc&limit=500")
+    assert response.status_code == 200
+    assert "Next page" not in response.text
+
+
+def test_unknown_sort_is_rejected(client):
+    assert client.get("/venues?sort=secret").status_code == 400
+    assert client.get("/ticket-types/summary?sort=secret").status_code == 400
+
+
+@pytest.mark.parametrize("url", ["/venues/summary?sort=name", "/ticket-types/summary?sort=price", "/venues?sort=name"])
+@pytest.mark.parametrize("value", [[1], {"a": 1}])
+def test_non_scalar_cursor_is_rejected(client, url, value):
+    seed(venues=3)
+    cursor = base64.urlsafe_b64encode(json.dumps([value, 1]).encode()).decode().rstrip("=")
+
+    assert client.get(url, params={"cursor": cursor}).status_code == 400
@@ -0,0 +1,45 @@
+"""Dashboard: grouped aggregates give the same figures at a constant number of queries."""
+import main
+
+
+def seed(client, events, first=1):
+    if first == 1:
+        client.post("/venues", data={"name": "Arena", "address": "1 Main St", "capacity": 100})
+        client.post("/venues", data={"name": "Club", "address": "2 Side St", "capacity": 40})
+    for n in range(first, first + events):
+        venue_id = 1 + n % 2
+        client.post("/events", data={"name": f"Event {n}", "date": "2025-08-15T19:00", "venue_id": venue_id})
+        client.post("/ticket-types", data={"name": "Standard", "price": 10 * n, "event_id": n})
+        client.post("/bookings", data={"event_id": n, "venue_id": venue_id, "ticket_type_id": n, "quantity": n})
+
+
+def test_dashboard_figures(client):
+    seed(client, events=3)
+    # An event without bookings still shows up, at zero
+    client.post("/events", data={"name": "Empty", "date": "2025-08-16T19:00", "venue_id": 1})
+    db = main.SessionLocal()
+    try:
+        assert main.booking_system_stats(db) == {
+            "total_bookings": 3, "total_events": 4, "total_venues": 2,
+            "total_available_tickets": (100 - 2) + (40 - 1) + (40 - 3) + 100,
+        }
+        assert [(r["event_name"], r["revenue"]) for r in main.event_revenues_api(db)] == [
+            ("Event 1", 10.0), ("Event 2", 40.0), ("Event 3", 90.0), ("Empty", 0.0),
+        ]
+        occupancy = main.venue_occupancy_api(db)
+        assert {(o["event_name"], o["booked"], o["capacity"]) for o in occupancy[1]["occupancy"]} == {("Event 2", 2, 100), ("Empty", 0, 100)}
+        assert [(o["event_name"], o["occupancy_rate"]) for o in occupancy[2]["occupancy"]] == [("Event 1", 1 / 40), ("Event 3", 3 / 40)]
+    finally:
+        db.close()
+
+    page = client.get("/").text
+    assert "Total Available Tickets: <b>274</b>" in page
+    assert "<td>Event 3</td><td>90.0</td>" in page
+
+
+def test_dashboard_queries_do_not_grow_with_events(client):
+    seed(client, events=3)
+    few = client.get("/").headers["X-Query-Count"]
+    seed(client, events=40, first=4)
+
+    assert client.get("/").headers["X-Query-Count"] == few
@@ -0,0 +1,101 @@
+"""Bookings and revenue exports: filtered, streamed in chunks, CSV or Parquet."""
+import asyncio
+import csv
+import io
+import sys
+
+import pytest
+
+import main
+
+
+def seed(client):
+    client.post("/venues", data={"name": "Arena", "address": "1 Main St", "capacity": 10000})
+    client.post("/events", data={"name": "Finals", "date": "2025-08-15T19:00", "venue_id": 1})
+    client.post("/events", data={"name": "Semis", "date": "2025-08-10T19:00", "venue_id": 1})
+    client.post("/ticket-types", data={"name": "VIP", "price": 90, "event_id": 1})
+    client.post("/ticket-types", data={"name": "Standard", "price": 20, "event_id": 2})
+    # 300 bookings over three days in July, every tenth one cancelled
+    with main.engine.begin() as conn:
+        conn.execute(main.Booking.__table__.insert(), [
+            {"event_id": 1 + n % 2, "venue_id": 1, "ticket_type_id": 1 + n % 2, "quantity": 1 + n % 3,
+             "status": "cancelled" if n % 10 == 0 else "confirmed", "confirmation_code": f"X{n:05d}",
+             "created_at": main.datetime(2025, 7, 1 + n // 100, 12, 0)}
+            for n in range(300)
+        ])
+
+
+def read_csv(response):
+    assert response.status_code == 200
+    return list(csv.DictReader(io.StringIO(response.text)))
+
+
+def test_bookings_csv_with_filters(client):
+    seed(client)
+    response = client.get("/exports/bookings")
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == 'attachment; filename="bookings.csv"'
+    rows = read_csv(response)
+    assert len(rows) == 300
+    assert rows[0] == {
+        "booking_id": "1", "confirmation_code": "X00000", "status": "cancelled", "created_at": "2025-07-01 12:00:00",
+        "event_id": "1", "event_name": "Finals", "venue_id": "1", "venue_name": "Arena",
+        "ticket_type_id": "1", "ticket_type_name": "VIP", "quantity": "1",
+    }
+
+    rows = read_csv(client.get("/exports/bookings?from=2025-07-02&to=2025-07-02&event_id=2"))
+    assert len(rows) == 50
+    assert {row["event_name"] for row in rows} == {"Semis"}
+    assert {row["created_at"][:10] for row in rows} == {"2025-07-02"}
+    assert client.get("/exports/bookings?format=xml").status_code == 422
+
+
+def test_revenue_csv_matches_rollup(client):
+    seed(client)
+    db = main.SessionLocal()
+    try:
+        main.reconcile_inventory(db)
+    finally:
+        db.close()
+    rows = read_csv(client.get("/exports/revenue"))
+    assert len(rows) == 270
+    assert rows[0]["ticket_type_name"] == "Standard" and rows[0]["amount"] == "40.0"
+    total = sum(float(row["amount"]) for row in rows)
+    rollup = client.get("/analytics/revenue?group_by=event").json()["results"]
+    assert total == pytest.approx(sum(entry["revenue"] for entry in rollup))
+
+
+def test_export_is_streamed_in_chunks(client, monkeypatch):
+    seed(client)
+    monkeypatch.setattr(main, "EXPORT_BATCH", 50)
+    monkeypatch.setattr(main, "STREAM_CHUNK_SIZE", 1024)
+    response = main.export_bookings(format="csv", date_from=None, date_to=None, event_id=None)
+
+    async def collect():
+        return [chunk async for chunk in response.body_iterator]
+
+    chunks = asyncio.run(collect())
+    assert len(chunks) > 10
+    assert all(len(chunk) < 1024 + 200 for chunk in chunks)
+    assert "".join(chunks).count("\n") == 301
+
+
+def test_parquet_has_one_row_group_per_batch(client, monkeypatch):
+    pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+    seed(client)
+    monkeypatch.setattr(main, "EXPORT_BATCH", 100)
+    response = client.get("/exports/revenue?format=parquet")
+    assert response.headers["content-type"] == "application/vnd.apache.parquet"
+    parquet = pyarrow_parquet.ParquetFile(io.BytesIO(response.content))
+    assert parquet.metadata.num_rows == 270
+    assert parquet.metadata.num_row_groups == 3
+    table = parquet.read()
+    assert table.column_names == [name for name, _ in main.EXPORT_COLUMNS["revenue"]]
+    assert str(table.schema.field("created_at").type) == "timestamp[us]"
+    assert table.column("booking_id").to_pylist()[:3] == [2, 3, 4]
+
+
+def test_parquet_without_pyarrow_is_501(client, monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyarrow.parquet", None)
+    response = client.get("/exports/bookings?format=parquet")
+    assert response.status_code == 501
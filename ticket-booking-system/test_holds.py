@@ -0,0 +1,73 @@
+"""Seat holds: reserve against capacity, confirm once, and lapse back into inventory."""
+from datetime import datetime, timedelta
+
+import main
+
+
+def available(client):
+    return client.get("/events/1/available-tickets").json()["available_tickets"]
+
+
+def lapse(hold_id):
+    db = main.SessionLocal()
+    try:
+        db.query(main.SeatHold).filter(main.SeatHold.id == hold_id).update({main.SeatHold.expires_at: datetime.utcnow() - timedelta(seconds=1)})
+        db.commit()
+    finally:
+        db.close()
+
+
+def assert_no_drift():
+    db = main.SessionLocal()
+    try:
+        assert main.reconcile_inventory(db, apply=False)["drift"] == []
+    finally:
+        db.close()
+
+
+def test_hold_then_confirm(client, setup_event):
+    setup_event(capacity=10)
+    hold = client.post("/events/1/holds", json={"ticket_type_id": 1, "quantity": 6}).json()
+    assert available(client) == 4
+    # Held seats count against capacity for both holds and bookings
+    assert client.post("/events/1/holds", json={"ticket_type_id": 1, "quantity": 5}).status_code == 400
+    assert client.post("/bookings", data={"event_id": 1, "venue_id": 1, "ticket_type_id": 1, "quantity": 5}, follow_redirects=False).status_code == 400
+    assert_no_drift()
+
+    booking = client.post(f"/holds/{hold['id']}/confirm")
+    assert booking.status_code == 200
+    assert booking.json()["quantity"] == 6 and booking.json()["status"] == "confirmed"
+    assert available(client) == 4
+    assert client.get("/events/1/revenue").json()["revenue"] == 300.0
+    assert client.post(f"/holds/{hold['id']}/confirm").status_code == 404
+    assert_no_drift()
+
+
+def test_lapsed_holds_are_released(client, setup_event):
+    setup_event(capacity=10)
+    first = client.post("/events/1/holds", json={"ticket_type_id": 1, "quantity": 4}).json()
+    second = client.post("/events/1/holds", json={"ticket_type_id": 1, "quantity": 3, "minutes": 30}).json()
+    lapse(first["id"])
+    assert client.post(f"/holds/{first['id']}/confirm").status_code == 410
+    assert main.sweep_expired_holds() == 1
+    assert available(client) == 7
+    assert_no_drift()
+
+    # A sold-out event releases its own lapsed holds before refusing a booking
+    lapse(second["id"])
+    response = client.post("/bookings", data={"event_id": 1, "venue_id": 1, "ticket_type_id": 1, "quantity": 10}, follow_redirects=False)
+    assert response.status_code == 303
+    assert available(client) == 0
+    assert_no_drift()
+
+
+def test_release_hold_and_validation(client, setup_event):
+    setup_event(capacity=10)
+    hold = client.post("/events/1/holds", json={"ticket_type_id": 1, "quantity": 2}).json()
+    assert client.delete(f"/holds/{hold['id']}").status_code == 200
+    assert client.delete(f"/holds/{hold['id']}").status_code == 404
+    assert available(client) == 10
+    assert client.post("/events/1/holds", json={"ticket_type_id": 1, "quantity": 1, "minutes": 600}).status_code == 400
+    assert client.post("/events/1/holds", json={"ticket_type_id": 9, "quantity": 1}).status_code == 404
+    assert client.post("/events/9/holds", json={"ticket_type_id": 1, "quantity": 1}).status_code == 404
+
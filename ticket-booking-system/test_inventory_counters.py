@@ -0,0 +1,68 @@
+"""Seat inventory counters: kept in step with every booking write, and rebuilt by reconciliation."""
+import sys
+
+import main
+import reconcile_inventory
+
+
+def counters(db):
+    db.expire_all()
+    event = db.get(main.EventInventory, 1)
+    types = {row.ticket_type_id: (row.booked, row.revenue) for row in db.query(main.TicketTypeInventory)}
+    return event.booked, types
+
+
+def available(client):
+    return client.get("/events/1/available-tickets").json()["available_tickets"]
+
+
+def test_counters_follow_create_edit_status_and_delete(client, setup_event):
+    setup_event(capacity=10)
+    client.post("/ticket-types", data={"name": "VIP", "price": 120, "event_id": 1})
+    line = {"event_id": 1, "venue_id": 1, "ticket_type_id": 1}
+    db = main.SessionLocal()
+    try:
+        client.post("/bookings", data={**line, "quantity": 4})
+        assert counters(db) == (4, {1: (4, 200.0), 2: (0, 0.0)})
+        assert available(client) == 6
+
+        assert client.put("/bookings/1", json={**line, "ticket_type_id": 2, "quantity": 6}).status_code == 200
+        assert counters(db) == (6, {1: (0, 0.0), 2: (6, 720.0)})
+
+        client.patch("/bookings/1/status", params={"status": "cancelled"})
+        assert counters(db) == (0, {1: (0, 0.0), 2: (0, 0.0)})
+        assert available(client) == 10
+
+        client.patch("/bookings/1/status", params={"status": "confirmed"})
+        assert counters(db) == (6, {1: (0, 0.0), 2: (6, 720.0)})
+        # The counter is what turns the next booking away
+        assert client.post("/bookings", data={**line, "quantity": 5}, follow_redirects=False).status_code == 400
+
+        client.delete("/bookings/1")
+        assert counters(db) == (0, {1: (0, 0.0), 2: (0, 0.0)})
+        assert available(client) == 10
+    finally:
+        db.close()
+
+
+def test_reconcile_reports_then_fixes_drift(client, setup_event, monkeypatch, capsys):
+    setup_event()
+    client.post("/bookings", data={"event_id": 1, "venue_id": 1, "ticket_type_id": 1, "quantity": 3})
+    with main.engine.begin() as conn:
+        conn.execute(main.EventInventory.__table__.update().values(booked=40))
+        conn.execute(main.TicketTypeInventory.__table__.delete())
+
+    db = main.SessionLocal()
+    try:
+        report = main.reconcile_inventory(db, apply=False)
+        assert {(d["table"], d["id"]) for d in report["drift"]} >= {("event_inventory", 1), ("ticket_type_inventory", 1)}
+        assert counters(db) == (40, {})
+
+        monkeypatch.setattr(sys, "argv", ["reconcile_inventory.py"])
+        assert reconcile_inventory.main() == 1
+        assert '"drift"' in capsys.readouterr().out
+        assert counters(db) == (3, {1: (3, 150.0)})
+        assert main.reconcile_inventory(db, apply=False)["drift"] == []
+        assert reconcile_inventory.main() == 0
+    finally:
+        db.close()
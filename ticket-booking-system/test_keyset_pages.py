@@ -0,0 +1,80 @@
+"""JSON keyset pages: complete, stable walks across sort-value ties, and 400 for bad cursors."""
+import base64
+import json
+
+import pytest
+
+import main
+
+
+def seed(client, bookings=40):
+    client.post("/venues", data={"name": "Arena", "address": "1 Main St", "capacity": 1000})
+    # Events share dates, and bookings share created_at, in runs of several rows
+    with main.engine.begin() as conn:
+        conn.execute(main.Event.__table__.insert(), [
+            {"id": e, "name": f"Event {e}", "date": main.datetime(2025, 8, 1 + e % 3, 19, 0), "venue_id": 1} for e in range(1, 11)
+        ])
+        conn.execute(main.TicketType.__table__.insert(), [{"id": 1, "name": "Standard", "price": 20.0, "event_id": 1}])
+        conn.execute(main.Booking.__table__.insert(), [
+            {"event_id": 1, "venue_id": 1, "ticket_type_id": 1, "quantity": 1, "status": "confirmed",
+             "confirmation_code": f"K{n:05d}", "created_at": main.datetime(2025, 7, 1, 12, 5 - n % 5)}
+            for n in range(bookings)
+        ])
+
+
+def walk(client, url, limit):
+    items, cursor, pages = [], None, 0
+    while True:
+        page = client.get(url, params={"limit": limit, **({"cursor": cursor} if cursor else {})}).json()
+        items += page["items"]
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return items, pages
+
+
+@pytest.mark.parametrize("url", ["/events/1/bookings", "/ticket-types/1/bookings"])
+def test_booking_pages_walk_created_at_ties_in_order(client, url):
+    seed(client)
+
+    items, pages = walk(client, url, limit=7)
+
+    assert pages == 6
+    keys = [(b["created_at"], b["id"]) for b in items]
+    assert keys == sorted(keys)
+    assert sorted(b["id"] for b in items) == list(range(1, 41))
+
+
+def test_venue_events_walk_date_ties_in_order(client):
+    seed(client)
+
+    items, _ = walk(client, "/venues/1/events", limit=3)
+
+    assert [e["id"] for e in items] == [3, 6, 9, 1, 4, 7, 10, 2, 5, 8]
+
+
+def cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("url", ["/events/1/bookings", "/ticket-types/1/bookings", "/venues/1/events", "/bookings"])
+@pytest.mark.parametrize("bad", ["WyJ4IiwxXQ", "%%%", cursor(5), cursor(["2025-07-01T12:00:00", "x"]), cursor([1, 2, 3]),
+                                 cursor([[1], 1]), cursor([{"a": 1}, 1])])
+def test_malformed_cursor_is_rejected(client, url, bad):
+    seed(client, bookings=1)
+
+    response = client.get(url, params={"cursor": bad, "sort": "created_at"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor."
+
+
+@pytest.mark.parametrize("sort", ["quantity", "event", "status"])
+@pytest.mark.parametrize("value", [[1], {"a": 1}])
+def test_non_scalar_sort_value_is_rejected(client, sort, value):
+    seed(client, bookings=1)
+
+    response = client.get("/bookings", params={"sort": sort, "cursor": cursor([value, 1])})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor."
@@ -0,0 +1,59 @@
+"""Per-request query counts: headers, budget warnings and per-endpoint ceilings."""
+import logging
+
+import pytest
+
+import main
+
+
+def setup_events(client, count=3):
+    for n in range(1, count + 1):
+        client.post("/venues", data={"name": f"Venue {n}", "address": f"{n} Main St", "capacity": 100})
+        client.post("/events", data={"name": f"Event {n}", "date": "2025-08-15T19:00", "venue_id": n})
+        client.post("/ticket-types", data={"name": "Standard", "price": 20, "event_id": n})
+        client.post("/bookings", data={"event_id": n, "venue_id": n, "ticket_type_id": n, "quantity": 2})
+
+
+def test_headers_report_queries_and_db_time(client):
+    setup_events(client)
+    response = client.get("/booking-system/stats")
+    assert response.headers["X-Query-Count"] == "1"
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+    assert 'desc="1 queries"' in response.headers["Server-Timing"]
+
+
+@pytest.mark.parametrize("method, url, ceiling", [
+    ("GET", "/", 3),
+    ("GET", "/bookings", 4),
+    ("GET", "/calendar?from=2025-08-01&to=2025-08-31", 1),
+    ("GET", "/booking-system/stats", 1),
+    ("GET", "/events", 1),
+    ("GET", "/events/1/available-tickets", 3),
+    ("GET", "/analytics/revenue", 1),
+    ("POST", "/bookings", 7),
+])
+def test_endpoint_query_ceilings(client, query_ceiling, method, url, ceiling):
+    setup_events(client, count=5)
+    data = {"event_id": 1, "venue_id": 1, "ticket_type_id": 1, "quantity": 1} if method == "POST" else None
+    query_ceiling(method, url, ceiling, data=data)
+
+
+def test_over_budget_request_is_logged(client, monkeypatch, caplog):
+    setup_events(client)
+    monkeypatch.setattr(main, "QUERY_BUDGET", 2)
+    with caplog.at_level(logging.WARNING, logger="ticket_booking"):
+        client.get("/booking-system/stats")
+        assert not caplog.records
+        client.get("/")
+    assert "GET / issued 3 queries (budget 2" in caplog.text
+
+
+def test_repeated_statement_is_flagged_as_n_plus_one(monkeypatch, caplog):
+    monkeypatch.setattr(main, "QUERY_BUDGET", 0)
+    stats = main.QueryStats()
+    stats.count = 11
+    stats.statements["SELECT count(id) FROM events WHERE venue_id = ?"] = 10
+    stats.statements["SELECT id, name FROM venues"] = 1
+    with caplog.at_level(logging.WARNING, logger="ticket_booking"):
+        main.report_request_queries("GET", "/venues", stats)
+    assert "GET /venues repeated a query 10 times (possible N+1): SELECT count(id) FROM events" in caplog.text
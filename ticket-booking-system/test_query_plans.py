@@ -0,0 +1,79 @@
+"""Query-plan regression tests: hot aggregate queries must be answered from indexes."""
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+import main
+
+
+@pytest.fixture
+def db(client):
+    session = main.SessionLocal()
+    yield session
+    session.close()
+
+
+def query_plan(db, query):
+    sql = query.statement.compile(dialect=main.engine.dialect, compile_kwargs={"literal_binds": True})
+    return [row[-1] for row in db.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+
+def assert_uses_index(plan, table, index):
+    assert any(table in step and index in step for step in plan), plan
+    assert not any(step.startswith(f"SCAN {table}") for step in plan), plan
+
+
+def test_capacity_query_uses_covering_index(db):
+    plan = query_plan(db, main.confirmed_quantity_query(db, 1))
+    assert_uses_index(plan, "bookings", "COVERING INDEX ix_bookings_event_status")
+
+
+def test_revenue_query_reads_rollup(db):
+    plan = query_plan(db, main.event_revenue_query(db, 1))
+    assert_uses_index(plan, "ticket_type_inventory", "COVERING INDEX ix_ticket_type_inventory_event")
+    assert not any("bookings" in step for step in plan), plan
+
+
+def test_occupancy_query_uses_indexes(db):
+    plan = query_plan(db, main.venue_occupancy_query(db, 1))
+    assert_uses_index(plan, "events", "ix_events_venue_date")
+    assert_uses_index(plan, "event_inventory", "PRIMARY KEY")
+
+
+def test_hold_sweep_uses_expiry_index(db):
+    query = db.query(main.SeatHold.id).filter(main.SeatHold.expires_at <= main.datetime(2025, 1, 1)).order_by(main.SeatHold.expires_at).limit(1000)
+    plan = query_plan(db, query)
+    assert_uses_index(plan, "seat_holds", "ix_seat_holds_expires_at")
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+
+
+def test_event_bookings_listing_uses_index(db):
+    query = db.query(main.Booking).filter(main.Booking.event_id == 1).order_by(main.Booking.created_at, main.Booking.id).limit(100)
+    assert_uses_index(query_plan(db, query), "bookings", "ix_bookings_event_created")
+
+
+def test_booking_search_pages_in_index_order(db):
+    query = main.search_booking_rows(main.booking_rows_query(db), "finals arena", ranked=False)
+    plan = query_plan(db, main.booking_rows_ordered(query, "id", "desc", main.encode_cursor([None, 500]), main.SEARCH_SORTS).limit(51))
+    assert plan[0].startswith("SCAN booking_search VIRTUAL TABLE"), plan
+    assert_uses_index(plan, "bookings", "PRIMARY KEY")
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+
+
+def test_migrations_add_indexes_to_existing_database(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    # A database created before the indexes were declared: tables only
+    for table in (main.Venue.__table__, main.Event.__table__, main.TicketType.__table__, main.Booking.__table__):
+        table.create(bind=engine, checkfirst=True)
+        for index in list(table.indexes):
+            index.drop(bind=engine)
+
+    main.run_migrations(engine)
+
+    indexes = {index["name"] for index in inspect(engine).get_indexes("bookings")}
+    assert {"ix_bookings_event_status", "ix_bookings_ticket_type_status", "ix_bookings_venue_id", "ix_bookings_event_created"} <= indexes
+    assert inspect(engine).has_table("event_inventory")
+    assert inspect(engine).has_table("venue_day_occupancy")
+    assert "revenue" in {column["name"] for column in inspect(engine).get_columns("ticket_type_inventory")}
+    assert inspect(engine).has_table("booking_search")
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA user_version").scalar() == len(main.MIGRATIONS)
@@ -0,0 +1,46 @@
+"""Storage profile and write queue: pragmas on connect, failing jobs undone alone."""
+from concurrent.futures import Future
+
+import pytest
+from fastapi import HTTPException
+
+import main
+
+
+def test_wal_profile_is_applied(client):
+    with main.engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+
+
+def test_pragma_overrides_are_validated(monkeypatch):
+    monkeypatch.setenv("TICKET_BOOKING_SQLITE_PRAGMAS", "synchronous=FULL, cache_size=-2000")
+    assert main.sqlite_pragmas()["synchronous"] == "FULL"
+    assert main.sqlite_pragmas()["cache_size"] == "-2000"
+    monkeypatch.setenv("TICKET_BOOKING_SQLITE_PRAGMAS", "synchronous=OFF; DROP TABLE bookings")
+    with pytest.raises(ValueError):
+        main.sqlite_pragmas()
+
+
+def test_failing_job_is_rolled_back_alone(client):
+    client.post("/venues", data={"name": "Arena", "address": "1 Main St", "capacity": 100})
+
+    def rename(name, fail=False):
+        def work(db):
+            db.query(main.Venue).filter(main.Venue.id == 1).update({main.Venue.address: name})
+            if fail:
+                raise HTTPException(status_code=400, detail="nope")
+            return name
+        return work
+
+    batch = [(rename("2 Main St"), Future()), (rename("3 Main St", fail=True), Future())]
+    main.booking_writes.run_batch(batch)
+    assert batch[0][1].result() == "2 Main St"
+    with pytest.raises(HTTPException):
+        batch[1][1].result()
+    db = main.SessionLocal()
+    try:
+        assert db.query(main.Venue.address).scalar() == "2 Main St"
+    finally:
+        db.close()